@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Porównanie szybkości tokenizacji tekstu plików PDF: potok NLTK
+(preprocess_text + word_tokenize) i szybka tokenizacja wyrażeniem regularnym.
+
+Użycie:
+    python benchmarks/benchmark_tokenizer.py KATALOG_Z_PDF [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.pdf_processor import PDFProcessor
+from core.text_processor import TextProcessor
+from utils.file_handler import FileHandler
+from utils.setup_nltk import setup_nltk
+
+def load_pages(directory: str) -> List[str]:
+    """
+    Wydobywa tekst wszystkich stron plików PDF z katalogu
+    
+    Args:
+        directory: Katalog z plikami PDF
+        
+    Returns:
+        List[str]: Teksty kolejnych stron
+    """
+    processor = PDFProcessor()
+    pages = []
+    for file_path in FileHandler().get_pdf_files(directory):
+        try:
+            pages.extend(text for _, text in processor.iter_pages(file_path))
+        except ValueError as e:
+            print(f"Pominięto {file_path}: {str(e)}")
+    return pages
+
+def measure(tokenize: Callable[[str], List[str]], pages: List[str], repeat: int) -> float:
+    """
+    Mierzy najkrótszy czas tokenizacji wszystkich stron
+    
+    Args:
+        tokenize: Funkcja tokenizująca tekst strony
+        pages: Teksty stron
+        repeat: Liczba powtórzeń pomiaru
+        
+    Returns:
+        float: Czas w sekundach
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in pages:
+            tokenize(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    """
+    Główna funkcja skryptu
+    """
+    parser = argparse.ArgumentParser(description="Porównanie szybkości tokenizatorów")
+    parser.add_argument("directory", help="Katalog z plikami PDF")
+    parser.add_argument("--repeat", type=int, default=3, help="Liczba powtórzeń pomiaru")
+    args = parser.parse_args()
+    
+    setup_nltk()
+    processor = TextProcessor()
+    pages = load_pages(args.directory)
+    if not pages:
+        print("Brak stron z tekstem")
+        return
+    
+    def nltk_pipeline(text: str) -> List[str]:
+        return processor.tokenize(processor.preprocess_text(text))
+        
+    # Oba tryby muszą dawać te same tokeny
+    mismatches = sum(1 for text in pages if nltk_pipeline(text) != processor.fast_tokenize(text))
+    
+    characters = sum(len(text) for text in pages)
+    nltk_time = measure(nltk_pipeline, pages, args.repeat)
+    regex_time = measure(processor.fast_tokenize, pages, args.repeat)
+    
+    print(f"Stron: {len(pages)}, znaków: {characters}")
+    print(f"NLTK:  {nltk_time:.3f} s ({characters / nltk_time / 1e6:.2f} mln znaków/s)")
+    print(f"regex: {regex_time:.3f} s ({characters / regex_time / 1e6:.2f} mln znaków/s)")
+    print(f"Przyspieszenie: {nltk_time / regex_time:.1f}x")
+    print(f"Strony z różnymi tokenami: {mismatches}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
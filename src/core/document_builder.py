@@ -0,0 +1,117 @@
+import os
+from array import array
+from typing import Dict, List, Optional
+import numpy as np
+from .document_store import compress_text
+from .models import DocumentIndex
+from .pdf_processor import PDFMetadata
+from .text_processor import TextProcessor
+from .trigram_index import trigram_codes, unique_codes
+from .vocabulary import Vocabulary, TermPositions, TermCounts
+from utils.file_handler import FileInfo
+
+class DocumentBuilder:
+    """
+    Buduje DocumentIndex z kolejnych stron dokumentu, dołączanych po jednej.
+    Tekst strony jest od razu kompresowany i przetwarzany na pozycje i liczby
+    wystąpień terminów oraz kody trygramów, więc w pamięci nie jest przechowywany
+    cały tekst dokumentu.
+    """
+    
+    def __init__(self, text_processor: TextProcessor, vocabulary: Vocabulary):
+        """
+        Inicjalizacja pustego dokumentu
+        
+        Args:
+            text_processor: Procesor tekstu
+            vocabulary: Słownik terminów silnika
+        """
+        self.text_processor = text_processor
+        self.vocabulary = vocabulary
+        self.offsets = array('I')
+        self.term_positions: Dict[int, List[int]] = {}
+        self.term_counts: Dict[int, int] = {}
+        self.page_numbers = array('I')
+        self.page_starts = array('I')
+        self.compressed_pages: List[bytes] = []
+        self.trigram_parts: List[np.ndarray] = []
+        self.position = 0
+    
+    def add_page(self, page_number: int, text: str) -> None:
+        """
+        Dołącza kolejną stronę dokumentu
+        
+        Args:
+            page_number: Numer strony w pliku PDF
+            text: Tekst strony
+        """
+        vocabulary = self.vocabulary
+        self.page_numbers.append(page_number)
+        self.page_starts.append(self.position)
+        self.compressed_pages.append(compress_text(text))
+        self.trigram_parts.append(unique_codes(trigram_codes(text)))
+        
+        # Pozycje terminów w dokumencie i indeksy ich pierwszych znaków na stronie
+        for term, offset in self.text_processor.index_tokens(text):
+            self.offsets.append(offset)
+            self.term_positions.setdefault(vocabulary.add(term), []).append(self.position)
+            self.position += 1
+            
+        # Jednorazowe przetworzenie tekstu na potrzeby oceny trafności
+        for term, count in self.text_processor.count_terms(text).items():
+            term_id = vocabulary.add(term)
+            self.term_counts[term_id] = self.term_counts.get(term_id, 0) + count
+    
+    def extend(self, other: "DocumentBuilder") -> None:
+        """
+        Dołącza strony zbudowane osobno (np. zakres stron podzielonego pliku)
+        
+        Args:
+            other: Dokument z kolejnymi stronami
+        """
+        shift = self.position
+        self.offsets.extend(other.offsets)
+        for term_id, positions in other.term_positions.items():
+            self.term_positions.setdefault(term_id, []).extend(position + shift for position in positions)
+        for term_id, count in other.term_counts.items():
+            self.term_counts[term_id] = self.term_counts.get(term_id, 0) + count
+        self.page_numbers.extend(other.page_numbers)
+        self.page_starts.extend(start + shift for start in other.page_starts)
+        self.compressed_pages.extend(other.compressed_pages)
+        self.trigram_parts.extend(other.trigram_parts)
+        self.position += other.position
+    
+    def build(
+        self,
+        file_path: str,
+        metadata: Optional[PDFMetadata] = None,
+        file_info: Optional[FileInfo] = None
+    ) -> DocumentIndex:
+        """
+        Tworzy zindeksowany dokument z dołączonych stron
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            metadata: Metadane dokumentu (opcjonalne)
+            file_info: Stan pliku ze skrótem zawartości (opcjonalny)
+            
+        Returns:
+            DocumentIndex: Zindeksowany dokument
+        """
+        page_numbers = self.page_numbers
+        return DocumentIndex(
+            file_path=file_path,
+            title=os.path.basename(file_path),
+            content="",
+            page_count=metadata.page_count if metadata else (page_numbers[-1] if page_numbers else 0),
+            token_offsets=self.offsets,
+            term_positions=TermPositions(self.vocabulary, self.term_positions),
+            term_counts=TermCounts(self.vocabulary, self.term_counts),
+            length=sum(self.term_counts.values()),
+            metadata=metadata,
+            file_info=file_info,
+            compressed_pages=self.compressed_pages,
+            page_numbers=page_numbers,
+            page_starts=self.page_starts,
+            trigram_codes=unique_codes(np.concatenate([np.zeros(0, dtype=np.int64)] + self.trigram_parts))
+        )
\ No newline at end of file
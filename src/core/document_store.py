@@ -0,0 +1,97 @@
+import zlib
+from collections import OrderedDict
+from typing import Optional
+from utils.config import config_manager
+
+def compress_text(text: str) -> bytes:
+    """
+    Kompresuje tekst dokumentu
+    
+    Args:
+        text: Tekst dokumentu
+        
+    Returns:
+        bytes: Tekst w UTF-8 skompresowany zlib
+    """
+    return zlib.compress(text.encode('utf-8'))
+
+def decompress_text(data: bytes) -> str:
+    """
+    Rozpakowuje tekst dokumentu skompresowany przez compress_text
+    
+    Args:
+        data: Skompresowany tekst
+        
+    Returns:
+        str: Tekst dokumentu
+    """
+    return zlib.decompress(data).decode('utf-8')
+
+class DocumentStore:
+    """
+    Dostęp do treści dokumentów przechowywanych w postaci skompresowanej
+    (w DocumentIndex lub w segmentach indeksu na dysku).
+    Strony są kompresowane osobno i rozpakowywane są tylko te potrzebne
+    do budowy fragmentów wyników; ostatnio używane trzymane są
+    w niewielkiej pamięci podręcznej LRU.
+    """
+    
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Inicjalizacja magazynu treści
+        
+        Args:
+            cache_size: Liczba rozpakowanych stron w pamięci podręcznej
+                (domyślnie z konfiguracji)
+        """
+        if cache_size is None:
+            cache_size = config_manager.get("document_cache_size", 64)
+        self.cache_size = max(0, cache_size)
+        
+        # (ścieżka, indeks strony) -> (dokument, tekst strony); dokument pozwala wykryć nowszą wersję
+        self._cache: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_page(self, document, index: int) -> str:
+        """
+        Zwraca tekst strony dokumentu
+        
+        Args:
+            document: Dokument (DocumentIndex lub MappedDocument)
+            index: Indeks strony w dokumencie
+            
+        Returns:
+            str: Tekst strony
+        """
+        key = (document.file_path, index)
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] is document:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+            
+        self.misses += 1
+        text = document.get_page_text(index)
+        if self.cache_size:
+            self._cache[key] = (document, text)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+    
+    def discard(self, file_path: str) -> None:
+        """
+        Usuwa strony dokumentu z pamięci podręcznej
+        
+        Args:
+            file_path: Ścieżka do dokumentu
+        """
+        for key in [key for key in self._cache if key[0] == file_path]:
+            del self._cache[key]
+    
+    def clear(self) -> None:
+        """
+        Czyści pamięć podręczną
+        """
+        self._cache.clear()
\ No newline at end of file
@@ -0,0 +1,234 @@
+import multiprocessing
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Tuple
+from .pdf_processor import PDFProcessor, PDFMetadata
+from utils.exceptions import ExtractionLimitError
+
+# Rodzaje komunikatów przesyłanych przez proces roboczy
+METADATA = "metadata"
+PAGE = "page"
+DONE = "done"
+SPLIT = "split"
+LIMIT = "limit"
+ERROR = "error"
+
+def _serve(connection) -> None:
+    """
+    Pętla procesu roboczego: wydobywa tekst kolejnych zleconych plików
+    i odsyła metadane oraz strony pojedynczo, zaraz po ich wydobyciu.
+    Dokument dłuższy niż próg podziału nie jest wydobywany - proces odsyła
+    tylko metadane i komunikat SPLIT, a zlecający rozdziela zakresy stron.
+    
+    Args:
+        connection: Koniec łącza po stronie procesu roboczego
+    """
+    processor = PDFProcessor()
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+            
+        file_path, max_pages, split_pages, start, stop = request
+        try:
+            with processor.read_document(file_path, max_pages, start, stop) as (pages, metadata):
+                connection.send((METADATA, metadata))
+                if split_pages and metadata.page_count > split_pages:
+                    connection.send((SPLIT, metadata.page_count))
+                    continue
+                for page in pages:
+                    connection.send((PAGE, page))
+            connection.send((DONE, None))
+        except ExtractionLimitError as e:
+            connection.send((LIMIT, str(e)))
+        except Exception as e:
+            connection.send((ERROR, str(e)))
+
+class ExtractionWorker:
+    """
+    Proces roboczy wydobywający tekst z plików PDF.
+    
+    Parsowanie wadliwego lub ogromnego pliku może trwać minutami i nie da się
+    go przerwać wewnątrz procesu, dlatego tekst wydobywa osobny proces, który
+    po przekroczeniu limitu czasu jest zabijany (i uruchamiany ponownie przy
+    następnym zleceniu). Proces obsługuje kolejne pliki, więc koszt jego
+    uruchomienia nie jest ponoszony dla każdego dokumentu.
+    """
+    
+    def __init__(self):
+        """
+        Inicjalizacja procesu roboczego (sam proces jest uruchamiany przy pierwszym zleceniu)
+        """
+        self._process: Optional[multiprocessing.Process] = None
+        self.connection = None
+        
+        # Bieżące zlecenie
+        self.file_path: Optional[str] = None
+        self.timeout = 0.0
+        self.deadline: Optional[float] = None
+    
+    @property
+    def busy(self) -> bool:
+        """
+        Czy proces przetwarza plik
+        """
+        return self.file_path is not None
+    
+    @property
+    def expired(self) -> bool:
+        """
+        Czy przekroczono limit czasu bieżącego zlecenia
+        """
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    def submit(
+        self,
+        file_path: str,
+        timeout: float = 0,
+        max_pages: int = 0,
+        split_pages: int = 0,
+        page_range: Optional[Tuple[int, int]] = None,
+        deadline: Optional[float] = None
+    ) -> None:
+        """
+        Zleca wydobycie tekstu z pliku
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            timeout: Limit czasu przetwarzania pliku w sekundach (0 = bez limitu)
+            max_pages: Maksymalna liczba stron dokumentu (0 = bez limitu)
+            split_pages: Liczba stron, powyżej której zamiast stron odsyłany jest
+                komunikat SPLIT (0 = dokumenty nie są dzielone)
+            page_range: Zakres (start, stop) indeksów wydobywanych stron (None = cały dokument)
+            deadline: Chwila (time.monotonic) upływu limitu czasu - zakresy stron jednego
+                pliku dzielą limit całego pliku (domyślnie teraz + timeout)
+        """
+        if self._process is None or not self._process.is_alive():
+            self._start()
+        start, stop = page_range if page_range is not None else (0, None)
+        if page_range is not None:
+            split_pages = 0
+        self.connection.send((file_path, max_pages, split_pages, start, stop))
+        self.file_path = file_path
+        self.timeout = timeout
+        if deadline is None and timeout:
+            deadline = time.monotonic() + timeout
+        self.deadline = deadline if timeout else None
+    
+    def receive(self) -> Tuple[str, Any]:
+        """
+        Odbiera kolejny komunikat bieżącego zlecenia, czekając najwyżej do upływu limitu czasu
+        
+        Returns:
+            Tuple[str, Any]: Komunikat METADATA (metadane), PAGE (numer strony, tekst),
+                DONE lub SPLIT (liczba stron dokumentu do podziału)
+                
+        Raises:
+            ExtractionLimitError: Gdy przekroczono limit czasu, liczby stron
+                lub proces roboczy przerwał pracę
+            ValueError: Gdy plik nie może zostać przetworzony
+        """
+        # Limit sprawdzamy przed każdym odbiorem - proces, który stale przesyła
+        # strony, zawsze ma w łączu gotowy komunikat
+        timeout = None
+        if self.deadline is not None:
+            timeout = self.deadline - time.monotonic()
+            
+        try:
+            if (timeout is not None and timeout <= 0) or not self.connection.poll(timeout):
+                self.stop()
+                raise ExtractionLimitError(f"Przekroczono limit czasu wydobywania tekstu ({self.timeout:g} s)")
+            kind, value = self.connection.recv()
+        except (EOFError, OSError):
+            self.stop()
+            raise ExtractionLimitError("Proces wydobywający tekst zakończył się nieoczekiwanie")
+            
+        if kind in (DONE, SPLIT, LIMIT, ERROR):
+            self.file_path = None
+            self.deadline = None
+        if kind == LIMIT:
+            raise ExtractionLimitError(value)
+        if kind == ERROR:
+            raise ValueError(value)
+        return kind, value
+    
+    @contextmanager
+    def read_document(
+        self,
+        file_path: str,
+        timeout: float = 0,
+        max_pages: int = 0
+    ) -> Iterator[Tuple[Iterator[Tuple[int, str]], PDFMetadata]]:
+        """
+        Odpowiednik PDFProcessor.read_document wykonywany w procesie roboczym.
+        Strony są przesyłane pojedynczo, więc w pamięci jest naraz tekst jednej strony.
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            timeout: Limit czasu przetwarzania pliku w sekundach (0 = bez limitu)
+            max_pages: Maksymalna liczba stron dokumentu (0 = bez limitu)
+            
+        Yields:
+            Tuple[Iterator[Tuple[int, str]], PDFMetadata]: Generator par
+                (numer strony, tekst) i metadane dokumentu
+                
+        Raises:
+            ExtractionLimitError: Gdy przekroczono limit czasu, liczby stron
+                lub proces roboczy przerwał pracę
+            ValueError: Gdy plik nie może zostać przetworzony
+        """
+        self.submit(file_path, timeout, max_pages)
+        try:
+            _, metadata = self.receive()
+            
+            def pages() -> Iterator[Tuple[int, str]]:
+                while True:
+                    kind, value = self.receive()
+                    if kind == DONE:
+                        return
+                    yield value
+                    
+            yield pages(), metadata
+        finally:
+            # Dokument nie został odczytany do końca - proces nadal wysyła strony
+            if self.busy:
+                self.stop()
+    
+    def stop(self) -> None:
+        """
+        Natychmiast zabija proces roboczy
+        """
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        self.file_path = None
+        self.deadline = None
+    
+    def close(self) -> None:
+        """
+        Kończy pracę procesu roboczego
+        """
+        if self._process is not None and not self.busy:
+            try:
+                self.connection.send(None)
+                self._process.join(1.0)
+            except OSError:
+                pass
+        self.stop()
+    
+    def _start(self) -> None:
+        """
+        Uruchamia proces roboczy
+        """
+        self.stop()
+        self.connection, child_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child_connection,), daemon=True)
+        self._process.start()
+        child_connection.close()
\ No newline at end of file
@@ -0,0 +1,691 @@
+import mmap
+import pickle
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from .document_store import compress_text, decompress_text
+from .trigram_index import (
+    TrigramBlock, TrigramPlan, build_block, expand_block, block_candidates, document_trigram_codes
+)
+
+# Znacznik pliku segmentu, wersja formatu i znacznik kolejności bajtów
+MAGIC = b"PDFSEG01"
+FORMAT_VERSION = 4
+BYTE_ORDER_MARK = 0x01020304
+
+# Wszystkie liczby są zapisywane w kolejności bajtów platformy, aby tablice
+# można było czytać bez kopiowania; znacznik w nagłówku wykrywa niezgodność.
+
+# Nagłówek: znacznik, wersja, znacznik kolejności bajtów, liczby rekordów tabel
+# (dokumenty, terminy pozycyjne, terminy przetworzone, nagrobki, trygramy) i ich przesunięcia.
+# Indeks trygramów to blok CSR: kody trygramów (int64), początki list (liczba trygramów + 1)
+# i listy numerów dokumentów, zapisane kolejno od podanego przesunięcia.
+HEADER = struct.Struct("=8sIIIIIIIQQQQQ")
+
+# Rekord dokumentu: ścieżka, tytuł, treść, przesunięcia terminów, terminy dokumentu
+# (pozycyjne i przetworzone z liczbą wystąpień), długość, liczba stron, dodatkowe dane.
+# Treść to tabela stron dokumentu.
+DOCUMENT = struct.Struct("=QIQIQIQIQIQIIIQI")
+
+# Wpis tabeli stron: skompresowany tekst strony, numer strony, pozycja pierwszego terminu
+PAGE = struct.Struct("=QIII")
+
+# Wpis słownika terminów: termin, liczba dokumentów, przesunięcie listy postingów
+TERM = struct.Struct("=QIIQ")
+
+# Odwołanie do napisu: przesunięcie i długość
+STRING = struct.Struct("=QI")
+
+class MappedDocument:
+    """
+    Dokument zapisany w segmencie indeksu.
+    Udostępnia te same pola co DocumentIndex, ale treść, przesunięcia
+    i terminy są odczytywane z segmentu dopiero przy dostępie. Tabela stron
+    jest odczytywana raz, przy pierwszym użyciu.
+    """
+    
+    def __init__(
+        self,
+        segment: "MappedSegment",
+        doc_id: int,
+        file_path: str,
+        title: str,
+        page_count: int,
+        length: int,
+        metadata,
+        file_info
+    ):
+        """
+        Inicjalizacja widoku dokumentu
+        
+        Args:
+            segment: Segment zawierający dokument
+            doc_id: Numer dokumentu w segmencie
+            file_path: Ścieżka do pliku PDF
+            title: Tytuł dokumentu
+            page_count: Liczba stron
+            length: Liczba znormalizowanych terminów
+            metadata: Metadane PDF
+            file_info: Stan pliku w chwili indeksowania
+        """
+        self.segment = segment
+        self.doc_id = doc_id
+        self.file_path = file_path
+        self.title = title
+        self.page_count = page_count
+        self.length = length
+        self.metadata = metadata
+        self.file_info = file_info
+    
+    @property
+    def content(self) -> str:
+        """
+        Tekst dokumentu (rozpakowywany przy każdym dostępie)
+        """
+        return self.get_content()
+    
+    @property
+    def compressed_pages(self) -> List[bytes]:
+        """
+        Skompresowany tekst kolejnych stron
+        """
+        return [
+            self.segment.document_page_data(self.doc_id, index)
+            for index in range(len(self.page_numbers))
+        ]
+    
+    @cached_property
+    def _page_table(self) -> Tuple[List[int], List[int]]:
+        """
+        Numery kolejnych stron z tekstem i pozycje ich pierwszych terminów
+        """
+        pages = self.segment.document_pages(self.doc_id)
+        return [number for number, _ in pages], [start for _, start in pages]
+    
+    @property
+    def page_numbers(self) -> List[int]:
+        """
+        Numery kolejnych stron z tekstem
+        """
+        return self._page_table[0]
+    
+    @property
+    def page_starts(self) -> List[int]:
+        """
+        Pozycja pierwszego terminu kolejnych stron
+        """
+        return self._page_table[1]
+    
+    def find_page(self, position: int) -> int:
+        """
+        Zwraca indeks strony zawierającej termin na podanej pozycji
+        
+        Args:
+            position: Pozycja terminu w dokumencie
+            
+        Returns:
+            int: Indeks strony
+        """
+        return max(0, bisect_right(self.page_starts, position) - 1)
+    
+    def get_page_number(self, index: int) -> int:
+        """
+        Zwraca numer strony o podanym indeksie
+        
+        Args:
+            index: Indeks strony
+            
+        Returns:
+            int: Numer strony w pliku PDF (liczony od 1)
+        """
+        return self.page_numbers[index]
+    
+    def get_page_text(self, index: int) -> str:
+        """
+        Zwraca tekst strony, rozpakowując tylko tę stronę
+        
+        Args:
+            index: Indeks strony
+            
+        Returns:
+            str: Tekst strony
+        """
+        return decompress_text(self.segment.document_page_data(self.doc_id, index))
+    
+    def get_content(self) -> str:
+        """
+        Zwraca tekst całego dokumentu (strony rozdzielone znakiem nowej linii)
+        
+        Returns:
+            str: Tekst dokumentu
+        """
+        return "\n".join(self.get_page_text(index) for index in range(len(self.page_numbers)))
+    
+    @property
+    def text_page_count(self) -> int:
+        """
+        Liczba stron z tekstem
+        """
+        return len(self.page_numbers)
+    
+    @property
+    def pages_without_text(self) -> int:
+        """
+        Liczba stron bez warstwy tekstowej (np. zeskanowanych)
+        """
+        return max(0, self.page_count - self.text_page_count)
+    
+    @property
+    def token_offsets(self) -> Sequence[int]:
+        """
+        Indeksy pierwszych znaków kolejnych terminów (względem strony)
+        """
+        return self.segment.document_offsets(self.doc_id)
+    
+    @property
+    def term_positions(self) -> "MappedTermPositions":
+        """
+        Termin -> pozycje w dokumencie
+        """
+        return MappedTermPositions(self.segment, self.doc_id)
+    
+    @property
+    def term_counts(self) -> "MappedTermCounts":
+        """
+        Znormalizowany termin -> liczba wystąpień
+        """
+        return MappedTermCounts(self.segment, self.doc_id)
+
+class MappedTermPositions(Mapping):
+    """
+    Pozycje terminów dokumentu odczytywane z list postingów segmentu
+    """
+    
+    def __init__(self, segment: "MappedSegment", doc_id: int):
+        self._segment = segment
+        self._doc_id = doc_id
+    
+    def __getitem__(self, term: str) -> Sequence[int]:
+        positions = self._segment.document_positions(self._doc_id, term)
+        if positions is None:
+            raise KeyError(term)
+        return positions
+    
+    def __iter__(self) -> Iterator[str]:
+        for term_id in self._segment.document_terms(self._doc_id):
+            yield self._segment.term(self._segment.positions_dictionary, term_id)
+    
+    def __len__(self) -> int:
+        return len(self._segment.document_terms(self._doc_id))
+
+class MappedTermCounts(Mapping):
+    """
+    Liczby wystąpień znormalizowanych terminów dokumentu odczytywane z segmentu
+    """
+    
+    def __init__(self, segment: "MappedSegment", doc_id: int):
+        self._segment = segment
+        self._doc_id = doc_id
+    
+    def __getitem__(self, term: str) -> int:
+        count = self._segment.document_count(self._doc_id, term)
+        if count is None:
+            raise KeyError(term)
+        return count
+    
+    def __iter__(self) -> Iterator[str]:
+        for term_id in self._segment.document_counts(self._doc_id)[0::2]:
+            yield self._segment.term(self._segment.counts_dictionary, term_id)
+    
+    def __len__(self) -> int:
+        return len(self._segment.document_counts(self._doc_id)) // 2
+
+class MappedSegment:
+    """
+    Segment indeksu odwzorowany w pamięci (mmap) i odpytywany w miejscu.
+    
+    Słowniki terminów są posortowane, a ich wpisy mają stałą szerokość,
+    więc termin jest wyszukiwany binarnie bez wczytywania słownika.
+    Listy postingów to spakowane tablice liczb 32-bitowych. Przy otwarciu
+    odczytywana jest tylko tabela dokumentów - reszta pliku trafia do pamięci
+    dopiero przy dostępie i jest współdzielona przez pamięć podręczną systemu.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Otwiera segment
+        
+        Args:
+            path: Ścieżka do pliku segmentu
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            
+        (
+            magic, version, byte_order, document_count, positions_count, counts_count,
+            deleted_count, trigram_count, documents_offset, positions_offset, counts_offset,
+            deleted_offset, trigram_offset
+        ) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Nieprawidłowy plik segmentu: {path}")
+        if byte_order != BYTE_ORDER_MARK:
+            raise ValueError(f"Segment zapisany na platformie o innej kolejności bajtów: {path}")
+            
+        self.positions_dictionary = (positions_offset, positions_count)
+        self.counts_dictionary = (counts_offset, counts_count)
+        self.trigram_dictionary = (trigram_offset, trigram_count)
+        self._documents_offset = documents_offset
+        
+        # Tabela dokumentów jest mała - rekordy tworzymy od razu
+        self.documents: List[MappedDocument] = []
+        for doc_id in range(document_count):
+            (
+                path_offset, path_length, title_offset, title_length, _, _, _, _, _, _, _, _,
+                length, page_count, extra_offset, extra_length
+            ) = DOCUMENT.unpack_from(self._map, documents_offset + doc_id * DOCUMENT.size)
+            metadata, file_info = pickle.loads(self._map[extra_offset:extra_offset + extra_length])
+            self.documents.append(MappedDocument(
+                self,
+                doc_id,
+                self._string(path_offset, path_length),
+                self._string(title_offset, title_length),
+                page_count,
+                length,
+                metadata,
+                file_info
+            ))
+            
+        self.deleted: List[str] = [
+            self._string(*STRING.unpack_from(self._map, deleted_offset + i * STRING.size))
+            for i in range(deleted_count)
+        ]
+    
+    def close(self) -> None:
+        """
+        Zamyka odwzorowanie pliku
+        """
+        try:
+            self._map.close()
+        except BufferError:
+            # Fragmenty segmentu są jeszcze używane - mapa zostanie zamknięta przez GC
+            pass
+    
+    def postings(self, term: str) -> List[Tuple[MappedDocument, Sequence[int]]]:
+        """
+        Zwraca listę postingów terminu (dokument, pozycje terminu)
+        
+        Args:
+            term: Termin (nieprzetworzony, jak w indeksie pozycyjnym)
+            
+        Returns:
+            Lista par (dokument, pozycje)
+        """
+        entry = self._lookup(self.positions_dictionary, term)
+        if entry is None:
+            return []
+        doc_ids, starts, positions = self._positions_list(*entry)
+        return [
+            (self.documents[doc_id], positions[starts[i]:starts[i + 1]])
+            for i, doc_id in enumerate(doc_ids)
+        ]
+    
+    def term_documents(self, term: str) -> List[MappedDocument]:
+        """
+        Zwraca dokumenty zawierające termin (bez odczytu pozycji)
+        
+        Args:
+            term: Termin (nieprzetworzony, jak w indeksie pozycyjnym)
+            
+        Returns:
+            Lista dokumentów
+        """
+        entry = self._lookup(self.positions_dictionary, term)
+        if entry is None:
+            return []
+        document_frequency, offset = entry
+        return [self.documents[doc_id] for doc_id in self._u32(offset, document_frequency)]
+    
+    @cached_property
+    def trigram_block(self) -> TrigramBlock:
+        """
+        Blok indeksu trygramów segmentu (tablice odczytywane w miejscu, numery dokumentów segmentu)
+        """
+        offset, count = self.trigram_dictionary
+        codes = np.frombuffer(self._map, dtype=np.int64, count=count, offset=offset)
+        starts_offset = offset + codes.nbytes
+        starts = np.frombuffer(self._map, dtype=np.uint32, count=count + 1, offset=starts_offset)
+        doc_ids = np.frombuffer(self._map, dtype=np.uint32, count=int(starts[-1]), offset=starts_offset + starts.nbytes)
+        return codes, starts, doc_ids
+    
+    def trigram_documents(self, plan: TrigramPlan) -> List[MappedDocument]:
+        """
+        Zwraca dokumenty, które mogą zawierać dopasowanie wzorca
+        
+        Args:
+            plan: Plan trygramów (required_trigrams) bez alternatywy pustej
+            
+        Returns:
+            Lista dokumentów
+        """
+        return [self.documents[doc_id] for doc_id in block_candidates(plan, [self.trigram_block]).tolist()]
+    
+    def frequencies(self, term: str) -> List[Tuple[MappedDocument, int]]:
+        """
+        Zwraca dokumenty zawierające przetworzony termin wraz z liczbą wystąpień
+        
+        Args:
+            term: Przetworzony termin
+            
+        Returns:
+            Lista par (dokument, liczba wystąpień)
+        """
+        entry = self._lookup(self.counts_dictionary, term)
+        if entry is None:
+            return []
+        document_frequency, offset = entry
+        doc_ids = self._u32(offset, document_frequency)
+        counts = self._u32(offset + 4 * document_frequency, document_frequency)
+        return [(self.documents[doc_id], count) for doc_id, count in zip(doc_ids, counts)]
+    
+    def document_positions(self, doc_id: int, term: str) -> Optional[Sequence[int]]:
+        """
+        Zwraca pozycje terminu w dokumencie
+        
+        Args:
+            doc_id: Numer dokumentu w segmencie
+            term: Termin
+            
+        Returns:
+            Pozycje terminu lub None, gdy dokument go nie zawiera
+        """
+        entry = self._lookup(self.positions_dictionary, term)
+        if entry is None:
+            return None
+        doc_ids, starts, positions = self._positions_list(*entry)
+        i = bisect_left(doc_ids, doc_id)
+        if i == len(doc_ids) or doc_ids[i] != doc_id:
+            return None
+        return positions[starts[i]:starts[i + 1]]
+    
+    def document_count(self, doc_id: int, term: str) -> Optional[int]:
+        """
+        Zwraca liczbę wystąpień przetworzonego terminu w dokumencie
+        
+        Args:
+            doc_id: Numer dokumentu w segmencie
+            term: Przetworzony termin
+            
+        Returns:
+            Liczba wystąpień lub None, gdy dokument nie zawiera terminu
+        """
+        index = self._find(self.counts_dictionary, term)
+        if index is None:
+            return None
+        pairs = self.document_counts(doc_id)
+        term_ids = pairs[0::2]
+        i = bisect_left(term_ids, index)
+        if i == len(term_ids) or term_ids[i] != index:
+            return None
+        return pairs[2 * i + 1]
+    
+    def document_pages(self, doc_id: int) -> List[Tuple[int, int]]:
+        """
+        Zwraca pary (numer strony, pozycja pierwszego terminu) kolejnych stron dokumentu
+        """
+        offset, count = self._document_field(doc_id, 4)
+        return [
+            PAGE.unpack_from(self._map, offset + index * PAGE.size)[2:]
+            for index in range(count)
+        ]
+    
+    def document_page_data(self, doc_id: int, index: int) -> bytes:
+        """
+        Zwraca skompresowany tekst strony dokumentu
+        """
+        offset, _ = self._document_field(doc_id, 4)
+        data_offset, data_length, _, _ = PAGE.unpack_from(self._map, offset + index * PAGE.size)
+        return self._map[data_offset:data_offset + data_length]
+    
+    def document_offsets(self, doc_id: int) -> Sequence[int]:
+        """
+        Zwraca indeksy pierwszych znaków kolejnych terminów dokumentu
+        """
+        return self._u32(*self._document_field(doc_id, 6))
+    
+    def document_terms(self, doc_id: int) -> Sequence[int]:
+        """
+        Zwraca posortowane numery terminów pozycyjnych dokumentu
+        """
+        return self._u32(*self._document_field(doc_id, 8))
+    
+    def document_counts(self, doc_id: int) -> Sequence[int]:
+        """
+        Zwraca pary (numer przetworzonego terminu, liczba wystąpień) dokumentu
+        """
+        offset, count = self._document_field(doc_id, 10)
+        return self._u32(offset, 2 * count)
+    
+    def term(self, dictionary: Tuple[int, int], term_id: int) -> str:
+        """
+        Zwraca termin o podanym numerze w słowniku
+        """
+        offset, _ = dictionary
+        term_offset, term_length, _, _ = TERM.unpack_from(self._map, offset + term_id * TERM.size)
+        return self._string(term_offset, term_length)
+    
+    def _document_field(self, doc_id: int, field_index: int) -> Tuple[int, int]:
+        """
+        Zwraca parę (przesunięcie, długość) z rekordu dokumentu
+        """
+        record = DOCUMENT.unpack_from(self._map, self._documents_offset + doc_id * DOCUMENT.size)
+        return record[field_index], record[field_index + 1]
+    
+    def _positions_list(self, document_frequency: int, offset: int):
+        """
+        Dekoduje listę postingów pozycyjnych: numery dokumentów,
+        początki list pozycji (df + 1 wartości) i wszystkie pozycje
+        """
+        doc_ids = self._u32(offset, document_frequency)
+        starts = self._u32(offset + 4 * document_frequency, document_frequency + 1)
+        positions = self._u32(offset + 4 * (2 * document_frequency + 1), starts[-1])
+        return doc_ids, starts, positions
+    
+    def _lookup(self, dictionary: Tuple[int, int], term: str) -> Optional[Tuple[int, int]]:
+        """
+        Zwraca (liczba dokumentów, przesunięcie listy postingów) terminu
+        """
+        index = self._find(dictionary, term)
+        if index is None:
+            return None
+        _, _, document_frequency, postings_offset = TERM.unpack_from(
+            self._map, dictionary[0] + index * TERM.size
+        )
+        return document_frequency, postings_offset
+    
+    def _find(self, dictionary: Tuple[int, int], term: str) -> Optional[int]:
+        """
+        Wyszukuje binarnie numer terminu w posortowanym słowniku
+        """
+        offset, count = dictionary
+        key = term.encode('utf-8')
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            term_offset, term_length, _, _ = TERM.unpack_from(self._map, offset + middle * TERM.size)
+            current = self._map[term_offset:term_offset + term_length]
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return middle
+        return None
+    
+    def _u32(self, offset: int, count: int) -> Sequence[int]:
+        """
+        Zwraca tablicę liczb 32-bitowych bez kopiowania danych
+        """
+        return memoryview(self._map)[offset:offset + 4 * count].cast('I')
+    
+    def _string(self, offset: int, length: int) -> str:
+        """
+        Dekoduje napis UTF-8 zapisany w segmencie
+        """
+        return self._map[offset:offset + length].decode('utf-8')
+
+def build_segment(documents: Dict, deleted: List[str]) -> bytes:
+    """
+    Buduje segment indeksu w formacie odwzorowywanym w pamięci
+    
+    Args:
+        documents: Słownik ścieżka -> dokument (DocumentIndex lub MappedDocument)
+        deleted: Ścieżki usuniętych dokumentów (nagrobki)
+        
+    Returns:
+        bytes: Zawartość pliku segmentu
+    """
+    paths = sorted(documents)
+    
+    # Listy postingów obu słowników, numery dokumentów rosną
+    positions_postings: Dict[str, List[Tuple[int, Sequence[int]]]] = {}
+    counts_postings: Dict[str, List[Tuple[int, int]]] = {}
+    for doc_id, file_path in enumerate(paths):
+        document = documents[file_path]
+        for term, positions in document.term_positions.items():
+            positions_postings.setdefault(term, []).append((doc_id, positions))
+        for term, count in document.term_counts.items():
+            counts_postings.setdefault(term, []).append((doc_id, count))
+            
+    # Terminy sortujemy po bajtach UTF-8 - w tej kolejności są porównywane przy wyszukiwaniu
+    positions_terms = sorted(positions_postings, key=lambda term: term.encode('utf-8'))
+    counts_terms = sorted(counts_postings, key=lambda term: term.encode('utf-8'))
+    positions_ids = {term: i for i, term in enumerate(positions_terms)}
+    counts_ids = {term: i for i, term in enumerate(counts_terms)}
+    
+    out = bytearray(HEADER.size)
+    
+    def append_bytes(data: bytes) -> int:
+        offset = len(out)
+        out.extend(data)
+        return offset
+    
+    def append_u32(values) -> int:
+        # Tablice wyrównujemy do 4 bajtów
+        out.extend(b"\0" * (-len(out) % 4))
+        return append_bytes(array('I', values).tobytes())
+    
+    def append_blob(data: bytes) -> Tuple[int, int]:
+        return append_bytes(data), len(data)
+    
+    def append_string(text: str) -> Tuple[int, int]:
+        return append_blob(text.encode('utf-8'))
+        
+    # Dane dokumentów
+    document_records = []
+    for file_path in paths:
+        document = documents[file_path]
+        
+        # Strony kompresowane są osobno; dokument bez podziału na strony to jedna strona,
+        # a dokument bez warstwy tekstowej nie ma żadnej strony
+        pages = list(document.compressed_pages)
+        page_numbers = list(document.page_numbers)
+        page_starts = list(document.page_starts)
+        if not pages and document.content:
+            pages, page_numbers, page_starts = [compress_text(document.content)], [1], [0]
+        page_records = [
+            (*append_blob(data), number, start)
+            for data, number, start in zip(pages, page_numbers, page_starts)
+        ]
+        out.extend(b"\0" * (-len(out) % 8))
+        pages_offset = append_bytes(b"".join(PAGE.pack(*record) for record in page_records))
+        
+        term_ids = sorted(positions_ids[term] for term in document.term_positions)
+        count_pairs = sorted((counts_ids[term], count) for term, count in document.term_counts.items())
+        document_records.append((
+            *append_string(file_path),
+            *append_string(document.title),
+            pages_offset, len(page_records),
+            append_u32(document.token_offsets), len(document.token_offsets),
+            append_u32(term_ids), len(term_ids),
+            append_u32([value for pair in count_pairs for value in pair]), len(count_pairs),
+            document.length,
+            document.page_count,
+            *append_blob(pickle.dumps((document.metadata, document.file_info)))
+        ))
+        
+    # Słowniki terminów wraz z listami postingów
+    term_records = []
+    for term in positions_terms:
+        postings = positions_postings[term]
+        starts = [0]
+        for _, positions in postings:
+            starts.append(starts[-1] + len(positions))
+        postings_offset = append_u32([doc_id for doc_id, _ in postings])
+        append_u32(starts)
+        append_u32([position for _, positions in postings for position in positions])
+        term_records.append((*append_string(term), len(postings), postings_offset))
+        
+    count_records = []
+    for term in counts_terms:
+        postings = counts_postings[term]
+        postings_offset = append_u32([doc_id for doc_id, _ in postings])
+        append_u32([count for _, count in postings])
+        count_records.append((*append_string(term), len(postings), postings_offset))
+        
+    deleted_records = [append_string(file_path) for file_path in deleted]
+    
+    # Indeks trygramów: kody dokumentów zindeksowanych w tej sesji są zapisane w dokumentach,
+    # a dokumentów z innych segmentów - przepisywane z bloków tych segmentów
+    code_parts = [np.zeros(0, dtype=np.int64)]
+    doc_parts = [np.zeros(0, dtype=np.uint32)]
+    segment_ids: Dict["MappedSegment", Dict[int, int]] = {}
+    for doc_id, file_path in enumerate(paths):
+        document = documents[file_path]
+        segment = getattr(document, "segment", None)
+        if segment is not None:
+            segment_ids.setdefault(segment, {})[document.doc_id] = doc_id
+            continue
+        codes = document.trigram_codes
+        if codes is None:
+            # Dokument wczytany z indeksu w formacie 1.0
+            codes = document_trigram_codes(
+                document.get_page_text(page) for page in range(document.text_page_count)
+            )
+        code_parts.append(codes)
+        doc_parts.append(np.full(len(codes), doc_id, dtype=np.uint32))
+    for segment, ids in segment_ids.items():
+        codes, old_ids = expand_block(segment.trigram_block)
+        new_ids = np.full(len(segment.documents), -1, dtype=np.int64)
+        new_ids[list(ids)] = list(ids.values())
+        new_ids = new_ids[old_ids]
+        keep = new_ids >= 0
+        code_parts.append(codes[keep])
+        doc_parts.append(new_ids[keep].astype(np.uint32))
+    doc_ids = np.concatenate(doc_parts)
+    order = np.argsort(doc_ids, kind='stable')
+    trigram_codes, trigram_starts, trigram_doc_ids = build_block(np.concatenate(code_parts)[order], doc_ids[order])
+    out.extend(b"\0" * (-len(out) % 8))
+    trigram_offset = append_bytes(trigram_codes.astype(np.int64).tobytes())
+    append_bytes(trigram_starts.astype(np.uint32).tobytes())
+    append_bytes(trigram_doc_ids.astype(np.uint32).tobytes())
+    
+    # Tabele o stałej szerokości rekordów
+    out.extend(b"\0" * (-len(out) % 8))
+    documents_offset = append_bytes(b"".join(DOCUMENT.pack(*record) for record in document_records))
+    positions_offset = append_bytes(b"".join(TERM.pack(*record) for record in term_records))
+    counts_offset = append_bytes(b"".join(TERM.pack(*record) for record in count_records))
+    deleted_offset = append_bytes(b"".join(STRING.pack(*record) for record in deleted_records))
+    
+    HEADER.pack_into(
+        out, 0,
+        MAGIC, FORMAT_VERSION, BYTE_ORDER_MARK,
+        len(document_records), len(term_records), len(count_records), len(deleted_records),
+        len(trigram_codes), documents_offset, positions_offset, counts_offset, deleted_offset,
+        trigram_offset
+    )
+    return bytes(out)
\ No newline at end of file
@@ -1,5 +1,9 @@
-from dataclasses import dataclass
-from typing import List
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Mapping, Optional, Sequence
+from .pdf_processor import PDFMetadata
+from .document_store import decompress_text
+from utils.file_handler import FileInfo
 
 @dataclass
 class SearchResult:
@@ -9,4 +13,92 @@ class SearchResult:
     file_path: str  # Ścieżka do pliku PDF
     title: str      # Tytuł dokumentu
     score: float    # Wynik podobieństwa (0-1)
-    matches: List[str]  # Lista znalezionych fragmentów tekstu 
\ No newline at end of file
+    matches: List[str]  # Lista znalezionych fragmentów tekstu
+    pages: List[int] = field(default_factory=list)  # Numery stron kolejnych fragmentów
+
+@dataclass
+class DocumentIndex:
+    """
+    Klasa przechowująca zindeksowany dokument.
+    Zawiera wszystko, co jest potrzebne do odtworzenia indeksu
+    wyszukiwania bez ponownego przetwarzania pliku PDF.
+    """
+    file_path: str  # Ścieżka do pliku PDF
+    title: str      # Tytuł dokumentu
+    content: str    # Wydobyty tekst (pusty, gdy tekst jest przechowywany w compressed_pages)
+    page_count: int = 0  # Liczba stron
+    token_offsets: Sequence[int] = field(default_factory=list)  # Indeksy pierwszych znaków kolejnych terminów (względem strony)
+    term_positions: Mapping[str, Sequence[int]] = field(default_factory=dict)  # Termin -> pozycje w dokumencie (vocabulary.TermPositions)
+    term_counts: Mapping[str, int] = field(default_factory=dict)  # Znormalizowany termin -> liczba wystąpień (vocabulary.TermCounts)
+    length: int = 0  # Liczba znormalizowanych terminów (długość dokumentu w BM25)
+    metadata: Optional[PDFMetadata] = None  # Metadane PDF (jeśli zostały wydobyte)
+    file_info: Optional[FileInfo] = None  # Stan pliku w chwili indeksowania
+    compressed_pages: Sequence[bytes] = ()  # Tekst kolejnych stron skompresowany przez document_store.compress_text
+    page_numbers: Sequence[int] = ()  # Numery kolejnych stron z tekstem
+    page_starts: Sequence[int] = ()  # Pozycja pierwszego terminu kolejnych stron
+    trigram_codes: Optional[Sequence[int]] = None  # Posortowane kody trygramów tekstu (trigram_index.document_trigram_codes)
+    
+    def find_page(self, position: int) -> int:
+        """
+        Zwraca indeks strony zawierającej termin na podanej pozycji
+        
+        Args:
+            position: Pozycja terminu w dokumencie
+            
+        Returns:
+            int: Indeks strony (0, gdy dokument nie jest podzielony na strony)
+        """
+        return max(0, bisect_right(self.page_starts, position) - 1)
+    
+    def get_page_number(self, index: int) -> int:
+        """
+        Zwraca numer strony o podanym indeksie
+        
+        Args:
+            index: Indeks strony
+            
+        Returns:
+            int: Numer strony w pliku PDF (liczony od 1)
+        """
+        return self.page_numbers[index] if self.page_numbers else 1
+    
+    def get_page_text(self, index: int) -> str:
+        """
+        Zwraca tekst strony, rozpakowując tylko tę stronę
+        
+        Args:
+            index: Indeks strony
+            
+        Returns:
+            str: Tekst strony
+        """
+        if self.compressed_pages:
+            return decompress_text(self.compressed_pages[index])
+        return self.content
+    
+    def get_content(self) -> str:
+        """
+        Zwraca tekst całego dokumentu (strony rozdzielone znakiem nowej linii)
+        
+        Returns:
+            str: Tekst dokumentu
+        """
+        if self.compressed_pages:
+            return "\n".join(decompress_text(page) for page in self.compressed_pages)
+        return self.content
+    
+    @property
+    def text_page_count(self) -> int:
+        """
+        Liczba stron z tekstem (dokument bez podziału na strony to jedna strona)
+        """
+        if self.page_numbers:
+            return len(self.page_numbers)
+        return 1 if self.content else 0
+    
+    @property
+    def pages_without_text(self) -> int:
+        """
+        Liczba stron bez warstwy tekstowej (np. zeskanowanych)
+        """
+        return max(0, self.page_count - self.text_page_count)
\ No newline at end of file
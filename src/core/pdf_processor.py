@@ -1,8 +1,15 @@
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+import re
 import PyPDF2
+from contextlib import contextmanager
+from utils.exceptions import ExtractionLimitError
 from dataclasses import dataclass
 from datetime import datetime
 
+# Operatory wyświetlające tekst w strumieniu treści strony (Tj, TJ, ' i ")
+# otoczone białymi znakami lub ogranicznikami składni PDF
+TEXT_OPERATOR_PATTERN = re.compile(rb"(?<![^\s\[\]<>(){}/%])(?:Tj|TJ|'|\")(?![^\s\[\]<>(){}/%])")
+
 @dataclass
 class PDFMetadata:
     """
@@ -15,6 +22,34 @@ class PDFMetadata:
     modification_date: Optional[datetime] = None
     page_count: int = 0
 
+    def matches(
+        self,
+        author: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> bool:
+        """
+        Sprawdza, czy metadane spełniają kryteria filtrowania katalogu dokumentów.
+        
+        Args:
+            author (Optional[str]): Fragment nazwy autora (bez rozróżniania wielkości liter)
+            date_from (Optional[datetime]): Najwcześniejsza data utworzenia
+            date_to (Optional[datetime]): Najpóźniejsza data utworzenia
+            
+        Returns:
+            bool: True jeśli spełnione są wszystkie podane kryteria
+        """
+        if author and (not self.author or author.lower() not in self.author.lower()):
+            return False
+        if date_from or date_to:
+            if self.creation_date is None:
+                return False
+            if date_from and self.creation_date < date_from:
+                return False
+            if date_to and self.creation_date > date_to:
+                return False
+        return True
+
 class PDFProcessor:
     """
     Klasa odpowiedzialna za przetwarzanie dokumentów PDF.
@@ -38,21 +73,54 @@ class PDFProcessor:
         Returns:
             str: Wydobyty tekst
             
+        Raises:
+            ValueError: Gdy plik nie może zostać przetworzony
+        """
+        return "\n".join(text for _, text in self.iter_pages(file_path))
+
+    def extract_pages(self, file_path: str) -> List[Tuple[int, str]]:
+        """
+        Wydobywa tekst z pliku PDF z zachowaniem podziału na strony.
+        
+        Args:
+            file_path (str): Ścieżka do pliku PDF
+            
+        Returns:
+            List[Tuple[int, str]]: Pary (numer strony liczony od 1, tekst strony)
+                dla stron zawierających tekst
+            
+        Raises:
+            ValueError: Gdy plik nie może zostać przetworzony
+        """
+        return list(self.iter_pages(file_path))
+
+    def iter_pages(
+        self,
+        file_path: str,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Wydobywa tekst z pliku PDF strona po stronie.
+        Kolejne strony są odczytywane dopiero przy pobieraniu z generatora,
+        więc w pamięci jest naraz tekst tylko jednej strony.
+        
+        Args:
+            file_path (str): Ścieżka do pliku PDF
+            start (int): Indeks pierwszej wydobywanej strony (liczony od 0)
+            stop (Optional[int]): Indeks strony kończącej zakres (bez niej, None = do końca)
+            
+        Yields:
+            Tuple[int, str]: Para (numer strony liczony od 1, tekst strony)
+                dla stron zawierających tekst
+            
         Raises:
             ValueError: Gdy plik nie może zostać przetworzony
         """
         try:
             with open(file_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
-                text_parts = []
-                for page in reader.pages:
-                    try:
-                        text = page.extract_text()
-                        if text:
-                            text_parts.append(text)
-                    except Exception as e:
-                        print(f"Ostrzeżenie: Nie można wydobyć tekstu ze strony: {str(e)}")
-                return "\n".join(text_parts)
+                yield from self._iter_pages(reader, start, stop)
         except Exception as e:
             raise ValueError(f"Nie można przetworzyć pliku PDF: {str(e)}")
 
@@ -88,10 +156,33 @@ class PDFProcessor:
         try:
             with open(file_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
-                return len(reader.pages)
+                return self._count_pages(reader)
         except:
             return 0
 
+    def extract_metadata(self, file_path: str) -> PDFMetadata:
+        """
+        Wydobywa same metadane pliku PDF, bez wydobywania tekstu.
+        Odczytywane są tylko tablica odsyłaczy, słownik Info i liczba stron
+        z korzenia drzewa stron, więc koszt nie zależy od liczby stron.
+        Metoda nie korzysta ze stanu procesora i może być wywoływana
+        równolegle z wielu wątków.
+        
+        Args:
+            file_path (str): Ścieżka do pliku PDF
+            
+        Returns:
+            PDFMetadata: Metadane dokumentu
+            
+        Raises:
+            ValueError: Gdy plik nie może zostać przetworzony
+        """
+        try:
+            with open(file_path, 'rb') as file:
+                return self._read_metadata(PyPDF2.PdfReader(file))
+        except Exception as e:
+            raise ValueError(f"Nie można przetworzyć pliku PDF: {str(e)}")
+
     def process_file(self, file_path: str) -> Tuple[str, PDFMetadata]:
         """
         Przetwarza plik PDF, wydobywając tekst i metadane.
@@ -117,6 +208,83 @@ class PDFProcessor:
             self._current_reader = None
             self._current_file = None
 
+    @contextmanager
+    def read_document(
+        self,
+        file_path: str,
+        max_pages: int = 0,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Iterator[Tuple[Iterator[Tuple[int, str]], PDFMetadata]]:
+        """
+        Otwiera plik PDF raz na potrzeby indeksowania.
+        Metadane (w tym liczba stron) są odczytywane od razu, a tekst stron
+        udostępnia generator działający na tym samym, już sparsowanym dokumencie.
+        Plik jest zamykany przy wyjściu z bloku with.
+        
+        Zakres stron (start, stop) pozwala podzielić bardzo duży dokument
+        między kilka procesów, z których każdy otwiera plik niezależnie.
+        
+        Args:
+            file_path (str): Ścieżka do pliku PDF
+            max_pages (int): Maksymalna liczba stron dokumentu (0 = bez limitu)
+            start (int): Indeks pierwszej wydobywanej strony (liczony od 0)
+            stop (Optional[int]): Indeks strony kończącej zakres (bez niej, None = do końca)
+            
+        Yields:
+            Tuple[Iterator[Tuple[int, str]], PDFMetadata]: Generator par
+                (numer strony, tekst) i metadane dokumentu
+            
+        Raises:
+            ValueError: Gdy plik nie może zostać przetworzony
+            ExtractionLimitError: Gdy dokument ma więcej stron niż max_pages
+        """
+        try:
+            file = open(file_path, 'rb')
+        except Exception as e:
+            raise ValueError(f"Nie można przetworzyć pliku PDF: {str(e)}")
+
+        try:
+            try:
+                reader = PyPDF2.PdfReader(file)
+                metadata = self._read_metadata(reader)
+            except Exception as e:
+                raise ValueError(f"Nie można przetworzyć pliku PDF: {str(e)}")
+
+            if max_pages and metadata.page_count > max_pages:
+                raise ExtractionLimitError(
+                    f"Dokument ma {metadata.page_count} stron (limit: {max_pages})"
+                )
+
+            def pages() -> Iterator[Tuple[int, str]]:
+                try:
+                    yield from self._iter_pages(reader, start, stop)
+                except Exception as e:
+                    raise ValueError(f"Nie można przetworzyć pliku PDF: {str(e)}")
+
+            yield pages(), metadata
+        finally:
+            file.close()
+
+    @staticmethod
+    def split_pages(page_count: int, chunk_pages: int) -> List[Tuple[int, int]]:
+        """
+        Dzieli strony dokumentu na kolejne zakresy do wydobycia w osobnych procesach.
+        Wyniki zakresów połączone w tej kolejności dają strony w porządku dokumentu.
+        
+        Args:
+            page_count (int): Liczba stron dokumentu
+            chunk_pages (int): Liczba stron w jednym zakresie
+            
+        Returns:
+            List[Tuple[int, int]]: Pary (start, stop) indeksów stron
+        """
+        chunk_pages = max(1, chunk_pages)
+        return [
+            (start, min(start + chunk_pages, page_count))
+            for start in range(0, page_count, chunk_pages)
+        ]
+
     def _extract_text(self) -> str:
         """
         Wydobywa tekst ze wszystkich stron dokumentu PDF.
@@ -127,16 +295,103 @@ class PDFProcessor:
         if not self._current_reader:
             return ""
 
-        text_parts = []
-        for page in self._current_reader.pages:
+        return "\n".join(text for _, text in self._iter_pages(self._current_reader))
+
+    def _iter_pages(
+        self,
+        reader: PyPDF2.PdfReader,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Wydobywa tekst kolejnych stron dokumentu PDF, po jednej stronie naraz.
+        
+        Args:
+            reader (PyPDF2.PdfReader): Otwarty dokument PDF
+            start (int): Indeks pierwszej wydobywanej strony
+            stop (Optional[int]): Indeks strony kończącej zakres (None = do końca)
+            
+        Yields:
+            Tuple[int, str]: Para (numer strony, tekst) dla stron zawierających tekst
+        """
+        page_count = len(reader.pages)
+        if stop is None or stop > page_count:
+            stop = page_count
+        for index in range(start, stop):
+            page_number = index + 1
+            page = reader.pages[index]
+            # Strony bez warstwy tekstowej (np. skany) pomijamy bez kosztownego wydobywania tekstu
+            if not self._has_text_layer(page):
+                continue
             try:
                 text = page.extract_text()
-                if text:
-                    text_parts.append(text)
             except Exception as e:
-                print(f"Ostrzeżenie: Nie można wydobyć tekstu ze strony: {str(e)}")
+                print(f"Ostrzeżenie: Nie można wydobyć tekstu ze strony {page_number}: {str(e)}")
+                continue
+            if text:
+                yield page_number, text
 
-        return "\n".join(text_parts)
+    def _has_text_layer(self, page: PyPDF2.PageObject) -> bool:
+        """
+        Szybko sprawdza, czy strona może zawierać tekst.
+        Strona bez fontów w zasobach albo bez operatorów wyświetlających tekst w strumieniu
+        treści i bez formularzy XObject zawiera wyłącznie grafikę (np. zeskanowany obraz).
+        W razie wątpliwości zwraca True - tekst zostanie wtedy wydobyty.
+        
+        Args:
+            page (PyPDF2.PageObject): Strona dokumentu
+            
+        Returns:
+            bool: False jeśli strona na pewno nie zawiera tekstu
+        """
+        try:
+            resources = page.get("/Resources")
+            resources = resources.get_object() if resources is not None else {}
+            if not self._has_fonts(resources):
+                return False
+                
+            xobjects = resources.get("/XObject")
+            if xobjects is not None:
+                for xobject in xobjects.get_object().values():
+                    if xobject.get_object().get("/Subtype") == "/Form":
+                        return True
+                        
+            contents = page.get("/Contents")
+            if contents is None:
+                return False
+            contents = contents.get_object()
+            streams = contents if isinstance(contents, PyPDF2.generic.ArrayObject) else [contents]
+            return any(TEXT_OPERATOR_PATTERN.search(stream.get_object().get_data()) for stream in streams)
+        except Exception:
+            return True
+
+    def _has_fonts(self, resources, depth: int = 0) -> bool:
+        """
+        Sprawdza, czy zasoby strony lub jej formularzy XObject zawierają fonty.
+        
+        Args:
+            resources: Słownik zasobów
+            depth (int): Głębokość zagnieżdżenia formularzy
+            
+        Returns:
+            bool: True jeśli w zasobach jest choć jeden font
+        """
+        fonts = resources.get("/Font")
+        if fonts is not None and len(fonts.get_object()) > 0:
+            return True
+            
+        xobjects = resources.get("/XObject")
+        if xobjects is None:
+            return False
+        if depth >= 3:
+            return True
+        for xobject in xobjects.get_object().values():
+            xobject = xobject.get_object()
+            form_resources = xobject.get("/Resources")
+            if xobject.get("/Subtype") == "/Form" and form_resources is not None:
+                if self._has_fonts(form_resources.get_object(), depth + 1):
+                    return True
+        return False
 
     def _extract_metadata(self) -> PDFMetadata:
         """
@@ -148,19 +403,51 @@ class PDFProcessor:
         if not self._current_reader:
             return PDFMetadata()
 
+        return self._read_metadata(self._current_reader)
+
+    def _read_metadata(self, reader: PyPDF2.PdfReader) -> PDFMetadata:
+        """
+        Odczytuje metadane otwartego dokumentu PDF.
+        
+        Args:
+            reader (PyPDF2.PdfReader): Otwarty dokument PDF
+            
+        Returns:
+            PDFMetadata: Obiekt zawierający metadane dokumentu
+        """
         try:
-            metadata = self._current_reader.metadata
+            metadata = reader.metadata or {}
             return PDFMetadata(
                 title=metadata.get('/Title', None),
                 author=metadata.get('/Author', None),
                 subject=metadata.get('/Subject', None),
                 creation_date=self._parse_pdf_date(metadata.get('/CreationDate', None)),
                 modification_date=self._parse_pdf_date(metadata.get('/ModDate', None)),
-                page_count=len(self._current_reader.pages)
+                page_count=self._count_pages(reader)
             )
         except Exception as e:
             print(f"Ostrzeżenie: Nie można wydobyć metadanych: {str(e)}")
-            return PDFMetadata(page_count=len(self._current_reader.pages))
+            return PDFMetadata(page_count=self._count_pages(reader))
+
+    def _count_pages(self, reader: PyPDF2.PdfReader) -> int:
+        """
+        Zwraca liczbę stron dokumentu PDF.
+        Liczba jest odczytywana z korzenia drzewa stron (/Count), bez wczytywania
+        wszystkich obiektów stron; dopiero gdy jest niedostępna, drzewo jest przechodzone.
+        
+        Args:
+            reader (PyPDF2.PdfReader): Otwarty dokument PDF
+            
+        Returns:
+            int: Liczba stron
+        """
+        try:
+            count = int(reader.trailer["/Root"]["/Pages"]["/Count"])
+            if count >= 0:
+                return count
+        except Exception:
+            pass
+        return len(reader.pages)
 
     def _parse_pdf_date(self, date_str: Optional[str]) -> Optional[datetime]:
         """
@@ -0,0 +1,93 @@
+import heapq
+from bisect import bisect_left
+from typing import Iterable, List, Sequence
+
+def gallop(postings: Sequence[int], target: int, low: int = 0) -> int:
+    """
+    Znajduje pierwszy element listy nie mniejszy niż target (wyszukiwanie galopujące).
+    Kroki rosną wykładniczo od pozycji low, a ostatni przedział jest przeszukiwany
+    binarnie, więc koszt zależy od odległości do wyniku, a nie od długości listy.
+    
+    Args:
+        postings: Rosnące numery dokumentów
+        target: Szukany numer dokumentu
+        low: Pozycja, od której zaczynamy (wszystkie wcześniejsze elementy są mniejsze)
+        
+    Returns:
+        int: Pozycja pierwszego elementu >= target (len(postings), gdy takiego nie ma)
+    """
+    size = len(postings)
+    high = low
+    step = 1
+    while high < size and postings[high] < target:
+        low = high + 1
+        high += step
+        step *= 2
+    return bisect_left(postings, target, low, min(high, size))
+
+def intersect(postings_lists: Iterable[Sequence[int]]) -> List[int]:
+    """
+    Przecina listy postingów zaczynając od najkrótszej (najrzadszego terminu).
+    Każdy dokument dotychczasowego wyniku jest szukany w kolejnej liście
+    galopowaniem od miejsca poprzedniego trafienia, więc długie listy
+    są odczytywane tylko w okolicach pasujących numerów.
+    
+    Args:
+        postings_lists: Listy rosnących numerów dokumentów
+        
+    Returns:
+        List[int]: Rosnące numery dokumentów obecnych we wszystkich listach
+    """
+    postings_lists = sorted(postings_lists, key=len)
+    if not postings_lists:
+        return []
+        
+    result = list(postings_lists[0])
+    for postings in postings_lists[1:]:
+        matched = []
+        index = 0
+        for doc_id in result:
+            index = gallop(postings, doc_id, index)
+            if index == len(postings):
+                break
+            if postings[index] == doc_id:
+                matched.append(doc_id)
+        result = matched
+        if not result:
+            break
+    return result
+
+def union(postings_lists: Iterable[Sequence[int]]) -> List[int]:
+    """
+    Łączy listy postingów
+    
+    Args:
+        postings_lists: Listy rosnących numerów dokumentów
+        
+    Returns:
+        List[int]: Rosnące numery dokumentów obecnych w którejkolwiek liście
+    """
+    result = []
+    for doc_id in heapq.merge(*postings_lists):
+        if not result or result[-1] != doc_id:
+            result.append(doc_id)
+    return result
+
+def difference(postings: Sequence[int], excluded: Sequence[int]) -> List[int]:
+    """
+    Usuwa z listy postingów dokumenty z drugiej listy
+    
+    Args:
+        postings: Rosnące numery dokumentów
+        excluded: Rosnące numery dokumentów do usunięcia
+        
+    Returns:
+        List[int]: Rosnące numery dokumentów z pierwszej listy nieobecnych w drugiej
+    """
+    result = []
+    index = 0
+    for doc_id in postings:
+        index = gallop(excluded, doc_id, index)
+        if index == len(excluded) or excluded[index] != doc_id:
+            result.append(doc_id)
+    return result
\ No newline at end of file
@@ -0,0 +1,175 @@
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+from utils.exceptions import SearchError
+
+# Cudzysłów (niezamknięty obejmuje resztę zapytania), nawias lub słowo
+QUERY_TOKEN = re.compile(r'"([^"]*)"?|([()])|([^\s()"]+)')
+
+# Operatory logiczne (tylko wielkimi literami - "and" i "or" pozostają zwykłymi słowami)
+OPERATORS = {"AND", "OR", "NOT"}
+
+@dataclass
+class Phrase:
+    """
+    Fraza zapytania - terminy indeksu na kolejnych pozycjach (pojedyncze słowo to fraza jednowyrazowa)
+    """
+    text: str  # Tekst frazy z zapytania (przetwarzany do oceny trafności)
+    terms: List[str]  # Terminy indeksu odwróconego
+    
+    def phrases(self) -> Iterator["Phrase"]:
+        yield self
+
+@dataclass
+class And:
+    """
+    Koniunkcja - dokumenty pasujące do wszystkich wyrażeń
+    """
+    children: List["QueryNode"]
+    
+    def phrases(self) -> Iterator[Phrase]:
+        for child in self.children:
+            yield from child.phrases()
+
+@dataclass
+class Or:
+    """
+    Alternatywa - dokumenty pasujące do któregokolwiek wyrażenia
+    """
+    children: List["QueryNode"]
+    
+    def phrases(self) -> Iterator[Phrase]:
+        for child in self.children:
+            yield from child.phrases()
+
+@dataclass
+class Not:
+    """
+    Negacja - dokumenty niepasujące do wyrażenia
+    """
+    child: "QueryNode"
+    
+    def phrases(self) -> Iterator[Phrase]:
+        # Wykluczone frazy nie tworzą fragmentów wyników ani nie wpływają na trafność
+        return iter(())
+
+QueryNode = Union[Phrase, And, Or, Not]
+
+class QueryParser:
+    """
+    Parser zapytań logicznych: operatory AND, OR, NOT (pisane wielkimi literami),
+    frazy w cudzysłowie i nawiasy. Sąsiednie wyrażenia bez operatora łączy AND,
+    NOT wiąże najsilniej, a OR najsłabiej ("a b OR NOT c" to "(a AND b) OR (NOT c)").
+    
+    Zapytanie bez operatorów, cudzysłowów i nawiasów jest w całości jedną frazą,
+    tak jak przed wprowadzeniem zapytań logicznych.
+    """
+    
+    def __init__(self, index_terms: Callable[[str], List[str]]):
+        """
+        Inicjalizacja parsera
+        
+        Args:
+            index_terms: Funkcja dzieląca tekst na terminy indeksu (TextProcessor.index_terms)
+        """
+        self.index_terms = index_terms
+        self._tokens: List[Tuple[str, str]] = []
+        self._index = 0
+    
+    def parse(self, query: str) -> Optional[QueryNode]:
+        """
+        Parsuje zapytanie
+        
+        Args:
+            query: Zapytanie
+            
+        Returns:
+            Optional[QueryNode]: Drzewo zapytania lub None, gdy zapytanie nie zawiera żadnych terminów
+            
+        Raises:
+            SearchError: Gdy zapytanie jest niepoprawne (np. brak nawiasu lub wyrażenia po operatorze)
+        """
+        self._tokens = self._tokenize(query)
+        self._index = 0
+        if all(kind == "WORD" for kind, _ in self._tokens):
+            return self._phrase(query.strip())
+            
+        node = self._parse_or()
+        if self._index < len(self._tokens):
+            raise SearchError("Nieoczekiwany nawias zamykający w zapytaniu")
+        return node
+    
+    @staticmethod
+    def _tokenize(query: str) -> List[Tuple[str, str]]:
+        """
+        Dzieli zapytanie na pary (rodzaj, tekst): PHRASE, WORD, nawias lub operator
+        """
+        tokens = []
+        for match in QUERY_TOKEN.finditer(query):
+            phrase, bracket, word = match.groups()
+            if bracket:
+                tokens.append((bracket, bracket))
+            elif word is None:
+                tokens.append(("PHRASE", phrase))
+            elif word in OPERATORS:
+                tokens.append((word, word))
+            else:
+                tokens.append(("WORD", word))
+        return tokens
+    
+    def _phrase(self, text: str) -> Optional[Phrase]:
+        """
+        Tworzy frazę z tekstu (None, gdy tekst nie zawiera terminów, np. sama interpunkcja)
+        """
+        terms = self.index_terms(text)
+        return Phrase(text, terms) if terms else None
+    
+    def _peek(self) -> Optional[str]:
+        return self._tokens[self._index][0] if self._index < len(self._tokens) else None
+    
+    def _parse_or(self) -> Optional[QueryNode]:
+        children = [self._parse_and()]
+        while self._peek() == "OR":
+            self._index += 1
+            children.append(self._parse_and())
+        return self._combine(Or, children)
+    
+    def _parse_and(self) -> Optional[QueryNode]:
+        children = [self._parse_unary()]
+        while self._peek() not in (None, ")", "OR"):
+            if self._peek() == "AND":
+                self._index += 1
+            children.append(self._parse_unary())
+        return self._combine(And, children)
+    
+    def _parse_unary(self) -> Optional[QueryNode]:
+        kind = self._peek()
+        if kind is None:
+            raise SearchError("Brak wyrażenia na końcu zapytania")
+        if kind == ")":
+            raise SearchError("Brak wyrażenia przed nawiasem zamykającym")
+        if kind in ("AND", "OR"):
+            raise SearchError(f"Brak wyrażenia przed operatorem {kind}")
+            
+        text = self._tokens[self._index][1]
+        self._index += 1
+        if kind == "NOT":
+            child = self._parse_unary()
+            return Not(child) if child is not None else None
+        if kind == "(":
+            node = self._parse_or()
+            if self._peek() != ")":
+                raise SearchError("Brak nawiasu zamykającego w zapytaniu")
+            self._index += 1
+            return node
+        return self._phrase(text)
+    
+    @staticmethod
+    def _combine(node_type, children: List[Optional[QueryNode]]) -> Optional[QueryNode]:
+        """
+        Łączy wyrażenia operatorem, pomijając wyrażenia bez terminów
+        """
+        children = [child for child in children if child is not None]
+        if len(children) > 1:
+            return node_type(children)
+        return children[0] if children else None
\ No newline at end of file
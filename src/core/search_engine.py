@@ -1,10 +1,31 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set, Optional, Sequence, Iterable, Tuple
+from array import array
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import wait
+import heapq
 import os
-from .pdf_processor import PDFProcessor
-from .text_processor import TextProcessor
-from utils.file_handler import FileHandler
+import re
+import time
+import numpy as np
+from .pdf_processor import PDFProcessor, PDFMetadata
+from .extraction_worker import ExtractionWorker, METADATA, PAGE, SPLIT
+from .text_processor import TextProcessor, WORD_PATTERN
+from utils.file_handler import FileHandler, FileInfo
+from utils.exceptions import FileOperationError, ExtractionLimitError, SearchError
 from utils.config import config_manager
-from .models import SearchResult
+from utils.index_storage import IndexStorage
+from utils.extraction_cache import ExtractionCache
+from .models import SearchResult, DocumentIndex
+from .vocabulary import Vocabulary, TermPositions, TermCounts
+from .mapped_index import MappedSegment
+from .term_matrix import TermMatrix
+from .query_parser import QueryParser, QueryNode, Phrase, And, Or, Not
+from .postings import intersect, union, difference
+from .trigram_index import TrigramIndex, TrigramPlan, required_trigrams, document_trigram_codes
+from .document_builder import DocumentBuilder
+from .document_store import DocumentStore, decompress_text
 
 class SearchEngine:
     """
@@ -17,90 +38,1041 @@ class SearchEngine:
         """
         self.pdf_processor = PDFProcessor()
         self.text_processor = TextProcessor()
+        self.query_parser = QueryParser(self.text_processor.index_terms)
         self.file_handler = FileHandler()
         
-        # Słownik przechowujący przetworzone dokumenty
-        self.documents: Dict[str, str] = {}
+        # Słownik przechowujący zindeksowane dokumenty
+        self.documents: Dict[str, DocumentIndex] = {}
         
-    def index_document(self, file_path: str) -> None:
+        # Treści dokumentów są przechowywane w postaci skompresowanej i rozpakowywane
+        # tylko dla fragmentów wyników (z pamięcią podręczną LRU)
+        self.document_store = DocumentStore()
+        
+        # Tekst wydobyty z plików PDF, współdzielony przez kopie i pliki o zmienionej nazwie
+        self.extraction_cache = ExtractionCache()
+        
+        # Słownik terminów - dokumenty i postingi przechowują numery terminów
+        # w tablicach typowanych zamiast napisów
+        self.vocabulary = Vocabulary()
+        
+        # Numery dokumentów indeksu (rosnące, nie są używane ponownie) - listy postingów
+        # i wyniki podzapytań to rosnące tablice tych numerów
+        self.doc_ids: Dict[str, int] = {}
+        self.doc_paths: Dict[int, str] = {}
+        self._next_doc_id = 0
+        
+        # Indeks odwrócony: numer terminu -> rosnące numery dokumentów zawierających termin
+        # (pozycje terminu przechowuje DocumentIndex.term_positions)
+        self.term_index: Dict[int, array] = {}
+        
+        # Łączna liczba przetworzonych terminów dokumentów (średnia długość dla BM25)
+        self.total_length = 0
+        
+        # Dokumenty bez warstwy tekstowej (np. skany) - pozostają w indeksie, aby nie
+        # były ponownie przetwarzane, ale nie są wliczane do statystyk korpusu
+        self.documents_without_text: Set[str] = set()
+        
+        # Macierz dokument-termin do oceny wszystkich kandydatów zapytania naraz,
+        # budowana przy pierwszym wyszukiwaniu po zmianie indeksu. Numery terminów
+        # segmentów są tłumaczone na numery słownika raz dla każdego segmentu.
+        self._term_matrix: Optional[TermMatrix] = None
+        self._segment_terms: Dict[MappedSegment, np.ndarray] = {}
+        
+        # Indeks trygramów tekstu dla wyszukiwania fragmentów i wyrażeń regularnych,
+        # uzupełniany przy dodaniu i usunięciu dokumentu (trygramy dokumentów
+        # z segmentów są odczytywane z segmentów)
+        self._trigram_index = TrigramIndex()
+        
+        # Segmenty indeksu wczytanego z dysku (odpytywane w miejscu) wraz z liczbą
+        # aktualnych dokumentów. Indeks pozycyjny powyżej obejmuje tylko dokumenty
+        # zindeksowane w tej sesji, a postingi i liczby wystąpień terminów dokumentów
+        # z segmentów są odczytywane z segmentów.
+        self.segment_documents: Dict[MappedSegment, int] = {}
+        
+        # Zmiany od ostatniego zapisu na dysk - zapisywane jako nowy segment indeksu
+        self.changed_paths: Set[str] = set()
+        self.deleted_paths: Set[str] = set()
+        self.needs_full_save = False
+        
+        # Pliki pominięte po przekroczeniu limitów przetwarzania (ścieżka -> stan pliku
+        # z przyczyną w error_message); pomijane aż do zmiany pliku
+        self.quarantine: Dict[str, FileInfo] = {}
+        self.quarantine_changed = False
+    
+    def index_document(self, file_path: str, worker: Optional[ExtractionWorker] = None) -> None:
         """
         Indeksuje dokument PDF
         
         Args:
             file_path: Ścieżka do pliku PDF
+            worker: Proces roboczy, w którym wydobywany jest tekst z limitem czasu
+                (domyślnie tekst jest wydobywany w bieżącym procesie)
         """
+        # Stan pliku odczytujemy przed wydobyciem tekstu
+        file_info = self._get_file_state(file_path)
         try:
-            # Wydobycie tekstu z PDF
-            text = self.pdf_processor.extract_text(file_path)
+            # Plik o tej samej zawartości był już przetworzony
+            cached = self._read_cache(file_path, file_info)
+            if cached is not None:
+                self._add_document(file_path, *cached, file_info)
+                return
+                
+            self._check_file_size(file_info)
+            max_pages = config_manager.get("max_document_pages", 0)
             
-            # Zapisanie tekstu w słowniku
-            self.documents[file_path] = text
+            # Jedno parsowanie pliku daje metadane i strony; strony są wydobywane
+            # i indeksowane po jednej, bez budowania całego tekstu
+            if worker is None:
+                document = self.pdf_processor.read_document(file_path, max_pages)
+            else:
+                timeout = config_manager.get("extraction_timeout", 0)
+                document = worker.read_document(file_path, timeout, max_pages)
+            with document as (pages, metadata):
+                self._add_document(file_path, pages, metadata, file_info)
+            self._write_cache(file_path)
             
+        except ExtractionLimitError as e:
+            self._quarantine(file_path, file_info, str(e))
         except Exception as e:
             print(f"Błąd indeksowania dokumentu {file_path}: {str(e)}")
+    
+    def _add_document(
+        self,
+        file_path: str,
+        pages: Iterable[Tuple[int, str]],
+        metadata: Optional[PDFMetadata] = None,
+        file_info: Optional[FileInfo] = None
+    ) -> None:
+        """
+        Dodaje wydobyty tekst dokumentu do indeksu
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            pages: Pary (numer strony, tekst strony)
+            metadata: Metadane dokumentu (opcjonalne)
+            file_info: Stan pliku sprzed wydobycia tekstu (opcjonalny)
+        """
+        try:
+            builder = self._new_builder()
+            for page_number, text in pages:
+                builder.add_page(page_number, text)
+            self._finish_document(file_path, builder, metadata, file_info)
+            
+        except ExtractionLimitError:
+            raise
+        except Exception as e:
+            print(f"Błąd indeksowania dokumentu {file_path}: {str(e)}")
+    
+    def _new_builder(self) -> DocumentBuilder:
+        """
+        Tworzy builder dokumentu korzystający z procesora tekstu i słownika silnika
+        """
+        return DocumentBuilder(self.text_processor, self.vocabulary)
+    
+    def _finish_document(
+        self,
+        file_path: str,
+        builder: DocumentBuilder,
+        metadata: Optional[PDFMetadata] = None,
+        file_info: Optional[FileInfo] = None
+    ) -> None:
+        """
+        Dodaje do indeksu dokument zbudowany ze stron dołączonych do buildera,
+        zastępując poprzednią wersję dokumentu
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            builder: Strony dokumentu
+            metadata: Metadane dokumentu (opcjonalne)
+            file_info: Stan pliku sprzed wydobycia tekstu (opcjonalny)
+        """
+        document = builder.build(file_path, metadata, self._complete_file_state(file_path, file_info))
+        if not document.page_numbers:
+            print(f"Uwaga: Dokument {file_path} nie ma warstwy tekstowej ({document.page_count} stron)")
+            
+        self._remove_document(file_path)
+        self._insert_document(document)
+    
+    def _insert_document(self, document: DocumentIndex) -> None:
+        """
+        Dołącza dokument do indeksu pozycyjnego i statystyk korpusu
+        
+        Args:
+            document: Zindeksowany dokument
+        """
+        file_path = document.file_path
+        self.documents[file_path] = document
+        self.total_length += document.length
+        self._term_matrix = None
+        if not document.text_page_count:
+            self.documents_without_text.add(file_path)
+            
+        if document.file_info is not None:
+            self.file_handler.files[file_path] = document.file_info
+            
+        self.changed_paths.add(file_path)
+        self.deleted_paths.discard(file_path)
+        
+        doc_id = self._next_doc_id
+        self._next_doc_id += 1
+        self.doc_ids[file_path] = doc_id
+        self.doc_paths[doc_id] = file_path
+        
+        # Dokumenty wczytane z segmentu (MappedDocument) są odpytywane w segmencie
+        segment = getattr(document, "segment", None)
+        if segment is not None:
+            self.segment_documents[segment] = self.segment_documents.get(segment, 0) + 1
+            return
+            
+        # Dokumenty spoza tej sesji (np. w starym formacie) przechodzą na numery terminów
+        if getattr(document.term_positions, "vocabulary", None) is not self.vocabulary:
+            document.term_positions = TermPositions.from_terms(self.vocabulary, document.term_positions.items())
+        if getattr(document.term_counts, "vocabulary", None) is not self.vocabulary:
+            document.term_counts = TermCounts.from_terms(self.vocabulary, document.term_counts.items())
+        if document.trigram_codes is None:
+            document.trigram_codes = document_trigram_codes(self._iter_page_texts(document))
+        self._trigram_index.add_document(doc_id, document.trigram_codes)
+        
+        # Numery dokumentów rosną, więc dopisywanie zachowuje posortowanie postingów
+        for term_id in document.term_positions.term_ids:
+            postings = self.term_index.get(term_id)
+            if postings is None:
+                postings = self.term_index[term_id] = array('I')
+            postings.append(doc_id)
+    
+    def _get_file_state(self, file_path: str) -> Optional[FileInfo]:
+        """
+        Odczytuje rozmiar i datę modyfikacji pliku
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            
+        Returns:
+            Stan pliku lub None, gdy nie można go odczytać
+        """
+        try:
+            return self.file_handler.get_file_state(file_path)
+        except FileOperationError:
+            return None
+    
+    def _complete_file_state(self, file_path: str, file_info: Optional[FileInfo]) -> Optional[FileInfo]:
+        """
+        Uzupełnia stan zindeksowanego pliku o skrót zawartości.
+        Na podstawie stanu indeksowanie przyrostowe pomija niezmienione pliki.
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            file_info: Stan pliku sprzed wydobycia tekstu
+            
+        Returns:
+            Stan pliku ze skrótem zawartości lub None, gdy nie można go ustalić
+        """
+        if file_info is None:
+            return None
+        if file_info.content_hash is not None:
+            return file_info
+        try:
+            file_info.content_hash = self.file_handler.compute_file_hash(file_path)
+        except FileOperationError:
+            return None
+        return file_info
+    
+    def _read_cache(
+        self,
+        file_path: str,
+        file_info: Optional[FileInfo]
+    ) -> Optional[Tuple[Iterable[Tuple[int, str]], Optional[PDFMetadata]]]:
+        """
+        Szuka wydobytego wcześniej tekstu pliku o tej samej zawartości
+        (np. kopii w innym folderze lub pliku o zmienionej nazwie)
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            file_info: Stan pliku sprzed wydobycia tekstu
+            
+        Returns:
+            Strony (numer strony, tekst) i metadane lub None, gdy pliku nie ma w pamięci podręcznej
+        """
+        if file_info is None or not self.extraction_cache.max_size:
+            return None
+        try:
+            key = self.file_handler.compute_quick_hash(file_path)
+            if not self.extraction_cache.contains(key):
+                return None
+                
+            # Skrót całej zawartości potwierdza trafienie i trafia do stanu pliku
+            file_info.content_hash = self.file_handler.compute_file_hash(file_path)
+        except FileOperationError:
+            return None
+            
+        cached = self.extraction_cache.get(key, file_info.content_hash)
+        if cached is None:
+            return None
+        pages, metadata = cached
+        return ((number, decompress_text(data)) for number, data in pages), metadata
+    
+    def _write_cache(self, file_path: str) -> None:
+        """
+        Zapisuje tekst zindeksowanego dokumentu w pamięci podręcznej wydobytego tekstu
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+        """
+        document = self.documents.get(file_path)
+        if document is None or document.file_info is None or not self.extraction_cache.max_size:
+            return
+        try:
+            key = self.file_handler.compute_quick_hash(file_path)
+        except FileOperationError:
+            return
+        self.extraction_cache.put(
+            key,
+            document.file_info.content_hash,
+            list(zip(document.page_numbers, document.compressed_pages)),
+            document.metadata
+        )
+    
+    def _check_file_size(self, file_info: Optional[FileInfo]) -> None:
+        """
+        Sprawdza, czy plik nie przekracza limitu rozmiaru
+        
+        Args:
+            file_info: Stan pliku
+            
+        Raises:
+            ExtractionLimitError: Gdy plik jest większy niż max_document_size
+        """
+        max_size = config_manager.get("max_document_size", 0)
+        if max_size and file_info is not None and file_info.size > max_size:
+            raise ExtractionLimitError(f"Plik ma {file_info.size} bajtów (limit: {max_size})")
+    
+    def _quarantine(self, file_path: str, file_info: Optional[FileInfo], reason: str) -> None:
+        """
+        Pomija plik, którego przetwarzanie przekroczyło limity.
+        Plik trafia na listę kwarantanny i nie jest indeksowany do czasu jego zmiany.
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            file_info: Stan pliku sprzed wydobycia tekstu
+            reason: Przyczyna pominięcia
+        """
+        print(f"Ostrzeżenie: Pominięto dokument {file_path}: {reason}")
+        
+        # Poprzednia wersja dokumentu w indeksie jest już nieaktualna
+        self._remove_document(file_path)
+        
+        # Bez stanu pliku nie dałoby się wykryć jego zmiany
+        if file_info is None:
+            return
+        file_info.is_valid = False
+        file_info.error_message = reason
+        self.quarantine[file_path] = file_info
+        self.quarantine_changed = True
+    
+    def _is_quarantined(self, file_path: str) -> bool:
+        """
+        Sprawdza, czy plik jest na liście kwarantanny.
+        Zmieniony plik jest z niej usuwany i zostanie zindeksowany ponownie.
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+            
+        Returns:
+            bool: True jeśli plik należy pominąć
+        """
+        entry = self.quarantine.get(file_path)
+        if entry is None:
+            return False
+            
+        state = self._get_file_state(file_path)
+        if state is not None and state.size == entry.size and state.modified_time == entry.modified_time:
+            return True
+            
+        del self.quarantine[file_path]
+        self.quarantine_changed = True
+        return False
+    
+    def get_quarantined_files(self) -> Dict[str, str]:
+        """
+        Zwraca pliki pominięte po przekroczeniu limitów przetwarzania
+        
+        Returns:
+            Dict[str, str]: Słownik ścieżka -> przyczyna pominięcia
+        """
+        return {path: info.error_message for path, info in self.quarantine.items()}
+    
+    def _remove_document(self, file_path: str) -> None:
+        """
+        Usuwa dokument z indeksu
+        
+        Args:
+            file_path: Ścieżka do pliku PDF
+        """
+        document = self.documents.pop(file_path, None)
+        if document is None:
+            return
+            
+        self.total_length -= document.length
+        self._term_matrix = None
+        self.documents_without_text.discard(file_path)
+        self.document_store.discard(file_path)
+        self.file_handler.files.pop(file_path, None)
+        self.changed_paths.discard(file_path)
+        self.deleted_paths.add(file_path)
+        doc_id = self.doc_ids.pop(file_path)
+        del self.doc_paths[doc_id]
+        
+        segment = getattr(document, "segment", None)
+        if segment is not None:
+            self.segment_documents[segment] -= 1
+            if not self.segment_documents[segment]:
+                del self.segment_documents[segment]
+            return
+            
+        self._trigram_index.remove_document(doc_id)
+        for term_id in document.term_positions.term_ids:
+            postings = self.term_index.get(term_id)
+            if postings is None:
+                continue
+            index = bisect_left(postings, doc_id)
+            if index < len(postings) and postings[index] == doc_id:
+                del postings[index]
+            if not postings:
+                del self.term_index[term_id]
+    
+    def _term_postings(self, term: str) -> Sequence[int]:
+        """
+        Zwraca rosnące numery dokumentów zawierających termin ze wszystkich dokumentów indeksu
+        
+        Args:
+            term: Termin (nieprzetworzony)
+            
+        Returns:
+            Rosnące numery dokumentów
+        """
+        term_id = self.vocabulary.get(term)
+        postings = self.term_index.get(term_id, ()) if term_id is not None else ()
+        if not self.segment_documents:
+            return postings
+            
+        # Pomijamy wersje dokumentów z segmentów przesłonięte lub usunięte
+        segment_postings = sorted(
+            self.doc_ids[document.file_path]
+            for segment in self.segment_documents
+            for document in segment.term_documents(term)
+            if self.documents.get(document.file_path) is document
+        )
+        return union([postings, segment_postings])
+    
+    def _evaluate(self, node: QueryNode) -> List[int]:
+        """
+        Wyznacza dokumenty pasujące do zapytania logicznego na podstawie list postingów
+        
+        Listy postingów wszystkich terminów koniunkcji (także z kolejnych fraz) są przecinane
+        razem, od najkrótszej, a pozycje fraz sprawdzane są tylko w dokumentach, które
+        pozostały po przecięciu. Wykluczenia (NOT) są odejmowane na końcu, od wyniku
+        zawężonego już przez pozostałe wyrażenia.
+        
+        Args:
+            node: Drzewo zapytania
+            
+        Returns:
+            Rosnące numery pasujących dokumentów
+        """
+        if isinstance(node, Or):
+            return union([self._evaluate(child) for child in node.children])
+        if isinstance(node, Not):
+            return difference(sorted(self.doc_paths), self._evaluate(node.child))
+            
+        children = node.children if isinstance(node, And) else [node]
+        phrases = [child for child in children if isinstance(child, Phrase)]
+        terms = dict.fromkeys(term for phrase in phrases for term in phrase.terms)
+        postings_lists = [self._term_postings(term) for term in terms]
+        postings_lists += [
+            self._evaluate(child) for child in children
+            if isinstance(child, Or) or isinstance(child, And)
+        ]
+        documents = intersect(postings_lists) if postings_lists else sorted(self.doc_paths)
+        
+        for phrase in phrases:
+            if len(phrase.terms) > 1:
+                documents = [
+                    doc_id for doc_id in documents
+                    if self._match_phrase(self.doc_paths[doc_id], phrase.terms)
+                ]
+                
+        for child in children:
+            if isinstance(child, Not) and documents:
+                documents = difference(documents, self._evaluate(child.child))
+        return documents
+    
+    def _match_phrase(self, file_path: str, terms: List[str]) -> List[int]:
+        """
+        Znajduje wystąpienia frazy w dokumencie przecinając listy pozycji
+        
+        Args:
+            file_path: Ścieżka do dokumentu
+            terms: Kolejne terminy frazy
+            
+        Returns:
+            Lista pozycji pierwszego terminu każdego wystąpienia frazy
+            (pusta, gdy dokument nie zawiera któregoś z terminów)
+        """
+        term_positions = self.documents[file_path].term_positions
+        positions_lists = [term_positions.get(term) for term in terms]
+        if any(positions is None for positions in positions_lists):
+            return []
+        if len(terms) == 1:
+            return list(positions_lists[0])
+            
+        # Frazę tworzą terminy na kolejnych pozycjach
+        first_positions = positions_lists[0]
+        following = [set(positions) for positions in positions_lists[1:]]
+        return [
+            position for position in first_positions
+            if all(position + i in positions for i, positions in enumerate(following, 1))
+        ]
+    
+    def _match_spans(self, file_path: str, phrases: List[Phrase]) -> List[Tuple[int, int]]:
+        """
+        Znajduje wystąpienia wszystkich fraz zapytania w dokumencie. Nakładające się
+        wystąpienia (np. fraz "a b" i "a b c" albo tego samego terminu z dwóch gałęzi
+        alternatywy) są łączone, aby każde miejsce dokumentu dało jeden fragment.
+        
+        Args:
+            file_path: Ścieżka do dokumentu
+            phrases: Frazy zapytania
+            
+        Returns:
+            Rosnące pary (pozycja pierwszego, pozycja ostatniego terminu) rozłącznych wystąpień
+        """
+        occurrences = sorted(
+            (position, position + len(phrase.terms) - 1)
+            for phrase in phrases
+            for position in self._match_phrase(file_path, phrase.terms)
+        )
+        spans: List[Tuple[int, int]] = []
+        for first, last in occurrences:
+            if spans and first <= spans[-1][1]:
+                spans[-1] = (spans[-1][0], max(spans[-1][1], last))
+            else:
+                spans.append((first, last))
+        return spans
+    
+    def _build_contexts(self, file_path: str, spans: List[Tuple[int, int]]) -> Tuple[List[str], List[int]]:
+        """
+        Buduje fragmenty tekstu wokół wystąpień fraz w dokumencie.
+        Każdy fragment pochodzi z jednej strony - rozpakowywane są tylko strony z wystąpieniami.
+        
+        Args:
+            file_path: Ścieżka do dokumentu
+            spans: Pary (pozycja pierwszego, pozycja ostatniego terminu) kolejnych wystąpień
             
-    def index_directory(self, directory: str) -> None:
+        Returns:
+            Krotka (lista fragmentów tekstu z kontekstem, numery stron fragmentów)
+        """
+        document = self.documents[file_path]
+        offsets = document.token_offsets
+        page_starts = document.page_starts
+        contexts = []
+        pages = []
+        for position, last in spans:
+            page = document.find_page(position)
+            text = self.document_store.get_page(document, page)
+            
+            # Fraza przechodząca na następną stronę kończy fragment na końcu strony
+            phrase_end = len(text)
+            if page + 1 >= len(page_starts) or last < page_starts[page + 1]:
+                phrase_end = WORD_PATTERN.match(text, offsets[last]).end()
+                
+            contexts.append(self._build_context(text, offsets[position], phrase_end))
+            pages.append(document.get_page_number(page))
+        return contexts, pages
+    
+    def _build_context(self, text: str, phrase_start: int, phrase_end: int) -> str:
+        """
+        Buduje fragment tekstu wokół wystąpienia frazy
+        
+        Args:
+            text: Tekst strony
+            phrase_start: Indeks pierwszego znaku frazy
+            phrase_end: Indeks znaku za frazą
+            
+        Returns:
+            Fragment tekstu z kontekstem
+        """
+        context_size = config_manager.get("context_size", 50)
+        
+        start = max(0, phrase_start - context_size)
+        end = min(len(text), phrase_end + context_size)
+        context = text[start:end].strip()
+        if start > 0:
+            context = "..." + context
+        if end < len(text):
+            context = context + "..."
+        return context
+    
+    def _get_term_matrix(self) -> TermMatrix:
+        """
+        Zwraca macierz dokument-termin, budując ją po zmianie indeksu
+        
+        Returns:
+            TermMatrix: Macierz dokument-termin wszystkich dokumentów indeksu
+        """
+        if self._term_matrix is None:
+            # Odwzorowania segmentów, z których nie zostały już żadne dokumenty, są zbędne
+            for segment in list(self._segment_terms):
+                if segment not in self.segment_documents:
+                    del self._segment_terms[segment]
+            self._term_matrix = TermMatrix.build(self.documents, self.vocabulary, self._segment_terms)
+        return self._term_matrix
+    
+    def _score_documents(self, query_terms: Set[str], file_paths: List[str], ranking: str) -> np.ndarray:
+        """
+        Oblicza trafność dokumentów wybraną metodą (wszystkich naraz, na macierzy dokument-termin)
+        
+        Args:
+            query_terms: Przetworzone terminy zapytania
+            file_paths: Ścieżki ocenianych dokumentów
+            ranking: Metoda oceny ("bm25" lub "jaccard")
+            
+        Returns:
+            Wyniki trafności kolejnych dokumentów
+        """
+        matrix = self._get_term_matrix()
+        rows = np.fromiter((matrix.rows[path] for path in file_paths), dtype=np.int64, count=len(file_paths))
+        term_ids = [term_id for term_id in map(self.vocabulary.get, query_terms) if term_id is not None]
+        if ranking == "bm25":
+            total_docs = len(self.documents) - len(self.documents_without_text)
+            return matrix.bm25(
+                term_ids,
+                rows,
+                total_docs,
+                self.total_length / total_docs if total_docs else 0.0,
+                k1=config_manager.get("bm25_k1", 1.2),
+                b=config_manager.get("bm25_b", 0.75)
+            )
+        return matrix.jaccard(term_ids, len(query_terms), rows)
+    
+    def index_directory(self, directory: str, incremental: bool = True) -> None:
         """
         Indeksuje wszystkie dokumenty PDF w katalogu
         
         Args:
             directory: Ścieżka do katalogu
+            incremental: Czy indeksować tylko nowe i zmienione pliki
+                (oraz usunąć z indeksu pliki, których już nie ma)
         """
         # Pobierz listę plików PDF
         pdf_files = self.file_handler.get_pdf_files(directory)
         
-        # Indeksuj każdy plik
-        for file_path in pdf_files:
-            self.index_document(file_path)
+        # Usunięte pliki znikają z listy kwarantanny
+        present = set(pdf_files)
+        prefix = os.path.join(os.path.abspath(directory), "")
+        for file_path in list(self.quarantine):
+            if file_path not in present and os.path.abspath(file_path).startswith(prefix):
+                del self.quarantine[file_path]
+                self.quarantine_changed = True
+                
+        if incremental:
+            pdf_files = self._select_changed_files(directory, pdf_files)
+            
+        # Pliki z kwarantanny pomijamy, dopóki się nie zmienią
+        pdf_files = [file_path for file_path in pdf_files if not self._is_quarantined(file_path)]
+        
+        # Parsowanie PDF-ów obciąża procesor, więc używamy wielu procesów
+        # (także dla jednego pliku, który może zostać podzielony między nie)
+        workers = config_manager.get("index_workers", 0) or os.cpu_count() or 1
+        if workers > 1 and pdf_files:
+            self._index_parallel(pdf_files, workers)
+            return
             
-    def search(self, query: str) -> List[SearchResult]:
+        # Bez limitu czasu tekst wydobywamy w bieżącym procesie
+        if not config_manager.get("extraction_timeout", 0):
+            for file_path in pdf_files:
+                self.index_document(file_path)
+            return
+            
+        # Z limitem czasu - w procesie roboczym, który można zabić
+        worker = ExtractionWorker()
+        try:
+            for file_path in pdf_files:
+                self.index_document(file_path, worker)
+        finally:
+            worker.close()
+    
+    def scan_metadata(self, directory: str) -> Dict[str, PDFMetadata]:
         """
-        Wyszukuje frazę w zaindeksowanych dokumentach
+        Odczytuje metadane (tytuł, autor, daty, liczba stron) wszystkich plików PDF
+        w katalogu bez wydobywania tekstu, np. do przeglądania i filtrowania
+        katalogu dokumentów przed indeksowaniem (PDFMetadata.matches)
         
         Args:
-            query: Fraza do wyszukania
+            directory: Ścieżka do katalogu
             
         Returns:
-            Lista wyników wyszukiwania
+            Słownik ścieżka -> metadane (pliki, których nie da się odczytać, są pomijane)
         """
-        results = []
+        pdf_files = self.file_handler.get_pdf_files(directory)
+        
+        # Odczyt metadanych to głównie operacje wejścia-wyjścia (np. na udziale sieciowym), więc wystarczą wątki
+        catalog: Dict[str, PDFMetadata] = {}
+        with ThreadPoolExecutor() as executor:
+            futures = {
+                executor.submit(self.pdf_processor.extract_metadata, file_path): file_path
+                for file_path in pdf_files
+            }
+            for future, file_path in futures.items():
+                try:
+                    catalog[file_path] = future.result()
+                except Exception as e:
+                    print(f"Ostrzeżenie: Nie można odczytać metadanych {file_path}: {str(e)}")
+        return catalog
+    
+    def _select_changed_files(self, directory: str, pdf_files: List[str]) -> List[str]:
+        """
+        Porównuje wynik skanowania katalogu ze stanem indeksu.
+        Usuwa z indeksu dokumenty, których pliki zniknęły z katalogu.
         
-        for file_path, text in self.documents.items():
-            # Znajdujemy wszystkie wystąpienia frazy
-            matches = self.text_processor.find_phrase_matches(text, query)
-            
-            if matches:
-                # Dla każdego indeksu, wydobywamy fragment tekstu (kontekst)
-                context_matches = []
-                for index in matches:
-                    # Pobierz fragment tekstu przed i po znalezionym indeksie
-                    start = max(0, index - 50)  # 50 znaków przed
-                    end = min(len(text), index + len(query) + 50)  # 50 znaków po
-                    context = text[start:end].strip()
-                    if start > 0:
-                        context = "..." + context
-                    if end < len(text):
-                        context = context + "..."
-                    context_matches.append(context)
+        Args:
+            directory: Ścieżka do katalogu
+            pdf_files: Pliki PDF znalezione w katalogu
+            
+        Returns:
+            Lista nowych lub zmodyfikowanych plików
+        """
+        present = set(pdf_files)
+        prefix = os.path.join(os.path.abspath(directory), "")
+        for file_path in list(self.documents):
+            if file_path not in present and os.path.abspath(file_path).startswith(prefix):
+                self._remove_document(file_path)
                 
-                # Obliczamy wynik podobieństwa
-                score = self.text_processor.calculate_similarity(query, text)
+        changed = []
+        for file_path in pdf_files:
+            known = self.file_handler.files.get(file_path)
+            modified_time = known.modified_time if known is not None else None
+            try:
+                if file_path not in self.documents or self.file_handler.check_file_changes(file_path):
+                    changed.append(file_path)
+                elif known is not None and known.modified_time != modified_time:
+                    # Zmieniła się tylko data modyfikacji (zawartość ma ten sam skrót) - dokument
+                    # z nową datą trafi do kolejnego segmentu, aby następny start nie liczył
+                    # skrótu pliku ponownie
+                    self.changed_paths.add(file_path)
+            except FileOperationError:
+                changed.append(file_path)
+        return changed
+    
+    def _index_parallel(self, pdf_files: List[str], workers: int) -> None:
+        """
+        Indeksuje pliki wydobywając tekst w wielu procesach roboczych.
+        Strony są przetwarzane zaraz po odebraniu, a dokumenty dołączane do indeksu
+        w kolejności zakończenia. Proces, który
+        przekroczy limit czasu, jest zabijany, a plik trafia na listę kwarantanny.
+        
+        Plik dłuższy niż page_split_threshold stron jest dzielony na zakresy po
+        page_chunk_size stron, wydobywane przez wolne procesy (każdy otwiera plik
+        niezależnie) przed kolejnymi plikami. Zakresy są łączone w kolejności stron,
+        więc jeden ogromny plik nie wydłuża końcówki indeksowania. Limit czasu
+        dotyczy całego pliku - wszystkie zakresy muszą zostać wydobyte przed
+        terminem liczonym od zlecenia pliku.
+        
+        Args:
+            pdf_files: Lista ścieżek do plików PDF
+            workers: Liczba procesów roboczych
+        """
+        timeout = config_manager.get("extraction_timeout", 0)
+        max_pages = config_manager.get("max_document_pages", 0)
+        split_pages = config_manager.get("page_split_threshold", 0)
+        chunk_pages = config_manager.get("page_chunk_size", 0) or split_pages
+        remaining = iter(pdf_files)
+        
+        # Proces roboczy -> (indeks zakresu stron lub None, stan pliku, przetworzone strony)
+        # bieżącego zlecenia i metadane dokumentu. Strony trafiają do buildera po jednej,
+        # więc w pamięci nie jest przechowywany cały tekst dokumentu.
+        jobs: Dict[ExtractionWorker, Tuple[Optional[int], Optional[FileInfo], DocumentBuilder]] = {}
+        metadata: Dict[ExtractionWorker, PDFMetadata] = {}
+        
+        # Zakresy stron dzielonych plików czekające na wolny proces
+        # oraz stan tych plików (stan pliku, metadane, przetworzone kolejne zakresy)
+        chunks: deque = deque()
+        split_documents: Dict[str, Dict[str, Any]] = {}
+        
+        def submit_next(worker: ExtractionWorker) -> None:
+            while chunks:
+                file_path, index, page_range = chunks.popleft()
+                # Pozostałe zakresy pliku odrzuconego w trakcie wydobywania pomijamy
+                if file_path in split_documents:
+                    worker.submit(
+                        file_path,
+                        timeout,
+                        page_range=page_range,
+                        deadline=split_documents[file_path]["deadline"]
+                    )
+                    jobs[worker] = (index, split_documents[file_path]["file_info"], self._new_builder())
+                    return
+                    
+            for file_path in remaining:
+                file_info = self._get_file_state(file_path)
+                cached = self._read_cache(file_path, file_info)
+                if cached is not None:
+                    self._add_document(file_path, *cached, file_info)
+                    continue
+                try:
+                    self._check_file_size(file_info)
+                except ExtractionLimitError as e:
+                    self._quarantine(file_path, file_info, str(e))
+                    continue
+                worker.submit(file_path, timeout, max_pages, split_pages)
+                jobs[worker] = (None, file_info, self._new_builder())
+                return
+        
+        def split(file_path: str, file_info: Optional[FileInfo], document: PDFMetadata, deadline: Optional[float]) -> None:
+            ranges = self.pdf_processor.split_pages(document.page_count, chunk_pages)
+            split_documents[file_path] = {
+                "file_info": file_info,
+                "deadline": deadline,
+                "metadata": document,
+                "parts": [None] * len(ranges),
+                "remaining": len(ranges)
+            }
+            # Zakresy dzielonego pliku mają pierwszeństwo przed kolejnymi plikami
+            chunks.extendleft(reversed([
+                (file_path, index, page_range) for index, page_range in enumerate(ranges)
+            ]))
+        
+        def finish_chunk(file_path: str, index: int, builder: DocumentBuilder) -> None:
+            document = split_documents.get(file_path)
+            if document is None:
+                return
+            document["parts"][index] = builder
+            document["remaining"] -= 1
+            if document["remaining"]:
+                return
+            del split_documents[file_path]
+            
+            # Zakresy łączymy w kolejności stron
+            builder, *rest = document["parts"]
+            for chunk in rest:
+                builder.extend(chunk)
+            self._finish_document(file_path, builder, document["metadata"], document["file_info"])
+            self._write_cache(file_path)
+            
+        # Procesy są uruchamiane przy pierwszym zleceniu, więc nadmiarowe nie kosztują nic
+        pool = [ExtractionWorker() for _ in range(workers)]
+        try:
+            for worker in pool:
+                submit_next(worker)
                 
-                # Tworzymy wynik wyszukiwania
-                result = SearchResult(
-                    file_path=file_path,
-                    title=os.path.basename(file_path),
-                    score=score,
-                    matches=context_matches
-                )
+            while jobs:
+                deadlines = [worker.deadline for worker in jobs if worker.deadline is not None]
+                wait_time = None
+                if deadlines:
+                    wait_time = max(0.0, min(deadlines) - time.monotonic())
+                ready = wait([worker.connection for worker in jobs], wait_time)
                 
-                results.append(result)
+                for worker in list(jobs):
+                    if worker.connection not in ready and not worker.expired:
+                        continue
+                    file_path = worker.file_path
+                    deadline = worker.deadline
+                    index, file_info, builder = jobs[worker]
+                    try:
+                        kind, value = worker.receive()
+                        if kind == METADATA:
+                            metadata[worker] = value
+                            continue
+                        if kind == PAGE:
+                            builder.add_page(*value)
+                            continue
+                        if kind == SPLIT:
+                            split(file_path, file_info, metadata.pop(worker), deadline)
+                        elif index is not None:
+                            finish_chunk(file_path, index, builder)
+                        else:
+                            self._finish_document(file_path, builder, metadata.pop(worker, None), file_info)
+                            self._write_cache(file_path)
+                    except ExtractionLimitError as e:
+                        # Błąd jednego zakresu odrzuca cały plik (tylko raz)
+                        if index is None or split_documents.pop(file_path, None) is not None:
+                            self._quarantine(file_path, file_info, str(e))
+                    except Exception as e:
+                        if index is None or split_documents.pop(file_path, None) is not None:
+                            print(f"Błąd indeksowania dokumentu {file_path}: {str(e)}")
+                    del jobs[worker]
+                    metadata.pop(worker, None)
+                    submit_next(worker)
+                    
+                # Zakresy podzielonego pliku trafiają także do bezczynnych procesów
+                for worker in pool:
+                    if not chunks:
+                        break
+                    if worker not in jobs:
+                        submit_next(worker)
+        finally:
+            for worker in pool:
+                worker.close()
+    
+    def search(self, query: str, mode: Optional[str] = None) -> List[SearchResult]:
+        """
+        Wyszukuje frazę lub zapytanie logiczne (AND, OR, NOT, frazy w cudzysłowie, nawiasy)
+        w zaindeksowanych dokumentach, a w trybach "substring" i "regex" - fragment tekstu
+        lub wyrażenie regularne
+        
+        Args:
+            query: Fraza, zapytanie logiczne, fragment tekstu lub wyrażenie regularne
+            mode: Tryb wyszukiwania ("words", "substring" lub "regex"; domyślnie z konfiguracji)
+            
+        Returns:
+            Lista wyników wyszukiwania
+            
+        Raises:
+            SearchError: Gdy zapytanie logiczne lub wyrażenie regularne jest niepoprawne
+        """
+        mode = mode or config_manager.get("search_mode", "words")
+        if mode in ("substring", "regex"):
+            return self._search_text(query, mode == "regex")
+            
+        node = self.query_parser.parse(query)
+        
+        # Frazy spoza wykluczeń tworzą fragmenty wyników i wyznaczają trafność - zapytanie
+        # złożone z samych wykluczeń nie wybiera żadnych dokumentów
+        phrases = list({tuple(phrase.terms): phrase for phrase in node.phrases()}.values()) if node else []
+        if not phrases:
+            return []
+            
+        # Z indeksu odwróconego wybieramy dokumenty pasujące do zapytania (z pozycjami fraz)
+        file_paths = [self.doc_paths[doc_id] for doc_id in self._evaluate(node)]
+        if not file_paths:
+            return []
+            
+        # Zapytanie przetwarzamy raz, dokumenty zostały przetworzone podczas indeksowania.
+        # Na tym etapie nie budujemy jeszcze fragmentów tekstu.
+        query_terms = set(self.text_processor.process_text(" ".join(phrase.text for phrase in phrases)))
+        ranking = config_manager.get("ranking", "bm25")
+        scores = self._score_documents(query_terms, file_paths, ranking)
+        scored = list(zip(scores.tolist(), file_paths))
+        
+        # Wyniki BM25 skalujemy do przedziału 0-1 względem najlepszego dokumentu
+        best = float(scores.max())
+        scale = 1.0 / best if ranking == "bm25" and best > 0 else 1.0
         
-        # Sortujemy wyniki po score (malejąco)
-        results.sort(key=lambda x: x.score, reverse=True)
+        # Wybór max_results najlepszych wyników powyżej min_score (kopiec ograniczony do k elementów).
+        # Gdy żaden dokument nie ma dodatniej trafności (np. zapytanie z samych słów pomijanych),
+        # progu nie stosujemy - dokumenty pasują do zapytania logicznego.
+        min_score = config_manager.get("min_score", 0.1) if best > 0 else 0.0
+        top = heapq.nlargest(
+            config_manager.get("max_results", 100),
+            (item for item in scored if item[0] * scale >= min_score),
+            key=lambda item: item[0]
+        )
         
+        # Wystąpienia fraz i fragmenty tekstu wyznaczamy tylko dla wybranych wyników
+        # (w dokumencie pasującym do alternatywy części fraz może nie być)
+        results = []
+        for score, file_path in top:
+            contexts, pages = self._build_contexts(file_path, self._match_spans(file_path, phrases))
+            results.append(SearchResult(
+                file_path=file_path,
+                title=self.documents[file_path].title,
+                score=score * scale,
+                matches=contexts,
+                pages=pages
+            ))
         return results
+    
+    def _trigram_candidates(self, plan: TrigramPlan) -> Sequence[int]:
+        """
+        Zwraca dokumenty, które mogą zawierać dopasowanie wzorca
         
+        Args:
+            plan: Plan trygramów (required_trigrams)
+            
+        Returns:
+            Rosnące numery dokumentów
+        """
+        # Wzorzec bez ciągu trzech znaków dosłownych nie zawęża wyboru
+        if any(not alternative for alternative in plan):
+            return sorted(self.doc_paths)
+            
+        candidates = self._trigram_index.candidates(plan)
+        if not self.segment_documents:
+            return candidates
+            
+        # Pomijamy wersje dokumentów z segmentów przesłonięte lub usunięte
+        segment_candidates = sorted(
+            self.doc_ids[document.file_path]
+            for segment in self.segment_documents
+            for document in segment.trigram_documents(plan)
+            if self.documents.get(document.file_path) is document
+        )
+        return union([candidates, segment_candidates])
+    
+    @staticmethod
+    def _iter_page_texts(document) -> Iterable[str]:
+        """
+        Zwraca teksty kolejnych stron dokumentu (rozpakowywane po kolei, z pominięciem pamięci podręcznej)
+        """
+        for page in range(document.text_page_count):
+            yield document.get_page_text(page)
+    
+    def _search_text(self, query: str, regex: bool) -> List[SearchResult]:
+        """
+        Wyszukuje fragment tekstu lub wyrażenie regularne (bez rozróżniania wielkości liter).
+        Indeks trygramów wybiera dokumenty zawierające wszystkie trygramy wymagane przez wzorzec,
+        a dopasowania są sprawdzane dokładnie, stronami, tylko w tych dokumentach.
+        
+        Args:
+            query: Fragment tekstu lub wyrażenie regularne
+            regex: Czy query jest wyrażeniem regularnym
+            
+        Returns:
+            Lista wyników wyszukiwania (trafność to liczba dopasowań względem najlepszego dokumentu)
+            
+        Raises:
+            SearchError: Gdy wyrażenie regularne jest niepoprawne
+        """
+        try:
+            pattern = re.compile(query if regex else re.escape(query), re.IGNORECASE)
+            plan = required_trigrams(pattern.pattern, pattern.flags)
+        except re.error as e:
+            raise SearchError(f"Niepoprawne wyrażenie regularne: {str(e)}")
+            
+        found = []
+        for doc_id in self._trigram_candidates(plan):
+            # Pomijamy dokumenty usunięte lub zastąpione nowszą wersją
+            file_path = self.doc_paths.get(doc_id)
+            if file_path is None:
+                continue
+                
+            document = self.documents[file_path]
+            contexts = []
+            pages = []
+            for page in range(document.text_page_count):
+                text = document.get_page_text(page)
+                for match in pattern.finditer(text):
+                    if match.end() > match.start():
+                        contexts.append(self._build_context(text, match.start(), match.end()))
+                        pages.append(document.get_page_number(page))
+            if contexts:
+                found.append((file_path, contexts, pages))
+                
+        if not found:
+            return []
+            
+        best = max(len(contexts) for _, contexts, _ in found)
+        top = heapq.nlargest(config_manager.get("max_results", 100), found, key=lambda item: len(item[1]))
+        return [
+            SearchResult(
+                file_path=file_path,
+                title=self.documents[file_path].title,
+                score=len(contexts) / best,
+                matches=contexts,
+                pages=pages
+            )
+            for file_path, contexts, pages in top
+        ]
+    
     def get_document_count(self) -> int:
         """
         Zwraca liczbę zindeksowanych dokumentów
@@ -109,9 +1081,134 @@ class SearchEngine:
             int: Liczba dokumentów
         """
         return len(self.documents)
+    
+    def get_documents_without_text(self) -> Dict[str, int]:
+        """
+        Zwraca dokumenty bez warstwy tekstowej (np. zeskanowane bez OCR)
+        
+        Returns:
+            Dict[str, int]: Słownik ścieżka -> liczba stron
+        """
+        return {path: self.documents[path].page_count for path in self.documents_without_text}
+    
+    def get_pages_without_text(self) -> Dict[str, int]:
+        """
+        Zwraca dokumenty, w których część stron nie ma warstwy tekstowej
         
+        Returns:
+            Dict[str, int]: Słownik ścieżka -> liczba stron bez tekstu
+        """
+        report = {}
+        for path, document in self.documents.items():
+            count = document.pages_without_text
+            if count:
+                report[path] = count
+        return report
+    
     def clear_index(self) -> None:
         """
         Czyści indeks wyszukiwania
         """
-        self.documents.clear() 
\ No newline at end of file
+        self.documents.clear()
+        self.term_index.clear()
+        self.vocabulary = Vocabulary()
+        self.doc_ids.clear()
+        self.doc_paths.clear()
+        self.total_length = 0
+        self.documents_without_text.clear()
+        self._term_matrix = None
+        self._segment_terms.clear()
+        self._trigram_index = TrigramIndex()
+        self.segment_documents.clear()
+        self.document_store.clear()
+        self.file_handler.clear()
+        self.changed_paths.clear()
+        self.deleted_paths.clear()
+        self.needs_full_save = True
+    
+    def load_documents(self, documents: Dict[str, DocumentIndex]) -> None:
+        """
+        Odtwarza indeks z zapisanych dokumentów (np. wczytanych przez IndexStorage).
+        Nie wymaga ponownego przetwarzania plików PDF.
+        
+        Args:
+            documents: Słownik ścieżka -> zindeksowany dokument
+        """
+        self.clear_index()
+        for document in documents.values():
+            self._insert_document(document)
+        self._mark_saved()
+    
+    def load_quarantine(self, quarantine: Dict[str, FileInfo]) -> None:
+        """
+        Odtwarza listę kwarantanny (np. wczytaną przez IndexStorage)
+        
+        Args:
+            quarantine: Słownik ścieżka -> stan pominiętego pliku z przyczyną
+        """
+        self.quarantine = dict(quarantine)
+        self.quarantine_changed = False
+    
+    def load_lemmas(self, lemmas: Dict[str, str]) -> None:
+        """
+        Odtwarza pamięć podręczną lematów (np. wczytaną przez IndexStorage),
+        dzięki czemu po ponownym uruchomieniu znane słowa nie trafiają do WordNet
+        
+        Args:
+            lemmas: Słownik forma słowa -> lemat
+        """
+        if config_manager.get("persist_lemma_cache", True):
+            self.text_processor.lemma_cache.load(lemmas)
+    
+    @property
+    def has_unsaved_changes(self) -> bool:
+        """
+        Czy indeks (lub zapisywana obok niego pamięć lematów) zmienił się od ostatniego zapisu na dysk
+        """
+        lemmas_changed = self.text_processor.lemma_cache.changed and config_manager.get("persist_lemma_cache", True)
+        return bool(
+            self.needs_full_save or self.changed_paths or self.deleted_paths
+            or self.quarantine_changed or lemmas_changed
+        )
+    
+    def save_changes(self, storage: IndexStorage) -> bool:
+        """
+        Zapisuje zmiany od ostatniego zapisu. Zmienione dokumenty i usunięte
+        ścieżki trafiają do nowego segmentu indeksu, a po wyczyszczeniu
+        indeksu zapisywany jest on w całości.
+        
+        Args:
+            storage: Magazyn indeksu
+            
+        Returns:
+            bool: True jeśli zapis się powiódł, False w przeciwnym razie
+        """
+        if not self.has_unsaved_changes:
+            return True
+            
+        if self.quarantine_changed and storage.save_quarantine(self.quarantine):
+            self.quarantine_changed = False
+            
+        lemma_cache = self.text_processor.lemma_cache
+        if lemma_cache.changed and config_manager.get("persist_lemma_cache", True):
+            if storage.save_lemmas(lemma_cache.items()):
+                lemma_cache.changed = False
+                
+        if self.needs_full_save:
+            saved = storage.save_index(self.documents)
+        else:
+            saved = storage.update_index(
+                {path: self.documents[path] for path in self.changed_paths},
+                self.deleted_paths
+            )
+        if saved:
+            self._mark_saved()
+        return saved
+    
+    def _mark_saved(self) -> None:
+        """
+        Oznacza bieżący stan indeksu jako zapisany
+        """
+        self.changed_paths.clear()
+        self.deleted_paths.clear()
+        self.needs_full_save = False 
\ No newline at end of file
@@ -0,0 +1,207 @@
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+import numpy as np
+from .vocabulary import Vocabulary
+
+class TermMatrix:
+    """
+    Rzadka macierz dokument-termin z liczbami wystąpień przetworzonych terminów,
+    używana do oceny trafności wszystkich kandydatów zapytania naraz.
+    
+    Macierz jest przechowywana w układzie CSR względem terminów (kolumnami
+    macierzy dokument-termin): indptr[t]:indptr[t + 1] wyznacza w tablicach
+    indices i weights wiersze dokumentów zawierających termin t i liczby jego
+    wystąpień. Ocena zapytania to kilka operacji NumPy na kolumnach terminów
+    zapytania, bez pętli po dokumentach.
+    """
+    
+    def __init__(
+        self,
+        paths: List[str],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+        lengths: np.ndarray,
+        sizes: np.ndarray
+    ):
+        """
+        Inicjalizacja macierzy
+        
+        Args:
+            paths: Ścieżki dokumentów kolejnych wierszy
+            indptr: Początki kolumn terminów (liczba terminów + 1 wartości)
+            indices: Wiersze dokumentów w kolejnych kolumnach
+            weights: Liczby wystąpień terminów
+            lengths: Długości dokumentów (liczba przetworzonych terminów)
+            sizes: Liczby różnych przetworzonych terminów dokumentów
+        """
+        self.paths = paths
+        self.rows: Dict[str, int] = {path: row for row, path in enumerate(paths)}
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.lengths = lengths
+        self.sizes = sizes
+    
+    @classmethod
+    def build(
+        cls,
+        documents: Dict[str, Any],
+        vocabulary: Vocabulary,
+        segment_terms: Dict[Any, np.ndarray]
+    ) -> "TermMatrix":
+        """
+        Buduje macierz z dokumentów indeksu
+        
+        Args:
+            documents: Słownik ścieżka -> dokument (DocumentIndex lub MappedDocument)
+            vocabulary: Słownik terminów silnika (numery kolumn)
+            segment_terms: Pamięć podręczna odwzorowań numerów terminów segmentów
+                na numery słownika (uzupełniana przy budowie)
+                
+        Returns:
+            TermMatrix: Macierz dokument-termin
+        """
+        paths = list(documents)
+        term_parts = []
+        weight_parts = []
+        for path in paths:
+            term_ids, weights = cls._document_terms(documents[path], vocabulary, segment_terms)
+            term_parts.append(term_ids)
+            weight_parts.append(weights)
+            
+        sizes = np.array([len(term_ids) for term_ids in term_parts], dtype=np.int64)
+        term_ids = np.concatenate(term_parts) if term_parts else np.zeros(0, dtype=np.int64)
+        weights = np.concatenate(weight_parts) if weight_parts else np.zeros(0)
+        rows = np.repeat(np.arange(len(paths), dtype=np.int64), sizes)
+        
+        # Sortowanie stabilne zachowuje rosnące wiersze w każdej kolumnie
+        order = np.argsort(term_ids, kind='stable')
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(vocabulary)), out=indptr[1:])
+        
+        return cls(
+            paths,
+            indptr,
+            rows[order],
+            weights[order].astype(np.float64),
+            np.array([documents[path].length for path in paths], dtype=np.float64),
+            sizes
+        )
+    
+    @staticmethod
+    def _document_terms(
+        document: Any,
+        vocabulary: Vocabulary,
+        segment_terms: Dict[Any, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca numery przetworzonych terminów dokumentu i liczby ich wystąpień
+        
+        Args:
+            document: Dokument (DocumentIndex lub MappedDocument)
+            vocabulary: Słownik terminów silnika
+            segment_terms: Odwzorowania numerów terminów segmentów na numery słownika
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Numery terminów i liczby wystąpień
+        """
+        term_counts = document.term_counts
+        
+        # Dokument z tej sesji - tablice są czytane bez kopiowania
+        if getattr(term_counts, "vocabulary", None) is vocabulary:
+            return (
+                np.frombuffer(term_counts.term_ids, dtype=np.uintc).astype(np.int64),
+                np.frombuffer(term_counts.counts, dtype=np.uintc)
+            )
+            
+        # Dokument z segmentu - numery terminów segmentu tłumaczymy jedną operacją
+        segment = getattr(document, "segment", None)
+        if segment is not None:
+            mapping = segment_terms.get(segment)
+            if mapping is None:
+                _, count = segment.counts_dictionary
+                mapping = np.array(
+                    [vocabulary.add(segment.term(segment.counts_dictionary, i)) for i in range(count)],
+                    dtype=np.int64
+                )
+                segment_terms[segment] = mapping
+            pairs = np.frombuffer(segment.document_counts(document.doc_id), dtype=np.uintc)
+            return mapping[pairs[0::2]], pairs[1::2]
+            
+        items = list(term_counts.items())
+        return (
+            np.array([vocabulary.add(term) for term, _ in items], dtype=np.int64),
+            np.array([count for _, count in items], dtype=np.uintc)
+        )
+    
+    def _columns(self, term_ids: Sequence[int]):
+        """
+        Zwraca kolumny terminów obecnych w macierzy
+        
+        Args:
+            term_ids: Numery terminów
+            
+        Yields:
+            Tuple[np.ndarray, np.ndarray]: Wiersze dokumentów i liczby wystąpień terminu
+        """
+        for term_id in term_ids:
+            if term_id >= len(self.indptr) - 1:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            if start < end:
+                yield self.indices[start:end], self.weights[start:end]
+    
+    def bm25(
+        self,
+        term_ids: Sequence[int],
+        rows: np.ndarray,
+        total_docs: int,
+        average_length: float,
+        k1: float = 1.2,
+        b: float = 0.75
+    ) -> np.ndarray:
+        """
+        Oblicza wyniki Okapi BM25 dokumentów
+        
+        Args:
+            term_ids: Numery różnych przetworzonych terminów zapytania
+            rows: Wiersze ocenianych dokumentów
+            total_docs: Całkowita liczba dokumentów
+            average_length: Średnia liczba terminów w dokumentach
+            k1: Nasycenie częstości terminu
+            b: Siła normalizacji długością dokumentu
+            
+        Returns:
+            np.ndarray: Wyniki kolejnych dokumentów
+        """
+        scores = np.zeros(len(self.paths))
+        if total_docs == 0 or average_length <= 0:
+            return scores[rows]
+            
+        length_norm = k1 * (1 - b + b * self.lengths / average_length)
+        for doc_rows, frequency in self._columns(term_ids):
+            doc_count = len(doc_rows)
+            idf = math.log(1 + (total_docs - doc_count + 0.5) / (doc_count + 0.5))
+            scores[doc_rows] += idf * frequency * (k1 + 1) / (frequency + length_norm[doc_rows])
+        return scores[rows]
+    
+    def jaccard(self, term_ids: Sequence[int], query_size: int, rows: np.ndarray) -> np.ndarray:
+        """
+        Oblicza współczynniki Jaccarda dokumentów (zbiorów ich przetworzonych terminów i zapytania)
+        
+        Args:
+            term_ids: Numery różnych przetworzonych terminów zapytania obecnych w słowniku
+            query_size: Liczba różnych terminów zapytania (także spoza słownika)
+            rows: Wiersze ocenianych dokumentów
+            
+        Returns:
+            np.ndarray: Wyniki kolejnych dokumentów
+        """
+        matches = np.zeros(len(self.paths))
+        for doc_rows, _ in self._columns(term_ids):
+            matches[doc_rows] += 1
+            
+        intersection = matches[rows]
+        union = query_size + self.sizes[rows] - intersection
+        return np.divide(intersection, union, out=np.zeros(len(rows)), where=union > 0)
\ No newline at end of file
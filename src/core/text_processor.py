@@ -1,4 +1,6 @@
-from typing import List, Set, Dict, Any
+from typing import List, Set, Dict, Any, Tuple, Optional
+from collections import OrderedDict
+import math
 import re
 import string
 import nltk
@@ -7,6 +9,125 @@ from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from utils.config import config_manager
 
+# Wzorzec słowa używany przy budowie indeksu odwróconego
+WORD_PATTERN = re.compile(r'\w+')
+
+# Wzorzec tokenu szybkiej tokenizacji: ciąg liter (znaki słowa bez cyfr)
+TOKEN_PATTERN = re.compile(r'[^\W\d]+')
+
+# Złączenia dzielone przez word_tokenize także w tekście bez interpunkcji
+# (pozostałe reguły NLTK dotyczą apostrofów i znaków przestankowych)
+CONTRACTIONS = {
+    "cannot": ("can", "not"),
+    "gimme": ("gim", "me"),
+    "gonna": ("gon", "na"),
+    "gotta": ("got", "ta"),
+    "lemme": ("lem", "me"),
+    "wanna": ("wan", "na")
+}
+
+class LemmaCache:
+    """
+    Ograniczona pamięć podręczna lematów (forma słowa -> lemat).
+    Częstości słów w tekście mają rozkład Zipfa, więc kilka tysięcy form
+    pokrywa większość wystąpień, a każda z nich trafia do WordNet tylko raz.
+    Po przekroczeniu limitu usuwane są najdawniej używane formy.
+    """
+    
+    def __init__(self, max_size: Optional[int] = None):
+        """
+        Inicjalizacja pamięci podręcznej
+        
+        Args:
+            max_size: Maksymalna liczba form, 0 wyłącza pamięć
+                (domyślnie z konfiguracji)
+        """
+        if max_size is None:
+            max_size = config_manager.get("lemma_cache_size", 100000)
+        self.max_size = max(0, max_size)
+        
+        self._lemmas: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+        # Czy zawartość zmieniła się od wczytania lub zapisu
+        self.changed = False
+    
+    def __len__(self) -> int:
+        return len(self._lemmas)
+    
+    @property
+    def hit_rate(self) -> float:
+        """
+        Odsetek trafień (0-1) od utworzenia pamięci
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    def get(self, word: str) -> Optional[str]:
+        """
+        Zwraca zapamiętany lemat słowa
+        
+        Args:
+            word: Forma słowa
+            
+        Returns:
+            Optional[str]: Lemat lub None, gdy słowa nie ma w pamięci
+        """
+        lemma = self._lemmas.get(word)
+        if lemma is None:
+            self.misses += 1
+            return None
+        self._lemmas.move_to_end(word)
+        self.hits += 1
+        return lemma
+    
+    def put(self, word: str, lemma: str) -> None:
+        """
+        Zapamiętuje lemat słowa
+        
+        Args:
+            word: Forma słowa
+            lemma: Lemat
+        """
+        if not self.max_size:
+            return
+        self._lemmas[word] = lemma
+        self._lemmas.move_to_end(word)
+        while len(self._lemmas) > self.max_size:
+            self._lemmas.popitem(last=False)
+        self.changed = True
+    
+    def items(self) -> Dict[str, str]:
+        """
+        Zwraca zapamiętane lematy
+        
+        Returns:
+            Dict[str, str]: Słownik forma -> lemat, od najdawniej używanej formy
+        """
+        return dict(self._lemmas)
+    
+    def load(self, lemmas: Dict[str, str]) -> None:
+        """
+        Zastępuje zawartość zapisanymi lematami (np. wczytanymi przez IndexStorage)
+        
+        Args:
+            lemmas: Słownik forma -> lemat, od najdawniej używanej formy
+        """
+        self._lemmas = OrderedDict(lemmas)
+        while len(self._lemmas) > self.max_size:
+            self._lemmas.popitem(last=False)
+        self.changed = False
+    
+    def clear(self) -> None:
+        """
+        Czyści pamięć podręczną i liczniki
+        """
+        self._lemmas.clear()
+        self.hits = 0
+        self.misses = 0
+        self.changed = True
+
 class TextProcessor:
     """
     Klasa odpowiedzialna za przetwarzanie tekstu.
@@ -21,6 +142,9 @@ class TextProcessor:
         self.stop_words = set(stopwords.words('english'))
         self.lemmatizer = WordNetLemmatizer()
         
+        # Wspólna dla indeksowania i przetwarzania zapytań
+        self.lemma_cache = LemmaCache()
+        
         # Dodaj słowa specyficzne dla dokumentów PDF
         self.stop_words.update(['page', 'pdf', 'document'])
         
@@ -58,6 +182,56 @@ class TextProcessor:
         """
         return word_tokenize(text)
         
+    def fast_tokenize(self, text: str) -> List[str]:
+        """
+        Jednoprzebiegowy odpowiednik preprocess_text i tokenize.
+        Zamiast kilku podstawień i tokenizatora NLTK wyszukuje ciągi liter
+        skompilowanym wyrażeniem regularnym - zwraca te same tokeny
+        co word_tokenize(preprocess_text(text)), wielokrotnie szybciej.
+        
+        Args:
+            text: Tekst do tokenizacji
+            
+        Returns:
+            Lista tokenów (małymi literami)
+        """
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        if CONTRACTIONS.keys().isdisjoint(tokens):
+            return tokens
+            
+        result = []
+        for token in tokens:
+            parts = CONTRACTIONS.get(token)
+            if parts:
+                result.extend(parts)
+            else:
+                result.append(token)
+        return result
+        
+    def index_terms(self, text: str) -> List[str]:
+        """
+        Dzieli tekst na terminy indeksu odwróconego (słowa małymi literami)
+        
+        Args:
+            text: Tekst do podziału
+            
+        Returns:
+            Lista terminów w kolejności występowania
+        """
+        return [match.group().lower() for match in WORD_PATTERN.finditer(text)]
+        
+    def index_tokens(self, text: str) -> List[Tuple[str, int]]:
+        """
+        Dzieli tekst na terminy indeksu wraz z ich pozycjami w tekście
+        
+        Args:
+            text: Tekst do podziału
+            
+        Returns:
+            Lista krotek (termin, indeks pierwszego znaku)
+        """
+        return [(match.group().lower(), match.start()) for match in WORD_PATTERN.finditer(text)]
+        
     def remove_stop_words(self, tokens: List[str]) -> List[str]:
         """
         Usuwanie stop-words
@@ -72,7 +246,8 @@ class TextProcessor:
         
     def lemmatize(self, tokens: List[str]) -> List[str]:
         """
-        Lematyzacja tokenów
+        Lematyzacja tokenów.
+        Lematy są zapamiętywane, więc WordNet jest pytany o każdą formę tylko raz.
         
         Args:
             tokens: Lista tokenów
@@ -80,7 +255,18 @@ class TextProcessor:
         Returns:
             Lista zlematyzowanych tokenów
         """
-        return [self.lemmatizer.lemmatize(token) for token in tokens]
+        cache = self.lemma_cache
+        if not cache.max_size:
+            return [self.lemmatizer.lemmatize(token) for token in tokens]
+            
+        lemmas = []
+        for token in tokens:
+            lemma = cache.get(token)
+            if lemma is None:
+                lemma = self.lemmatizer.lemmatize(token)
+                cache.put(token, lemma)
+            lemmas.append(lemma)
+        return lemmas
         
     def process_text(self, text: str) -> List[str]:
         """
@@ -92,11 +278,12 @@ class TextProcessor:
         Returns:
             Lista przetworzonych tokenów
         """
-        # Wstępne przetwarzanie
-        text = self.preprocess_text(text)
-        
-        # Tokenizacja
-        tokens = self.tokenize(text)
+        # Wstępne przetwarzanie i tokenizacja
+        if config_manager.get("tokenizer", "regex") == "regex":
+            tokens = self.fast_tokenize(text)
+        else:
+            text = self.preprocess_text(text)
+            tokens = self.tokenize(text)
         
         # Usuwanie stop-words
         tokens = self.remove_stop_words(tokens)
@@ -138,6 +325,21 @@ class TextProcessor:
             
         return dict(sorted_words)
         
+    def count_terms(self, text: str) -> Dict[str, int]:
+        """
+        Przetwarza tekst i zlicza wystąpienia znormalizowanych terminów
+        
+        Args:
+            text: Tekst do przetworzenia
+            
+        Returns:
+            Słownik {termin: liczba wystąpień}
+        """
+        counts: Dict[str, int] = {}
+        for token in self.process_text(text):
+            counts[token] = counts.get(token, 0) + 1
+        return counts
+        
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """
         Oblicza podobieństwo między dwoma tekstami
@@ -216,4 +418,4 @@ class TextProcessor:
             
         # Dodajemy 1 do obu wartości aby uniknąć dzielenia przez zero
         # i logarytmu z zera
-        return math.log((total_docs + 1) / (doc_count + 1)) + 1 
\ No newline at end of file
+        return math.log((total_docs + 1) / (doc_count + 1)) + 1
\ No newline at end of file
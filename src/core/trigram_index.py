@@ -0,0 +1,358 @@
+from array import array
+from typing import FrozenSet, Iterable, List, Sequence, Set, Tuple
+import numpy as np
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_constants
+    import sre_parse
+
+# Plan zapytania w postaci alternatywy koniunkcji: dokument może pasować, gdy zawiera
+# wszystkie trygramy którejś z alternatyw. Alternatywa bez trygramów nie zawęża wyniku.
+TrigramPlan = List[FrozenSet[str]]
+MATCH_ALL: TrigramPlan = [frozenset()]
+
+# Powyżej tej liczby alternatyw plan jest upraszczany (do słabszego, ale wciąż poprawnego)
+MAX_ALTERNATIVES = 64
+
+# Powyżej tej liczby bloków indeksu trygramów bloki są łączone w jeden
+MAX_BLOCKS = 8
+
+# Powyżej tej liczby kodów trygramów dokumenty oczekujące w buforze tworzą nowy blok
+MAX_PENDING = 1 << 20
+
+REPEATS = {
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    getattr(sre_constants, "POSSESSIVE_REPEAT", sre_constants.MAX_REPEAT)
+}
+
+def fold(text: str) -> str:
+    """
+    Sprowadza tekst do postaci, w której porównywane są trygramy (bez rozróżniania wielkości liter).
+    Tureckie "ı" i "İ" zamieniane są na "i", ponieważ wyrażenia regularne z IGNORECASE
+    uznają je za tę samą literę.
+    
+    Args:
+        text: Tekst
+        
+    Returns:
+        str: Tekst po ujednoliceniu wielkości liter
+    """
+    return text.casefold().replace("i\u0307", "i").replace("ı", "i")
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """
+    Zwraca trygramy znakowe tekstu (po ujednoliceniu wielkości liter)
+    
+    Args:
+        text: Tekst
+        
+    Returns:
+        FrozenSet[str]: Zbiór trygramów
+    """
+    folded = fold(text)
+    return frozenset(folded[i:i + 3] for i in range(len(folded) - 2))
+
+def _and(left: TrigramPlan, right: TrigramPlan) -> TrigramPlan:
+    plan = [a | b for a in left for b in right]
+    if len(plan) > MAX_ALTERNATIVES:
+        # Pominięcie jednego z warunków osłabia plan, ale nie odrzuca pasujących dokumentów
+        return min(left, right, key=len)
+    return plan
+
+def _or(plans: Iterable[TrigramPlan]) -> TrigramPlan:
+    plan = [alternative for branch in plans for alternative in branch]
+    if len(plan) > MAX_ALTERNATIVES or any(not alternative for alternative in plan):
+        return MATCH_ALL
+    return plan
+
+def _analyze(pattern) -> TrigramPlan:
+    """
+    Wyznacza plan trygramów dla sparsowanego wzorca (sekwencji elementów sre_parse).
+    Kolejne znaki dosłowne tworzą ciąg, którego trygramy są wymagane; elementy
+    opcjonalne i klasy znaków przerywają ciąg, a alternatywy dają alternatywę planów.
+    """
+    plan = MATCH_ALL
+    run = []
+    
+    def flush():
+        nonlocal plan
+        if len(run) >= 3:
+            plan = _and(plan, [trigrams("".join(run))])
+        run.clear()
+        
+    for op, value in pattern:
+        if op == sre_constants.LITERAL:
+            char = fold(chr(value))
+            if len(char) == 1:
+                run.append(char)
+                continue
+            flush()
+        elif op == sre_constants.SUBPATTERN:
+            flush()
+            plan = _and(plan, _analyze(value[-1]))
+        elif op in REPEATS:
+            flush()
+            minimum, _, item = value
+            if minimum >= 1:
+                plan = _and(plan, _analyze(item))
+        elif op == sre_constants.BRANCH:
+            flush()
+            plan = _and(plan, _or(_analyze(branch) for branch in value[1]))
+        elif op == getattr(sre_constants, "ATOMIC_GROUP", None):
+            flush()
+            plan = _and(plan, _analyze(value))
+        else:
+            # Klasy znaków, dowolny znak, kotwice, odwołania do grup, asercje
+            flush()
+    flush()
+    return plan
+
+def required_trigrams(pattern: str, flags: int = 0) -> TrigramPlan:
+    """
+    Wyznacza trygramy, które musi zawierać tekst pasujący do wyrażenia regularnego
+    
+    Args:
+        pattern: Wyrażenie regularne
+        flags: Flagi wyrażenia (re.IGNORECASE itp.)
+        
+    Returns:
+        TrigramPlan: Alternatywa zbiorów wymaganych trygramów (MATCH_ALL, gdy wzorzec
+            nie zawiera ciągu co najmniej trzech znaków dosłownych)
+            
+    Raises:
+        re.error: Gdy wyrażenie jest niepoprawne
+    """
+    return _analyze(sre_parse.parse(pattern, flags))
+
+def trigram_code(trigram: str) -> int:
+    """
+    Zwraca liczbę reprezentującą trygram (trzy punkty kodowe po 21 bitów)
+    
+    Args:
+        trigram: Trygram po ujednoliceniu wielkości liter
+        
+    Returns:
+        int: Kod trygramu
+    """
+    return (ord(trigram[0]) << 42) | (ord(trigram[1]) << 21) | ord(trigram[2])
+
+def trigram_codes(text: str) -> np.ndarray:
+    """
+    Zwraca kody kolejnych trygramów tekstu (obliczane na tablicy punktów kodowych, z powtórzeniami)
+    
+    Args:
+        text: Tekst
+        
+    Returns:
+        np.ndarray: Kody trygramów (int64)
+    """
+    chars = np.frombuffer(fold(text).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    if len(chars) < 3:
+        return np.zeros(0, dtype=np.int64)
+    return (chars[:-2] << 42) | (chars[1:-1] << 21) | chars[2:]
+
+def _first_of_runs(values: np.ndarray) -> np.ndarray:
+    """
+    Zwraca maskę pierwszych elementów ciągów równych wartości posortowanej tablicy
+    (sortowanie i porównanie sąsiadów jest szybsze niż np.unique)
+    """
+    mask = np.ones(len(values), dtype=bool)
+    np.not_equal(values[1:], values[:-1], out=mask[1:])
+    return mask
+
+def unique_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    Zwraca posortowane kody trygramów bez powtórzeń
+    
+    Args:
+        codes: Kody trygramów (int64)
+        
+    Returns:
+        np.ndarray: Posortowane, różne kody
+    """
+    codes = np.sort(codes)
+    return codes[_first_of_runs(codes)]
+
+def document_trigram_codes(pages: Iterable[str]) -> np.ndarray:
+    """
+    Zwraca posortowane, różne kody trygramów dokumentu (trygramy nie przechodzą przez granice stron)
+    
+    Args:
+        pages: Teksty kolejnych stron
+        
+    Returns:
+        np.ndarray: Kody trygramów (int64)
+    """
+    return unique_codes(np.concatenate([np.zeros(0, dtype=np.int64)] + [trigram_codes(text) for text in pages]))
+
+# Blok indeksu trygramów w układzie CSR: posortowane kody trygramów, początki ich list
+# (liczba kodów + 1 wartości) i połączone, rosnące listy numerów dokumentów
+TrigramBlock = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+def build_block(codes: np.ndarray, doc_ids: np.ndarray) -> TrigramBlock:
+    """
+    Buduje blok z par (kod trygramu, numer dokumentu)
+    
+    Args:
+        codes: Kody trygramów
+        doc_ids: Numery dokumentów kolejnych par (niemalejące)
+        
+    Returns:
+        TrigramBlock: Blok indeksu
+    """
+    # Sortowanie stabilne zachowuje rosnące numery dokumentów w liście każdego trygramu
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    starts = np.flatnonzero(_first_of_runs(codes))
+    return codes[starts], np.append(starts, len(codes)), doc_ids[order]
+
+def expand_block(block: TrigramBlock) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Zwraca pary (kod trygramu, numer dokumentu) bloku jako dwie tablice
+    
+    Args:
+        block: Blok indeksu
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Kody trygramów i numery dokumentów
+    """
+    codes, starts, doc_ids = block
+    return np.repeat(codes, np.diff(starts)), doc_ids
+
+def _postings(blocks: Sequence[TrigramBlock], trigram: str) -> np.ndarray:
+    """
+    Zwraca rosnące numery dokumentów bloków zawierających trygram
+    """
+    code = trigram_code(trigram)
+    parts = [np.zeros(0, dtype=np.uint32)]
+    for codes, starts, doc_ids in blocks:
+        index = np.searchsorted(codes, code)
+        if index < len(codes) and codes[index] == code:
+            parts.append(doc_ids[starts[index]:starts[index + 1]])
+    return np.concatenate(parts)
+
+def block_candidates(plan: TrigramPlan, blocks: Sequence[TrigramBlock]) -> np.ndarray:
+    """
+    Zwraca dokumenty bloków, które mogą zawierać dopasowanie (listy trygramów przecinane od najrzadszego)
+    
+    Args:
+        plan: Plan trygramów (required_trigrams) bez alternatywy pustej - taki plan
+            nie zawęża wyboru dokumentów
+        blocks: Bloki indeksu o rozłącznych, rosnących kolejno numerach dokumentów
+        
+    Returns:
+        np.ndarray: Rosnące numery dokumentów
+    """
+    result = np.zeros(0, dtype=np.uint32)
+    for alternative in plan:
+        postings_lists = sorted((_postings(blocks, trigram) for trigram in alternative), key=len)
+        matched = postings_lists[0]
+        for postings in postings_lists[1:]:
+            if not len(matched):
+                break
+            matched = np.intersect1d(matched, postings, assume_unique=True)
+        result = np.union1d(result, matched)
+    return result
+
+class TrigramIndex:
+    """
+    Indeks trygramów znakowych tekstu dokumentów: trygram -> rosnące numery dokumentów.
+    Służy do wstępnego wyboru dokumentów dla wyszukiwania fragmentów tekstu i wyrażeń
+    regularnych - dopasowania są potem sprawdzane dokładnie, tylko w wybranych dokumentach.
+    
+    Kody trygramów dokumentu liczone są przy jego indeksowaniu (document_trigram_codes);
+    indeks jest uzupełniany przy dodaniu i usunięciu dokumentu. Nowe dokumenty trafiają
+    do bufora, z którego przy zapytaniu (lub po przekroczeniu MAX_PENDING kodów) powstaje
+    blok. Numery dokumentów silnika rosną i nie są używane ponownie, więc listy kolejnych
+    bloków łączą się w rosnące listy. Usunięte dokumenty pozostają w blokach (wyniki są
+    filtrowane przez aktualne numery dokumentów), dopóki nie stanowią ponad połowy
+    indeksu - wtedy bloki są łączone bez nich, z zapisanych kodów, bez czytania tekstu.
+    """
+    
+    def __init__(self):
+        """
+        Inicjalizacja pustego indeksu
+        """
+        self.blocks: List[TrigramBlock] = []
+        self.pending: List[Tuple[int, np.ndarray]] = []
+        self.pending_codes = 0
+        self.document_count = 0
+        self.removed: Set[int] = set()
+    
+    def add_document(self, doc_id: int, codes: np.ndarray) -> None:
+        """
+        Dodaje dokument do indeksu
+        
+        Args:
+            doc_id: Numer dokumentu, większy od numerów dokumentów już dodanych
+            codes: Posortowane, różne kody trygramów dokumentu (document_trigram_codes)
+        """
+        self.pending.append((doc_id, codes))
+        self.pending_codes += len(codes)
+        self.document_count += 1
+        if self.pending_codes > MAX_PENDING:
+            self._flush()
+    
+    def remove_document(self, doc_id: int) -> None:
+        """
+        Usuwa dokument z indeksu
+        
+        Args:
+            doc_id: Numer dokumentu
+        """
+        for index, (pending_id, codes) in enumerate(self.pending):
+            if pending_id == doc_id:
+                del self.pending[index]
+                self.pending_codes -= len(codes)
+                self.document_count -= 1
+                return
+                
+        self.document_count -= 1
+        self.removed.add(doc_id)
+        if len(self.removed) > self.document_count:
+            self._merge_blocks()
+    
+    def _flush(self) -> None:
+        """
+        Tworzy blok z dokumentów oczekujących w buforze
+        """
+        if not self.pending:
+            return
+        codes = np.concatenate([codes for _, codes in self.pending])
+        doc_ids = np.concatenate([np.full(len(codes), doc_id, dtype=np.uint32) for doc_id, codes in self.pending])
+        self.pending.clear()
+        self.pending_codes = 0
+        if len(codes):
+            self.blocks.append(build_block(codes, doc_ids))
+        if len(self.blocks) > MAX_BLOCKS:
+            # Łączenie bloków, aby zapytanie nie przeszukiwało wielu małych bloków
+            self._merge_blocks()
+    
+    def _merge_blocks(self) -> None:
+        """
+        Łączy bloki w jeden, pomijając usunięte dokumenty
+        """
+        pairs = [expand_block(block) for block in self.blocks]
+        codes = np.concatenate([np.zeros(0, dtype=np.int64)] + [codes for codes, _ in pairs])
+        doc_ids = np.concatenate([np.zeros(0, dtype=np.uint32)] + [doc_ids for _, doc_ids in pairs])
+        if self.removed:
+            keep = np.isin(doc_ids, np.fromiter(self.removed, dtype=np.uint32), invert=True)
+            codes, doc_ids = codes[keep], doc_ids[keep]
+            self.removed.clear()
+        self.blocks = [build_block(codes, doc_ids)] if len(codes) else []
+    
+    def candidates(self, plan: TrigramPlan) -> List[int]:
+        """
+        Zwraca dokumenty, które mogą zawierać dopasowanie
+        
+        Args:
+            plan: Plan trygramów (required_trigrams) bez alternatywy pustej
+            
+        Returns:
+            List[int]: Rosnące numery dokumentów (także usuniętych, jeszcze nie pominiętych w blokach)
+        """
+        self._flush()
+        return block_candidates(plan, self.blocks).tolist()
\ No newline at end of file
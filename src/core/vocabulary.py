@@ -0,0 +1,198 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+class Vocabulary:
+    """
+    Słownik terminów indeksu: każdy znormalizowany termin otrzymuje gęsty
+    numer całkowity. Dokumenty i listy postingów przechowują numery terminów
+    w tablicach typowanych zamiast obiektów str, a sam napis terminu jest
+    w pamięci tylko raz.
+    
+    Numery nie są zwalniane po usunięciu dokumentów - słownik rośnie tylko
+    o nowe terminy i jest czyszczony razem z indeksem.
+    """
+    
+    def __init__(self):
+        """
+        Inicjalizacja pustego słownika
+        """
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._terms)
+    
+    def __contains__(self, term: str) -> bool:
+        return term in self._ids
+    
+    def add(self, term: str) -> int:
+        """
+        Zwraca numer terminu, dodając go do słownika, jeśli go tam nie ma
+        
+        Args:
+            term: Termin
+            
+        Returns:
+            int: Numer terminu
+        """
+        term_id = self._ids.get(term)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._ids[term] = term_id
+            self._terms.append(term)
+        return term_id
+    
+    def get(self, term: str) -> Optional[int]:
+        """
+        Zwraca numer terminu bez dodawania go do słownika
+        
+        Args:
+            term: Termin
+            
+        Returns:
+            Optional[int]: Numer terminu lub None, gdy terminu nie ma w słowniku
+        """
+        return self._ids.get(term)
+    
+    def term(self, term_id: int) -> str:
+        """
+        Zwraca termin o podanym numerze
+        
+        Args:
+            term_id: Numer terminu
+            
+        Returns:
+            str: Termin
+        """
+        return self._terms[term_id]
+
+class TermPositions(Mapping):
+    """
+    Pozycje terminów dokumentu przechowywane w trzech tablicach typowanych:
+    posortowane numery terminów, początki ich list pozycji i połączone pozycje.
+    Udostępnia ten sam interfejs co słownik termin -> pozycje
+    (i MappedTermPositions dla dokumentów z segmentu).
+    """
+    
+    def __init__(self, vocabulary: Vocabulary, positions: Dict[int, Sequence[int]]):
+        """
+        Inicjalizacja pozycji terminów
+        
+        Args:
+            vocabulary: Słownik terminów
+            positions: Słownik numer terminu -> rosnące pozycje terminu w dokumencie
+        """
+        self.vocabulary = vocabulary
+        self.term_ids = array('I', sorted(positions))
+        self.starts = array('I', [0])
+        self.positions = array('I')
+        for term_id in self.term_ids:
+            self.positions.extend(positions[term_id])
+            self.starts.append(len(self.positions))
+    
+    @classmethod
+    def from_terms(cls, vocabulary: Vocabulary, positions: Iterable[Tuple[str, Sequence[int]]]) -> "TermPositions":
+        """
+        Tworzy pozycje terminów z par (termin, pozycje), np. z DocumentIndex zapisanego w starym formacie
+        
+        Args:
+            vocabulary: Słownik terminów
+            positions: Pary (termin, pozycje)
+            
+        Returns:
+            TermPositions: Pozycje terminów
+        """
+        return cls(vocabulary, {vocabulary.add(term): term_positions for term, term_positions in positions})
+    
+    def find(self, term_id: int) -> Optional[Sequence[int]]:
+        """
+        Zwraca pozycje terminu o podanym numerze (widok tablicy, bez kopiowania)
+        
+        Args:
+            term_id: Numer terminu
+            
+        Returns:
+            Optional[Sequence[int]]: Pozycje lub None, gdy terminu nie ma w dokumencie
+        """
+        index = bisect_left(self.term_ids, term_id)
+        if index == len(self.term_ids) or self.term_ids[index] != term_id:
+            return None
+        return memoryview(self.positions)[self.starts[index]:self.starts[index + 1]]
+    
+    def __getitem__(self, term: str) -> Sequence[int]:
+        term_id = self.vocabulary.get(term)
+        positions = None if term_id is None else self.find(term_id)
+        if positions is None:
+            raise KeyError(term)
+        return positions
+    
+    def __iter__(self) -> Iterator[str]:
+        for term_id in self.term_ids:
+            yield self.vocabulary.term(term_id)
+    
+    def __len__(self) -> int:
+        return len(self.term_ids)
+
+class TermCounts(Mapping):
+    """
+    Liczby wystąpień znormalizowanych terminów dokumentu przechowywane
+    w dwóch tablicach typowanych: posortowane numery terminów i liczby wystąpień.
+    Udostępnia ten sam interfejs co słownik termin -> liczba wystąpień.
+    """
+    
+    def __init__(self, vocabulary: Vocabulary, counts: Dict[int, int]):
+        """
+        Inicjalizacja liczb wystąpień
+        
+        Args:
+            vocabulary: Słownik terminów
+            counts: Słownik numer terminu -> liczba wystąpień
+        """
+        self.vocabulary = vocabulary
+        self.term_ids = array('I', sorted(counts))
+        self.counts = array('I', (counts[term_id] for term_id in self.term_ids))
+    
+    @classmethod
+    def from_terms(cls, vocabulary: Vocabulary, counts: Iterable[Tuple[str, int]]) -> "TermCounts":
+        """
+        Tworzy liczby wystąpień z par (termin, liczba wystąpień)
+        
+        Args:
+            vocabulary: Słownik terminów
+            counts: Pary (termin, liczba wystąpień)
+            
+        Returns:
+            TermCounts: Liczby wystąpień
+        """
+        return cls(vocabulary, {vocabulary.add(term): count for term, count in counts})
+    
+    def find(self, term_id: int) -> int:
+        """
+        Zwraca liczbę wystąpień terminu o podanym numerze
+        
+        Args:
+            term_id: Numer terminu
+            
+        Returns:
+            int: Liczba wystąpień (0, gdy terminu nie ma w dokumencie)
+        """
+        index = bisect_left(self.term_ids, term_id)
+        if index == len(self.term_ids) or self.term_ids[index] != term_id:
+            return 0
+        return self.counts[index]
+    
+    def __getitem__(self, term: str) -> int:
+        term_id = self.vocabulary.get(term)
+        count = 0 if term_id is None else self.find(term_id)
+        if not count:
+            raise KeyError(term)
+        return count
+    
+    def __iter__(self) -> Iterator[str]:
+        for term_id in self.term_ids:
+            yield self.vocabulary.term(term_id)
+    
+    def __len__(self) -> int:
+        return len(self.term_ids)
\ No newline at end of file
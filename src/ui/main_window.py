@@ -4,6 +4,7 @@ from core.pdf_processor import PDFProcessor
 from core.text_processor import TextProcessor
 from core.search_engine import SearchEngine
 from utils.file_handler import FileHandler
+from utils.index_storage import IndexStorage
 from utils.config import config_manager
 from ui.results_view import ResultsView
 from ui.progress_dialog import ProgressDialog
@@ -11,6 +12,13 @@ from utils.exceptions import FileOperationError, PDFProcessingError
 from typing import List, Optional
 import os
 
+# Tryby wyszukiwania (ustawienie search_mode) i ich nazwy w interfejsie
+SEARCH_MODES = {
+    "words": "Słowa",
+    "substring": "Fragment tekstu",
+    "regex": "Wyrażenie regularne"
+}
+
 class MainWindow:
     """
     Główne okno aplikacji
@@ -36,9 +44,10 @@ class MainWindow:
             
             # Inicjalizacja silnika wyszukiwania
             self.search_engine = SearchEngine()
+            self.index_storage = IndexStorage()
             self.file_handler = FileHandler()
             
-            # Wczytaj ostatnio używany folder
+            # Wczytaj zapisany indeks i ostatnio używany folder
             self._load_last_directory()
             
         except Exception as e:
@@ -78,12 +87,25 @@ class MainWindow:
         self.search_entry.grid(row=0, column=0, padx=(0, 5))
         self.search_entry.bind('<Return>', lambda e: self._on_search())
         
+        # Tryb wyszukiwania: słowa (frazy i zapytania logiczne), fragment tekstu lub wyrażenie regularne
+        self.search_mode_var = tk.StringVar(
+            value=SEARCH_MODES.get(config_manager.get("search_mode", "words"), SEARCH_MODES["words"])
+        )
+        self.search_mode_box = ttk.Combobox(
+            search_frame,
+            textvariable=self.search_mode_var,
+            values=list(SEARCH_MODES.values()),
+            state="readonly",
+            width=20
+        )
+        self.search_mode_box.grid(row=0, column=1, padx=(0, 5))
+        
         self.search_button = ttk.Button(
             search_frame,
             text="Szukaj",
             command=self._on_search
         )
-        self.search_button.grid(row=0, column=1)
+        self.search_button.grid(row=0, column=2)
         
         # Widok wyników
         self.results_view = ResultsView(main_frame)
@@ -158,15 +180,30 @@ class MainWindow:
     
     def _load_last_directory(self):
         """
-        Wczytuje ostatnio używany folder
+        Wczytuje zapisany indeks i uzgadnia go z zawartością ostatnio używanego folderu
         """
+        # Start z indeksu zapisanego na dysku zamiast ponownego parsowania PDF-ów
+        documents = self.index_storage.load_index()
+        if documents:
+            self.search_engine.load_documents(documents)
+        self.search_engine.load_quarantine(self.index_storage.load_quarantine())
+        self.search_engine.load_lemmas(self.index_storage.load_lemmas())
+        
         last_dir = config_manager.get("last_directory")
         if last_dir and os.path.exists(last_dir):
             try:
+                # Indeksowanie przyrostowe przetwarza tylko nowe i zmienione pliki
                 self.search_engine.index_directory(last_dir)
-                self._update_status()
+                self._save_index()
             except Exception as e:
                 print(f"Błąd wczytywania ostatniego folderu: {str(e)}")
+        self._update_status()
+    
+    def _save_index(self):
+        """
+        Zapisuje na dysku zmiany indeksu od ostatniego zapisu
+        """
+        self.search_engine.save_changes(self.index_storage)
     
     def _on_folder_select(self):
         """
@@ -182,8 +219,9 @@ class MainWindow:
                 # Zapisz wybrany folder w konfiguracji
                 config_manager.set("last_directory", folder)
                 
-                # Indeksuj dokumenty
+                # Indeksuj dokumenty i zapisz indeks
                 self.search_engine.index_directory(folder)
+                self._save_index()
                 
                 # Aktualizuj status
                 self._update_status()
@@ -207,8 +245,13 @@ class MainWindow:
             return
         
         try:
-            # Wyszukaj dokumenty
-            results = self.search_engine.search(query)
+            # Wyszukaj dokumenty w wybranym trybie
+            mode = next(
+                (mode for mode, label in SEARCH_MODES.items() if label == self.search_mode_var.get()),
+                "words"
+            )
+            config_manager.set("search_mode", mode)
+            results = self.search_engine.search(query, mode)
             
             if results:
                 # Wyświetl wyniki
@@ -236,11 +279,16 @@ class MainWindow:
             message: Opcjonalna wiadomość do wyświetlenia
         """
         try:
-            if hasattr(self, 'file_handler'):
-                valid_files = self.file_handler.get_valid_files()
+            if hasattr(self, 'search_engine'):
                 current_dir = config_manager.get("last_directory", "Nie wybrano folderu")
                 status = f"Folder: {current_dir} | "
-                status += f"Liczba dokumentów: {len(valid_files)}"
+                status += f"Liczba dokumentów: {self.search_engine.get_document_count()}"
+                without_text = len(self.search_engine.get_documents_without_text())
+                if without_text:
+                    status += f" | Bez warstwy tekstowej: {without_text}"
+                quarantined = len(self.search_engine.get_quarantined_files())
+                if quarantined:
+                    status += f" | Pominięte pliki: {quarantined}"
                 if message:
                     status += f" | {message}"
             else:
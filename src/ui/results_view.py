@@ -164,7 +164,9 @@ class ResultsView(ttk.Frame):
             # Aktualizujemy podgląd
             self.preview_text.config(state="normal")
             self.preview_text.delete(1.0, tk.END)
-            for match in result.matches:
+            for i, match in enumerate(result.matches):
+                if i < len(result.pages):
+                    self.preview_text.insert(tk.END, f"[Strona {result.pages[i]}] ")
                 self.preview_text.insert(tk.END, match + "\n\n")
             self.preview_text.config(state="disabled")
 
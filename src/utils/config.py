@@ -16,6 +16,11 @@ class AppConfig:
     max_results: int = 100  # Maksymalna liczba wyników
     min_score: float = 0.1  # Minimalna trafność wyniku
     context_size: int = 50  # Liczba znaków kontekstu
+    search_mode: str = "words"  # Tryb wyszukiwania: "words" (frazy i zapytania logiczne), "substring" (fragment tekstu) lub "regex"
+    ranking: str = "bm25"  # Metoda oceny trafności: "bm25" lub "jaccard"
+    bm25_k1: float = 1.2  # Nasycenie częstości terminu w BM25
+    bm25_b: float = 0.75  # Normalizacja długością dokumentu w BM25
+    document_cache_size: int = 64  # Liczba rozpakowanych stron dokumentów w pamięci podręcznej
     
     # Ustawienia interfejsu
     window_width: int = 800
@@ -25,10 +30,21 @@ class AppConfig:
     # Ustawienia indeksowania
     index_batch_size: int = 100  # Liczba dokumentów w jednej partii
     auto_index: bool = True  # Automatyczne indeksowanie nowych plików
+    index_workers: int = 0  # Liczba procesów wydobywających tekst (0 = liczba rdzeni, 1 = bez puli procesów)
+    index_merge_factor: int = 8  # Liczba segmentów indeksu scalanych w tle w jeden większy
+    extraction_timeout: float = 120.0  # Limit czasu wydobywania tekstu z jednego pliku w sekundach (0 = bez limitu)
+    max_document_pages: int = 5000  # Maksymalna liczba stron indeksowanego pliku (0 = bez limitu)
+    max_document_size: int = 500 * 1024 * 1024  # Maksymalny rozmiar indeksowanego pliku w bajtach (0 = bez limitu)
+    extraction_cache_size: int = 512 * 1024 * 1024  # Rozmiar pamięci podręcznej wydobytego tekstu na dysku w bajtach (0 = wyłączona)
+    page_split_threshold: int = 1000  # Liczba stron, powyżej której plik jest dzielony między procesy robocze (0 = bez podziału)
+    page_chunk_size: int = 250  # Liczba stron w jednej części dzielonego pliku
     
     # Ustawienia języka
     language: str = "english"  # Domyślny język
     stop_words: bool = True  # Usuwanie stop words
+    tokenizer: str = "regex"  # Tokenizacja: "regex" (szybka, jednoprzebiegowa) lub "nltk" (word_tokenize)
+    lemma_cache_size: int = 100000  # Liczba zapamiętanych lematów (0 = bez pamięci podręcznej)
+    persist_lemma_cache: bool = True  # Zapisywanie lematów obok indeksu
 
 class ConfigManager:
     """
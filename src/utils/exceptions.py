@@ -14,6 +14,10 @@ class PDFProcessingError(PDFSearchError):
     """Błąd podczas przetwarzania pliku PDF"""
     pass
 
+class ExtractionLimitError(PDFProcessingError):
+    """Przetwarzanie pliku PDF przekroczyło limit czasu, stron lub rozmiaru"""
+    pass
+
 class IndexingError(PDFSearchError):
     """Błąd podczas indeksowania dokumentów"""
     pass
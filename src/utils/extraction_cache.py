@@ -0,0 +1,211 @@
+import os
+import pickle
+from typing import List, Optional, Tuple
+from core.pdf_processor import PDFMetadata
+from utils.config import config_manager
+
+class ExtractionCache:
+    """
+    Pamięć podręczna tekstu wydobytego z plików PDF, przechowywana na dysku.
+    
+    Wpisy są kluczowane szybkim skrótem zawartości pliku (rozmiar, początek
+    i koniec pliku), a nie ścieżką, więc kopie tego samego pliku w innych
+    folderach i pliki o zmienionej nazwie nie są ponownie parsowane.
+    Każdy wpis zawiera skrót całej zawartości, który potwierdza trafienie.
+    Strony są zapisywane w postaci skompresowanej; gdy rozmiar pamięci
+    przekroczy limit, usuwane są najdawniej używane wpisy.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_size: Optional[int] = None):
+        """
+        Inicjalizacja pamięci podręcznej
+        
+        Args:
+            cache_dir: Katalog z wpisami (domyślnie obok katalogu indeksu)
+            max_size: Maksymalny rozmiar wpisów w bajtach, 0 wyłącza pamięć
+                (domyślnie z konfiguracji)
+        """
+        if not cache_dir:
+            index_dir = config_manager.get("index_directory")
+            if not index_dir:
+                index_dir = os.path.join(os.path.expanduser("~"), ".pdf_search", "index")
+            cache_dir = os.path.join(index_dir, "extraction_cache")
+        self.cache_dir = cache_dir
+        self._max_size = max_size
+        
+        # Łączny rozmiar wpisów (obliczany przy pierwszym zapisie)
+        self._total_size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def max_size(self) -> int:
+        """
+        Maksymalny rozmiar wpisów w bajtach (0 = pamięć wyłączona)
+        """
+        if self._max_size is not None:
+            return self._max_size
+        return config_manager.get("extraction_cache_size", 0)
+    
+    def get(self, key: str, content_hash: str) -> Optional[Tuple[List[Tuple[int, bytes]], Optional[PDFMetadata]]]:
+        """
+        Zwraca zapisany wynik wydobycia tekstu
+        
+        Args:
+            key: Szybki skrót pliku
+            content_hash: Skrót całej zawartości pliku
+            
+        Returns:
+            Pary (numer strony, skompresowany tekst strony) i metadane
+            lub None, gdy pliku nie ma w pamięci podręcznej
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            print(f"Błąd odczytu pamięci podręcznej tekstu {path}: {str(e)}")
+            self.misses += 1
+            return None
+            
+        # Ten sam szybki skrót nie przesądza o tej samej zawartości
+        if entry.get("content_hash") != content_hash:
+            self.misses += 1
+            return None
+            
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["pages"], entry["metadata"]
+    
+    def contains(self, key: str) -> bool:
+        """
+        Sprawdza, czy istnieje wpis o podanym szybkim skrócie
+        (pozwala pominąć obliczanie pełnego skrótu przy braku wpisu)
+        
+        Args:
+            key: Szybki skrót pliku
+            
+        Returns:
+            bool: True jeśli wpis istnieje
+        """
+        return os.path.exists(self._entry_path(key))
+    
+    def put(
+        self,
+        key: str,
+        content_hash: str,
+        pages: List[Tuple[int, bytes]],
+        metadata: Optional[PDFMetadata]
+    ) -> None:
+        """
+        Zapisuje wynik wydobycia tekstu
+        
+        Args:
+            key: Szybki skrót pliku
+            content_hash: Skrót całej zawartości pliku
+            pages: Pary (numer strony, skompresowany tekst strony)
+            metadata: Metadane dokumentu
+        """
+        max_size = self.max_size
+        if not max_size:
+            return
+            
+        path = self._entry_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data = pickle.dumps({"content_hash": content_hash, "pages": pages, "metadata": metadata})
+            if len(data) > max_size:
+                return
+                
+            if self._total_size is None:
+                self._total_size = sum(size for _, size, _ in self._list_entries())
+            if os.path.exists(path):
+                self._total_size -= os.path.getsize(path)
+                
+            temp_path = path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            self._total_size += len(data)
+            
+            if self._total_size > max_size:
+                self._evict(max_size)
+        except Exception as e:
+            print(f"Błąd zapisu pamięci podręcznej tekstu {path}: {str(e)}")
+    
+    def clear(self) -> None:
+        """
+        Usuwa wszystkie wpisy
+        """
+        for path, _, _ in self._list_entries():
+            self._remove(path)
+        self._total_size = 0
+    
+    def _evict(self, max_size: int) -> None:
+        """
+        Usuwa najdawniej używane wpisy, aż rozmiar zmieści się w limicie
+        
+        Args:
+            max_size: Maksymalny rozmiar wpisów w bajtach
+        """
+        entries = sorted(self._list_entries(), key=lambda entry: entry[2])
+        for path, size, _ in entries:
+            if self._total_size <= max_size:
+                break
+            if self._remove(path):
+                self._total_size -= size
+    
+    def _list_entries(self) -> List[Tuple[str, int, float]]:
+        """
+        Zwraca wpisy pamięci podręcznej
+        
+        Returns:
+            List[Tuple[str, int, float]]: Trójki (ścieżka, rozmiar, czas ostatniego użycia)
+        """
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+    
+    def _remove(self, path: str) -> bool:
+        """
+        Usuwa plik wpisu
+        
+        Args:
+            path: Ścieżka do pliku wpisu
+            
+        Returns:
+            bool: True jeśli plik został usunięty
+        """
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+    
+    def _entry_path(self, key: str) -> str:
+        """
+        Zwraca ścieżkę do pliku wpisu
+        
+        Args:
+            key: Szybki skrót pliku
+            
+        Returns:
+            str: Ścieżka do pliku
+        """
+        return os.path.join(self.cache_dir, key + ".pkl")
\ No newline at end of file
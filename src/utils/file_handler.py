@@ -1,4 +1,5 @@
 from typing import List, Set, Dict, Optional
+import hashlib
 import os
 import magic
 from dataclasses import dataclass
@@ -20,6 +21,7 @@ class FileInfo:
     modified_time: datetime  # Data ostatniej modyfikacji
     is_valid: bool = False  # Czy plik jest prawidłowym PDF-em
     error_message: Optional[str] = None  # Komunikat błędu (jeśli wystąpił)
+    content_hash: Optional[str] = None  # Skrót zawartości pliku (jeśli został obliczony)
 
 class FileHandler:
     """
@@ -193,6 +195,8 @@ class FileHandler:
     def check_file_changes(self, file_path: str) -> bool:
         """
         Sprawdza czy plik został zmodyfikowany.
+        Porównuje rozmiar i datę modyfikacji z zapisanymi informacjami,
+        a przy zmianie samej daty - także skrót zawartości (jeśli jest znany).
         
         Args:
             file_path (str): Ścieżka do pliku
@@ -207,12 +211,99 @@ class FileHandler:
             return True
 
         try:
+            known = self.files[file_path]
             stat = os.stat(file_path)
             current_mtime = datetime.fromtimestamp(stat.st_mtime)
-            return current_mtime > self.files[file_path].modified_time
+            if stat.st_size != known.size:
+                return True
+            if current_mtime == known.modified_time:
+                return False
+            if known.content_hash is None:
+                return current_mtime > known.modified_time
+
+            # Zmieniła się tylko data - porównujemy zawartość
+            if self.compute_file_hash(file_path) != known.content_hash:
+                return True
+            known.modified_time = current_mtime
+            return False
         except Exception as e:
             raise FileOperationError(f"Błąd podczas sprawdzania modyfikacji pliku: {str(e)}")
 
+    def get_file_state(self, file_path: str) -> FileInfo:
+        """
+        Odczytuje rozmiar i datę modyfikacji pliku (bez walidacji zawartości).
+        
+        Args:
+            file_path (str): Ścieżka do pliku
+            
+        Returns:
+            FileInfo: Informacje o pliku
+            
+        Raises:
+            FileOperationError: Gdy nie można odczytać informacji o pliku
+        """
+        try:
+            stat = os.stat(file_path)
+        except Exception as e:
+            raise FileOperationError(f"Nie można odczytać informacji o pliku: {str(e)}")
+        return FileInfo(
+            path=file_path,
+            size=stat.st_size,
+            modified_time=datetime.fromtimestamp(stat.st_mtime),
+            is_valid=True
+        )
+
+    def compute_file_hash(self, file_path: str) -> str:
+        """
+        Oblicza skrót (BLAKE2b) całej zawartości pliku.
+        
+        Args:
+            file_path (str): Ścieżka do pliku
+            
+        Returns:
+            str: Skrót w postaci szesnastkowej
+            
+        Raises:
+            FileOperationError: Gdy nie można odczytać pliku
+        """
+        try:
+            digest = hashlib.blake2b(digest_size=20)
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except Exception as e:
+            raise FileOperationError(f"Nie można obliczyć skrótu pliku: {str(e)}")
+
+    def compute_quick_hash(self, file_path: str, block_size: int = 64 * 1024) -> str:
+        """
+        Oblicza szybki skrót pliku z jego rozmiaru oraz początku i końca zawartości.
+        Różne pliki mogą mieć ten sam szybki skrót, więc zgodność należy
+        potwierdzić skrótem całej zawartości (compute_file_hash).
+        
+        Args:
+            file_path (str): Ścieżka do pliku
+            block_size (int): Liczba bajtów odczytywana z początku i z końca pliku
+            
+        Returns:
+            str: Skrót w postaci szesnastkowej
+            
+        Raises:
+            FileOperationError: Gdy nie można odczytać pliku
+        """
+        try:
+            digest = hashlib.blake2b(digest_size=20)
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                digest.update(str(size).encode('ascii'))
+                digest.update(f.read(block_size))
+                if size > block_size:
+                    f.seek(max(block_size, size - block_size))
+                    digest.update(f.read(block_size))
+            return digest.hexdigest()
+        except Exception as e:
+            raise FileOperationError(f"Nie można obliczyć skrótu pliku: {str(e)}")
+
     def get_valid_files(self) -> List[str]:
         """
         Zwraca listę ścieżek do prawidłowych plików PDF.
@@ -1,15 +1,34 @@
 import os
 import json
 import pickle
+import threading
 import zlib
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 from datetime import datetime
-from src.core.search_engine import DocumentIndex
-from src.utils.config import config_manager
+from core.models import DocumentIndex
+from utils.file_handler import FileInfo
+from core.mapped_index import MappedSegment, build_segment
+from utils.config import config_manager
+
+# Wersja formatu indeksu zapisywana w metadanych
+INDEX_VERSION = "4.0"
+
+# Plik z listą plików pominiętych po przekroczeniu limitów przetwarzania
+QUARANTINE_FILE = "quarantine.json"
+
+# Plik z zapamiętanymi lematami (forma słowa -> lemat)
+LEMMA_CACHE_FILE = "lemmas.json"
 
 class IndexStorage:
     """
-    Klasa odpowiedzialna za zapisywanie i wczytywanie indeksu wyszukiwania
+    Klasa odpowiedzialna za zapisywanie i wczytywanie indeksu wyszukiwania.
+    
+    Indeks składa się z niezmiennych segmentów. Każda aktualizacja dopisuje
+    nowy, mały segment z dodanymi/zmienionymi dokumentami oraz listą usuniętych
+    ścieżek (tzw. nagrobków). Segmenty są łączone w tle, gdy jest ich zbyt wiele.
+    
+    Segmenty są plikami binarnymi odwzorowywanymi w pamięci (core.mapped_index),
+    więc wczytanie indeksu nie deserializuje treści ani list postingów.
     """
     def __init__(self):
         """
@@ -20,17 +39,24 @@ class IndexStorage:
         if not self.index_dir:
             # Jeśli nie ma w konfiguracji, użyj domyślnej ścieżki
             self.index_dir = os.path.join(os.path.expanduser("~"), ".pdf_search", "index")
-        
+            
         # Upewnij się, że katalog istnieje
         os.makedirs(self.index_dir, exist_ok=True)
         
-        # Ścieżki do plików indeksu
+        # Ścieżki do plików indeksu (search_index.pkl to indeks w formacie 1.0)
         self.index_file = os.path.join(self.index_dir, "search_index.pkl")
         self.metadata_file = os.path.join(self.index_dir, "metadata.json")
+        
+        # Ścieżki dokumentów obecnych w indeksie (znane po wczytaniu lub zapisie)
+        self._live_paths: Optional[Set[str]] = None
+        
+        # Blokada chroniąca metadane przed równoczesną aktualizacją i łączeniem segmentów
+        self._lock = threading.RLock()
+        self._merge_thread: Optional[threading.Thread] = None
     
     def save_index(self, documents: Dict[str, DocumentIndex]) -> bool:
         """
-        Zapisuje indeks wyszukiwania do pliku
+        Zapisuje cały indeks wyszukiwania jako jeden segment
         
         Args:
             documents: Słownik dokumentów do zapisania
@@ -39,23 +65,22 @@ class IndexStorage:
             bool: True jeśli zapis się powiódł, False w przeciwnym razie
         """
         try:
-            # Przygotuj metadane
-            metadata = {
-                "version": "1.0",
-                "document_count": len(documents),
-                "last_updated": datetime.now().isoformat(),
-                "document_paths": list(documents.keys())
-            }
-            
-            # Kompresuj i zapisz indeks
-            compressed_data = zlib.compress(pickle.dumps(documents))
-            with open(self.index_file, 'wb') as f:
-                f.write(compressed_data)
-            
-            # Zapisz metadane
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
-            
+            self.wait_for_merge()
+            with self._lock:
+                old_metadata = self._read_metadata()
+                
+                metadata = self._new_metadata(old_metadata)
+                self._append_segment(metadata, documents, [])
+                metadata["document_count"] = len(documents)
+                self._write_metadata(metadata)
+                self._live_paths = set(documents)
+                
+                # Usuń poprzednie segmenty i indeks w starym formacie
+                if old_metadata:
+                    self._remove_segment_files(old_metadata.get("segments", []))
+                if os.path.exists(self.index_file):
+                    os.remove(self.index_file)
+                    
             return True
             
         except Exception as e:
@@ -64,61 +89,96 @@ class IndexStorage:
     
     def load_index(self) -> Optional[Dict[str, DocumentIndex]]:
         """
-        Wczytuje indeks wyszukiwania z pliku
+        Wczytuje indeks wyszukiwania, stosując kolejno wszystkie segmenty
         
         Returns:
             Optional[Dict[str, DocumentIndex]]: Słownik dokumentów lub None w przypadku błędu
         """
         try:
-            # Sprawdź czy pliki istnieją
-            if not os.path.exists(self.index_file) or not os.path.exists(self.metadata_file):
-                return None
-            
-            # Wczytaj metadane
-            with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-            
-            # Sprawdź wersję
-            if metadata["version"] != "1.0":
-                print(f"Nieobsługiwana wersja indeksu: {metadata['version']}")
-                return None
-            
-            # Wczytaj i dekompresuj indeks
-            with open(self.index_file, 'rb') as f:
-                compressed_data = f.read()
-            
-            documents = pickle.loads(zlib.decompress(compressed_data))
-            
-            # Sprawdź czy wszystkie dokumenty istnieją
-            for path in metadata["document_paths"]:
-                if not os.path.exists(path):
-                    print(f"Ostrzeżenie: Dokument nie istnieje: {path}")
-            
-            return documents
-            
+            with self._lock:
+                # Sprawdź czy metadane istnieją
+                if not os.path.exists(self.metadata_file):
+                    return None
+                    
+                # Wczytaj metadane
+                with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                    
+                # Indeks w formacie 1.0 przepisujemy na segmenty binarne
+                if metadata["version"] == "1.0":
+                    return self._migrate_legacy_index(metadata)
+                    
+                # Sprawdź wersję
+                if metadata["version"] != INDEX_VERSION:
+                    print(f"Nieobsługiwana wersja indeksu: {metadata['version']}")
+                    return None
+                    
+                # Dokumenty nowszych segmentów przesłaniają starsze; zwracane są
+                # widoki dokumentów odczytujące dane z segmentów przy dostępie
+                documents: Dict[str, DocumentIndex] = {}
+                segments = [self._read_segment(segment["name"]) for segment in metadata["segments"]]
+                for segment in segments:
+                    for path in segment.deleted:
+                        documents.pop(path, None)
+                    for document in segment.documents:
+                        documents[document.file_path] = document
+                        
+                # Segmenty bez aktualnych dokumentów można od razu zamknąć
+                used = {id(document.segment) for document in documents.values()}
+                for segment in segments:
+                    if id(segment) not in used:
+                        segment.close()
+                        
+                self._live_paths = set(documents)
+                self._remove_orphan_segments(metadata)
+                return documents
+                
         except Exception as e:
             print(f"Błąd podczas wczytywania indeksu: {str(e)}")
             return None
     
-    def update_index(self, documents: Dict[str, DocumentIndex]) -> bool:
+    def update_index(
+        self,
+        documents: Dict[str, DocumentIndex],
+        deleted_paths: Optional[Iterable[str]] = None
+    ) -> bool:
         """
-        Aktualizuje istniejący indeks
+        Aktualizuje istniejący indeks dopisując nowy segment.
+        Koszt zapisu zależy tylko od liczby zmienionych dokumentów.
         
         Args:
             documents: Nowe dokumenty do dodania/aktualizacji
+            deleted_paths: Ścieżki dokumentów usuniętych z indeksu
             
         Returns:
             bool: True jeśli aktualizacja się powiodła, False w przeciwnym razie
         """
         try:
-            # Wczytaj istniejący indeks
-            existing_docs = self.load_index() or {}
-            
-            # Aktualizuj dokumenty
-            existing_docs.update(documents)
-            
-            # Zapisz zaktualizowany indeks
-            return self.save_index(existing_docs)
+            deleted = [path for path in (deleted_paths or []) if path not in documents]
+            if not documents and not deleted:
+                return True
+                
+            metadata = self._read_metadata()
+            if metadata is None or metadata["version"] != INDEX_VERSION:
+                # Brak indeksu w bieżącym formacie - zapisujemy go w całości
+                existing = (self.load_index() or {}) if metadata else {}
+                for path in deleted:
+                    existing.pop(path, None)
+                existing.update(documents)
+                return self.save_index(existing)
+                
+            with self._lock:
+                metadata = self._read_metadata()
+                live_paths = self._get_live_paths()
+                self._append_segment(metadata, documents, deleted)
+                live_paths.difference_update(deleted)
+                live_paths.update(documents)
+                metadata["document_count"] = len(live_paths)
+                metadata["last_updated"] = datetime.now().isoformat()
+                self._write_metadata(metadata)
+                
+            self._maybe_merge()
+            return True
             
         except Exception as e:
             print(f"Błąd podczas aktualizacji indeksu: {str(e)}")
@@ -134,7 +194,7 @@ class IndexStorage:
         try:
             if not os.path.exists(self.metadata_file):
                 return None
-            
+                
             with open(self.metadata_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
                 
@@ -150,11 +210,414 @@ class IndexStorage:
             bool: True jeśli czyszczenie się powiodło, False w przeciwnym razie
         """
         try:
-            if os.path.exists(self.index_file):
-                os.remove(self.index_file)
-            if os.path.exists(self.metadata_file):
-                os.remove(self.metadata_file)
+            self.wait_for_merge()
+            with self._lock:
+                metadata = self._read_metadata()
+                if metadata:
+                    self._remove_segment_files(metadata.get("segments", []))
+                if os.path.exists(self.index_file):
+                    os.remove(self.index_file)
+                if os.path.exists(self.metadata_file):
+                    os.remove(self.metadata_file)
+                self._live_paths = set()
             return True
         except Exception as e:
             print(f"Błąd podczas czyszczenia indeksu: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
+    
+    def save_quarantine(self, quarantine: Dict[str, FileInfo]) -> bool:
+        """
+        Zapisuje listę plików pominiętych po przekroczeniu limitów przetwarzania
+        
+        Args:
+            quarantine: Słownik ścieżka -> stan pliku z przyczyną pominięcia
+            
+        Returns:
+            bool: True jeśli zapis się powiódł, False w przeciwnym razie
+        """
+        try:
+            entries = {
+                path: {
+                    "reason": info.error_message,
+                    "size": info.size,
+                    "modified_time": info.modified_time.isoformat()
+                }
+                for path, info in quarantine.items()
+            }
+            data = json.dumps(entries, indent=2, ensure_ascii=False).encode('utf-8')
+            self._write_atomic(os.path.join(self.index_dir, QUARANTINE_FILE), data)
+            return True
+        except Exception as e:
+            print(f"Błąd podczas zapisywania listy kwarantanny: {str(e)}")
+            return False
+    
+    def load_quarantine(self) -> Dict[str, FileInfo]:
+        """
+        Wczytuje listę plików pominiętych po przekroczeniu limitów przetwarzania
+        
+        Returns:
+            Dict[str, FileInfo]: Słownik ścieżka -> stan pliku z przyczyną pominięcia
+        """
+        path = os.path.join(self.index_dir, QUARANTINE_FILE)
+        try:
+            if not os.path.exists(path):
+                return {}
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return {
+                file_path: FileInfo(
+                    path=file_path,
+                    size=entry["size"],
+                    modified_time=datetime.fromisoformat(entry["modified_time"]),
+                    is_valid=False,
+                    error_message=entry["reason"]
+                )
+                for file_path, entry in entries.items()
+            }
+        except Exception as e:
+            print(f"Błąd podczas wczytywania listy kwarantanny: {str(e)}")
+            return {}
+    
+    def save_lemmas(self, lemmas: Dict[str, str]) -> bool:
+        """
+        Zapisuje pamięć podręczną lematów, aby kolejne uruchomienie nie pytało WordNet
+        
+        Args:
+            lemmas: Słownik forma słowa -> lemat
+            
+        Returns:
+            bool: True jeśli zapis się powiódł, False w przeciwnym razie
+        """
+        try:
+            data = json.dumps(lemmas, ensure_ascii=False).encode('utf-8')
+            self._write_atomic(os.path.join(self.index_dir, LEMMA_CACHE_FILE), data)
+            return True
+        except Exception as e:
+            print(f"Błąd podczas zapisywania lematów: {str(e)}")
+            return False
+    
+    def load_lemmas(self) -> Dict[str, str]:
+        """
+        Wczytuje pamięć podręczną lematów
+        
+        Returns:
+            Dict[str, str]: Słownik forma słowa -> lemat
+        """
+        path = os.path.join(self.index_dir, LEMMA_CACHE_FILE)
+        try:
+            if not os.path.exists(path):
+                return {}
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Błąd podczas wczytywania lematów: {str(e)}")
+            return {}
+    
+    def merge_segments(self, background: bool = True, full: bool = False) -> None:
+        """
+        Łączy segmenty wybrane przez politykę łączenia.
+        
+        Args:
+            background: Czy łączyć w wątku w tle
+            full: Czy połączyć wszystkie segmenty w jeden (z pominięciem polityki)
+        """
+        if background and not full:
+            self._maybe_merge()
+            return
+            
+        self.wait_for_merge()
+        if background:
+            self._merge_thread = threading.Thread(target=self._merge, args=(full,), daemon=True)
+            self._merge_thread.start()
+        else:
+            self._merge(full)
+    
+    def wait_for_merge(self) -> None:
+        """
+        Czeka na zakończenie łączenia segmentów w tle
+        """
+        thread = self._merge_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+    
+    def _maybe_merge(self) -> None:
+        """
+        Uruchamia łączenie segmentów w tle, jeśli polityka łączenia tego wymaga
+        """
+        if self._merge_thread is not None and self._merge_thread.is_alive():
+            return
+        metadata = self._read_metadata()
+        if metadata is None or self._select_merge(metadata["segments"]) is None:
+            return
+        self._merge_thread = threading.Thread(target=self._merge, daemon=True)
+        self._merge_thread.start()
+    
+    def _select_merge(self, segments: List[Dict]) -> Optional[List[str]]:
+        """
+        Polityka łączenia: gdy segmentów jest co najmniej `index_merge_factor`,
+        łączymy najnowsze segmenty, zaczynając od najstarszego segmentu, który jest
+        mniejszy niż suma nowszych od niego. Duże, stare segmenty pozostają nietknięte.
+        
+        Args:
+            segments: Lista opisów segmentów (od najstarszego)
+            
+        Returns:
+            Optional[List[str]]: Nazwy segmentów do połączenia lub None
+        """
+        merge_factor = max(2, config_manager.get("index_merge_factor", 8))
+        if len(segments) < merge_factor:
+            return None
+            
+        sizes = [segment["size"] for segment in segments]
+        for start in range(len(segments) - 1):
+            if sizes[start] <= sum(sizes[start + 1:]):
+                return [segment["name"] for segment in segments[start:]]
+        return [segment["name"] for segment in segments[-merge_factor:]]
+    
+    def _merge(self, full: bool = False) -> None:
+        """
+        Łączy wybrany ciąg kolejnych segmentów w jeden segment
+        
+        Args:
+            full: Czy połączyć wszystkie segmenty
+        """
+        try:
+            metadata = self._read_metadata()
+            if metadata is None or metadata["version"] != INDEX_VERSION:
+                return
+            if full:
+                names = [segment["name"] for segment in metadata["segments"]]
+                if len(names) < 2:
+                    return
+            else:
+                names = self._select_merge(metadata["segments"])
+            if not names:
+                return
+                
+            # Segmenty są niezmienne, więc można je czytać bez blokady
+            is_oldest = names[0] == metadata["segments"][0]["name"]
+            documents: Dict[str, DocumentIndex] = {}
+            deleted: Set[str] = set()
+            segments = [self._read_segment(name) for name in names]
+            for segment in segments:
+                for path in segment.deleted:
+                    documents.pop(path, None)
+                    deleted.add(path)
+                for document in segment.documents:
+                    deleted.discard(document.file_path)
+                    documents[document.file_path] = document
+                    
+            # Nagrobki są potrzebne tylko dla dokumentów ze starszych segmentów
+            if is_oldest:
+                deleted.clear()
+                
+            with self._lock:
+                # Indeks mógł zostać w międzyczasie zapisany od nowa lub wyczyszczony
+                current = self._read_metadata()
+                start = self._find_segment_run(current, names)
+                if start is not None:
+                    merged = self._write_segment(current, documents, sorted(deleted))
+                    current["segments"][start:start + len(names)] = [merged]
+                    self._write_metadata(current)
+                    
+            for segment in segments:
+                segment.close()
+            if start is not None:
+                self._remove_segment_files([{"name": name} for name in names])
+                
+        except Exception as e:
+            print(f"Błąd podczas łączenia segmentów indeksu: {str(e)}")
+    
+    def _find_segment_run(self, metadata: Optional[Dict], names: List[str]) -> Optional[int]:
+        """
+        Zwraca położenie ciągu segmentów w metadanych
+        
+        Args:
+            metadata: Metadane indeksu
+            names: Nazwy kolejnych segmentów
+            
+        Returns:
+            Optional[int]: Indeks pierwszego segmentu lub None, gdy ciągu już nie ma
+        """
+        if metadata is None or metadata["version"] != INDEX_VERSION:
+            return None
+        current_names = [segment["name"] for segment in metadata["segments"]]
+        if names[0] not in current_names:
+            return None
+        start = current_names.index(names[0])
+        if current_names[start:start + len(names)] != names:
+            return None
+        return start
+    
+    def _new_metadata(self, old_metadata: Optional[Dict]) -> Dict:
+        """
+        Tworzy metadane pustego indeksu
+        
+        Args:
+            old_metadata: Poprzednie metadane (numeracja segmentów jest kontynuowana)
+            
+        Returns:
+            Dict: Metadane indeksu
+        """
+        next_segment = 1
+        if old_metadata and old_metadata.get("version") == INDEX_VERSION:
+            next_segment = old_metadata["next_segment"]
+        return {
+            "version": INDEX_VERSION,
+            "document_count": 0,
+            "last_updated": datetime.now().isoformat(),
+            "next_segment": next_segment,
+            "segments": []
+        }
+    
+    def _append_segment(self, metadata: Dict, documents: Dict[str, DocumentIndex], deleted: List[str]) -> None:
+        """
+        Zapisuje nowy segment i dopisuje go do metadanych
+        
+        Args:
+            metadata: Metadane indeksu (modyfikowane)
+            documents: Dokumenty segmentu
+            deleted: Ścieżki usuniętych dokumentów
+        """
+        metadata["segments"].append(self._write_segment(metadata, documents, deleted))
+    
+    def _write_segment(self, metadata: Dict, documents: Dict[str, DocumentIndex], deleted: List[str]) -> Dict:
+        """
+        Zapisuje segment do pliku
+        
+        Args:
+            metadata: Metadane indeksu (zwiększany jest licznik segmentów)
+            documents: Dokumenty segmentu
+            deleted: Ścieżki usuniętych dokumentów
+            
+        Returns:
+            Dict: Opis segmentu do zapisania w metadanych
+        """
+        name = f"segment_{metadata['next_segment']:06d}.idx"
+        metadata["next_segment"] += 1
+        
+        path = os.path.join(self.index_dir, name)
+        data = build_segment(documents, deleted)
+        self._write_atomic(path, data)
+        
+        return {
+            "name": name,
+            "documents": len(documents),
+            "deleted": len(deleted),
+            "size": len(data)
+        }
+    
+    def _read_segment(self, name: str) -> MappedSegment:
+        """
+        Otwiera segment (odwzorowanie pliku w pamięci)
+        
+        Args:
+            name: Nazwa pliku segmentu
+            
+        Returns:
+            MappedSegment: Segment z dokumentami i listą usuniętych ścieżek
+        """
+        return MappedSegment(os.path.join(self.index_dir, name))
+    
+    def _read_metadata(self) -> Optional[Dict]:
+        """
+        Wczytuje metadane indeksu
+        
+        Returns:
+            Optional[Dict]: Metadane lub None, gdy indeks nie istnieje
+        """
+        if not os.path.exists(self.metadata_file):
+            return None
+        with open(self.metadata_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _write_metadata(self, metadata: Dict) -> None:
+        """
+        Zapisuje metadane indeksu (atomowo, przez plik tymczasowy)
+        
+        Args:
+            metadata: Metadane indeksu
+        """
+        data = json.dumps(metadata, indent=2, ensure_ascii=False).encode('utf-8')
+        self._write_atomic(self.metadata_file, data)
+    
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        """
+        Zapisuje plik tak, aby nigdy nie był widoczny w połowie zapisu
+        
+        Args:
+            path: Ścieżka do pliku
+            data: Zawartość pliku
+        """
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    
+    def _get_live_paths(self) -> Set[str]:
+        """
+        Zwraca ścieżki dokumentów obecnych w indeksie
+        
+        Returns:
+            Set[str]: Zbiór ścieżek
+        """
+        if self._live_paths is None:
+            self._live_paths = set(self.load_index() or {})
+        return self._live_paths
+    
+    def _remove_segment_files(self, segments: List[Dict]) -> None:
+        """
+        Usuwa pliki segmentów
+        
+        Args:
+            segments: Opisy segmentów do usunięcia
+        """
+        for segment in segments:
+            self._remove_file(os.path.join(self.index_dir, segment["name"]))
+    
+    def _remove_orphan_segments(self, metadata: Dict) -> None:
+        """
+        Usuwa pliki segmentów nieobecnych w metadanych
+        (np. po przerwanym łączeniu segmentów)
+        
+        Args:
+            metadata: Metadane indeksu
+        """
+        if self._merge_thread is not None and self._merge_thread.is_alive():
+            return
+        known = {segment["name"] for segment in metadata["segments"]}
+        for name in os.listdir(self.index_dir):
+            if name.startswith("segment_") and name not in known:
+                self._remove_file(os.path.join(self.index_dir, name))
+    
+    def _remove_file(self, path: str) -> None:
+        """
+        Usuwa plik segmentu. Plik odwzorowany jeszcze w pamięci (np. przez
+        wczytany wcześniej indeks) może nie dać się usunąć w systemie Windows -
+        zostanie wtedy usunięty jako osierocony przy kolejnym wczytaniu.
+        
+        Args:
+            path: Ścieżka do pliku
+        """
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            print(f"Nie można usunąć pliku segmentu {path}: {str(e)}")
+    
+    def _migrate_legacy_index(self, metadata: Dict) -> Optional[Dict[str, DocumentIndex]]:
+        """
+        Wczytuje indeks w formacie 1.0 (jeden skompresowany plik) i zapisuje go jako segment binarny
+        
+        Args:
+            metadata: Metadane indeksu w formacie 1.0
+            
+        Returns:
+            Optional[Dict[str, DocumentIndex]]: Słownik dokumentów lub None
+        """
+        if not os.path.exists(self.index_file):
+            return None
+        with open(self.index_file, 'rb') as f:
+            documents: Dict[str, DocumentIndex] = pickle.loads(zlib.decompress(f.read()))
+        self.save_index(documents)
+        return documents
\ No newline at end of file
@@ -37,6 +37,7 @@ class TestConfigManager(unittest.TestCase):
         self.assertEqual(config["max_results"], 100)
         self.assertEqual(config["min_score"], 0.1)
         self.assertEqual(config["context_size"], 50)
+        self.assertEqual(config["ranking"], "bm25")
         self.assertEqual(config["window_width"], 800)
         self.assertEqual(config["window_height"], 600)
         self.assertEqual(config["theme"], "default")
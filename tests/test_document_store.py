@@ -0,0 +1,76 @@
+import unittest
+from src.core.models import DocumentIndex
+from src.core.document_store import DocumentStore, compress_text, decompress_text
+
+class TestDocumentStore(unittest.TestCase):
+    """
+    Testy jednostkowe dla klasy DocumentStore
+    """
+    
+    def _document(self, file_path, text):
+        """
+        Tworzy dokument ze skompresowaną treścią
+        """
+        return DocumentIndex(
+            file_path=file_path,
+            title=file_path,
+            content="",
+            compressed_pages=[compress_text(text)],
+            page_numbers=[1],
+            page_starts=[0]
+        )
+    
+    def test_compression_round_trip(self):
+        """
+        Test kompresji i rozpakowania tekstu z polskimi znakami
+        """
+        text = "Zażółć gęślą jaźń " * 100
+        data = compress_text(text)
+        self.assertLess(len(data), len(text.encode('utf-8')))
+        self.assertEqual(decompress_text(data), text)
+    
+    def test_get_uses_cache(self):
+        """
+        Test pamięci podręcznej rozpakowanych treści
+        """
+        store = DocumentStore(cache_size=2)
+        document = self._document("a.pdf", "Tekst A")
+        
+        self.assertEqual(store.get_page(document, 0), "Tekst A")
+        self.assertEqual(store.get_page(document, 0), "Tekst A")
+        self.assertEqual((store.hits, store.misses), (1, 1))
+        
+        # Nowa wersja dokumentu nie korzysta z treści poprzedniej
+        updated = self._document("a.pdf", "Tekst A2")
+        self.assertEqual(store.get_page(updated, 0), "Tekst A2")
+        self.assertEqual(store.misses, 2)
+    
+    def test_lru_eviction(self):
+        """
+        Test usuwania najdawniej używanych treści
+        """
+        store = DocumentStore(cache_size=2)
+        documents = [self._document(f"{name}.pdf", name) for name in "abc"]
+        
+        store.get_page(documents[0], 0)
+        store.get_page(documents[1], 0)
+        store.get_page(documents[0], 0)
+        store.get_page(documents[2], 0)
+        
+        store.get_page(documents[0], 0)
+        self.assertEqual(store.hits, 2)
+        store.get_page(documents[1], 0)
+        self.assertEqual(store.misses, 4)
+    
+    def test_plain_content(self):
+        """
+        Test dokumentów z nieskompresowaną treścią
+        """
+        store = DocumentStore(cache_size=0)
+        document = DocumentIndex(file_path="a.pdf", title="a.pdf", content="Tekst")
+        self.assertEqual(store.get_page(document, 0), "Tekst")
+        self.assertEqual(store.get_page(document, 0), "Tekst")
+        self.assertEqual(store.hits, 0)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+from reportlab.pdfgen import canvas
+from src.core import pdf_processor as pdf_processor_module
+from src.core.extraction_worker import ExtractionWorker, ExtractionLimitError
+from src.core.pdf_processor import PDFProcessor
+
+def slow_pages(self, reader, *_):
+    """
+    Zastępuje PDFProcessor._iter_pages - symuluje plik, którego parsowanie trwa bardzo długo
+    """
+    time.sleep(30)
+    yield 1, "Nigdy"
+
+def endless_pages(self, reader, *_):
+    """
+    Zastępuje PDFProcessor._iter_pages - symuluje plik, który bez końca zwraca kolejne strony
+    """
+    number = 0
+    while True:
+        number += 1
+        time.sleep(0.01)
+        yield number, "Strona"
+
+class TestExtractionWorker(unittest.TestCase):
+    """
+    Testy jednostkowe procesu roboczego wydobywającego tekst
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie dwustronicowego pliku PDF
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.test_dir, "test.pdf")
+        pdf = canvas.Canvas(self.pdf_path)
+        pdf.drawString(100, 750, "Pierwsza strona")
+        pdf.showPage()
+        pdf.drawString(100, 750, "Druga strona")
+        pdf.save()
+        
+        self.worker = ExtractionWorker()
+    
+    def tearDown(self):
+        """
+        Sprzątanie po testach
+        """
+        self.worker.close()
+        shutil.rmtree(self.test_dir)
+    
+    def test_read_document(self):
+        """
+        Test wydobycia stron w procesie roboczym
+        """
+        with PDFProcessor().read_document(self.pdf_path) as (pages, metadata):
+            expected = list(pages)
+            
+        with self.worker.read_document(self.pdf_path, timeout=30) as (pages, metadata):
+            self.assertEqual(metadata.page_count, 2)
+            self.assertEqual(list(pages), expected)
+        self.assertFalse(self.worker.busy)
+        
+        # Nieprawidłowy plik zgłasza ten sam wyjątek co PDFProcessor
+        invalid_path = os.path.join(self.test_dir, "invalid.pdf")
+        with open(invalid_path, 'w') as f:
+            f.write("To nie jest PDF")
+        with self.assertRaises(ValueError):
+            with self.worker.read_document(invalid_path, timeout=30):
+                pass
+    
+    def test_page_limit(self):
+        """
+        Test odrzucenia dokumentu o zbyt wielu stronach
+        """
+        with self.assertRaises(ExtractionLimitError):
+            with self.worker.read_document(self.pdf_path, max_pages=1):
+                pass
+    
+    def test_timeout(self):
+        """
+        Test zabicia procesu roboczego po przekroczeniu limitu czasu
+        """
+        # Proces roboczy jest tworzony przy pierwszym zleceniu i dziedziczy podmienioną metodę
+        with patch.object(pdf_processor_module.PDFProcessor, "_iter_pages", slow_pages):
+            start = time.monotonic()
+            with self.assertRaises(ExtractionLimitError):
+                with self.worker.read_document(self.pdf_path, timeout=0.5) as (pages, _):
+                    list(pages)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertFalse(self.worker.busy)
+        
+        # Kolejne zlecenie uruchamia nowy proces
+        with self.worker.read_document(self.pdf_path, timeout=30) as (pages, _):
+            self.assertEqual([number for number, _ in pages], [1, 2])
+    
+    def test_timeout_while_streaming(self):
+        """
+        Test zabicia procesu roboczego, który po upływie limitu czasu nadal przesyła strony
+        """
+        with patch.object(pdf_processor_module.PDFProcessor, "_iter_pages", endless_pages):
+            start = time.monotonic()
+            with self.assertRaises(ExtractionLimitError):
+                with self.worker.read_document(self.pdf_path, timeout=0.5) as (pages, _):
+                    for _ in pages:
+                        pass
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertFalse(self.worker.busy)
+        
+        # Zakres stron z terminem, który już upłynął, jest przerywany od razu
+        self.worker.submit(self.pdf_path, timeout=30, page_range=(0, 1), deadline=time.monotonic())
+        with self.assertRaises(ExtractionLimitError):
+            self.worker.receive()
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
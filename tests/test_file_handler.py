@@ -125,6 +125,24 @@ class TestFileHandler(unittest.TestCase):
         # Sprawdzamy czy wykryto zmianę
         self.assertTrue(self.file_handler.check_file_changes(test_file))
     
+    def test_check_file_changes_content_hash(self):
+        """
+        Test porównania skrótu zawartości przy zmianie samej daty modyfikacji
+        """
+        test_file = os.path.join(self.test_dir, 'test1.pdf')
+        file_info = self.file_handler.get_file_state(test_file)
+        file_info.content_hash = self.file_handler.compute_file_hash(test_file)
+        self.file_handler.files[test_file] = file_info
+        
+        # Zmiana daty bez zmiany zawartości
+        os.utime(test_file, (0, 0))
+        self.assertFalse(self.file_handler.check_file_changes(test_file))
+        
+        # Zmiana zawartości bez zmiany rozmiaru
+        with open(test_file, 'wb') as f:
+            f.write(b'%PDF-1.4\nTest CONTENT')
+        self.assertTrue(self.file_handler.check_file_changes(test_file))
+    
     def test_check_file_changes_error(self):
         """
         Test obsługi błędów podczas sprawdzania zmian
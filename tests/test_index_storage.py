@@ -3,14 +3,9 @@ import os
 import tempfile
 import shutil
 from datetime import datetime
-import nltk
 from src.utils.index_storage import IndexStorage
 from src.core.search_engine import DocumentIndex
-from src.core.text_processor import TextProcessor, ProcessedDocument
-
-# Pobierz wymagane dane NLTK
-nltk.download('punkt')
-nltk.download('stopwords')
+from src.utils.file_handler import FileInfo
 
 class TestIndexStorage(unittest.TestCase):
     """
@@ -31,21 +26,20 @@ class TestIndexStorage(unittest.TestCase):
         self.storage.metadata_file = os.path.join(self.temp_dir, "metadata.json")
         
         # Tworzymy przykładowe dokumenty do testów
-        text_processor = TextProcessor()
         self.test_documents = {
             "test1.pdf": DocumentIndex(
                 file_path="test1.pdf",
-                processed_doc=text_processor.process_text("This is a test document"),
                 title="Test Document 1",
+                content="This is a test document",
                 page_count=1,
-                content="This is a test document"
+                term_counts={"test": 1, "document": 1}
             ),
             "test2.pdf": DocumentIndex(
                 file_path="test2.pdf",
-                processed_doc=text_processor.process_text("Another test document"),
                 title="Test Document 2",
+                content="Another test document",
                 page_count=1,
-                content="Another test document"
+                term_counts={"another": 1, "test": 1, "document": 1}
             )
         }
     
@@ -76,6 +70,7 @@ class TestIndexStorage(unittest.TestCase):
         doc1 = loaded_docs["test1.pdf"]
         self.assertEqual(doc1.title, "Test Document 1")
         self.assertEqual(doc1.content, "This is a test document")
+        self.assertEqual(doc1.term_counts, {"test": 1, "document": 1})
     
     def test_update_index(self):
         """
@@ -85,13 +80,11 @@ class TestIndexStorage(unittest.TestCase):
         self.assertTrue(self.storage.save_index(self.test_documents))
         
         # Tworzymy nowy dokument do dodania
-        text_processor = TextProcessor()
         new_doc = DocumentIndex(
             file_path="test3.pdf",
-            processed_doc=text_processor.process_text("New test document"),
             title="Test Document 3",
-            page_count=1,
-            content="New test document"
+            content="New test document",
+            page_count=1
         )
         
         # Aktualizujemy indeks
@@ -118,10 +111,62 @@ class TestIndexStorage(unittest.TestCase):
         
         # Sprawdzamy czy informacje są poprawne
         self.assertIsNotNone(info)
-        self.assertEqual(info["version"], "1.0")
+        self.assertEqual(info["version"], "4.0")
         self.assertEqual(info["document_count"], 2)
         self.assertIn("last_updated", info)
-        self.assertEqual(len(info["document_paths"]), 2)
+        self.assertEqual(len(info["segments"]), 1)
+    
+    def test_update_appends_segment(self):
+        """
+        Test dopisywania segmentu i nagrobków przy aktualizacji
+        """
+        self.assertTrue(self.storage.save_index(self.test_documents))
+        
+        # Aktualizacja jednego dokumentu i usunięcie drugiego
+        updated = DocumentIndex(
+            file_path="test1.pdf",
+            title="Test Document 1",
+            content="Updated test document",
+            page_count=1
+        )
+        self.assertTrue(self.storage.update_index({"test1.pdf": updated}, ["test2.pdf"]))
+        
+        info = self.storage.get_index_info()
+        self.assertEqual(len(info["segments"]), 2)
+        self.assertEqual(info["document_count"], 1)
+        
+        loaded_docs = self.storage.load_index()
+        self.assertEqual(list(loaded_docs), ["test1.pdf"])
+        self.assertEqual(loaded_docs["test1.pdf"].content, "Updated test document")
+    
+    def test_merge_segments(self):
+        """
+        Test łączenia segmentów
+        """
+        self.assertTrue(self.storage.save_index(self.test_documents))
+        for i in range(3):
+            document = DocumentIndex(
+                file_path=f"new{i}.pdf",
+                title=f"New {i}",
+                content="New document",
+                page_count=1
+            )
+            self.assertTrue(self.storage.update_index({document.file_path: document}))
+        self.assertTrue(self.storage.update_index({}, ["test2.pdf"]))
+        self.storage.wait_for_merge()
+        expected = self.storage.load_index()
+        
+        self.storage.merge_segments(background=False, full=True)
+        
+        info = self.storage.get_index_info()
+        self.assertEqual(len(info["segments"]), 1)
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.temp_dir) if name.startswith("segment_")),
+            [info["segments"][0]["name"]]
+        )
+        loaded_docs = self.storage.load_index()
+        self.assertEqual(sorted(loaded_docs), sorted(expected))
+        self.assertNotIn("test2.pdf", loaded_docs)
     
     def test_clear_index(self):
         """
@@ -167,6 +212,43 @@ class TestIndexStorage(unittest.TestCase):
         
         # Sprawdzamy czy zwrócono None
         self.assertIsNone(loaded_docs)
+    
+    def test_save_and_load_quarantine(self):
+        """
+        Test zapisywania i wczytywania listy kwarantanny
+        """
+        self.assertEqual(self.storage.load_quarantine(), {})
+        
+        quarantine = {
+            "big.pdf": FileInfo(
+                path="big.pdf",
+                size=1024,
+                modified_time=datetime(2024, 1, 2, 3, 4, 5),
+                error_message="Przekroczono limit czasu wydobywania tekstu (60 s)"
+            )
+        }
+        self.assertTrue(self.storage.save_quarantine(quarantine))
+        
+        loaded = self.storage.load_quarantine()
+        self.assertEqual(list(loaded), ["big.pdf"])
+        self.assertEqual(loaded["big.pdf"].size, 1024)
+        self.assertEqual(loaded["big.pdf"].modified_time, datetime(2024, 1, 2, 3, 4, 5))
+        self.assertEqual(loaded["big.pdf"].error_message, quarantine["big.pdf"].error_message)
+        self.assertFalse(loaded["big.pdf"].is_valid)
+    
+    def test_save_and_load_lemmas(self):
+        """
+        Test zapisywania i wczytywania pamięci podręcznej lematów
+        """
+        self.assertEqual(self.storage.load_lemmas(), {})
+        
+        lemmas = {"documents": "document", "ważne": "ważne", "cats": "cat"}
+        self.assertTrue(self.storage.save_lemmas(lemmas))
+        
+        # Kolejność (od najdawniej używanej formy) jest zachowana
+        loaded = self.storage.load_lemmas()
+        self.assertEqual(loaded, lemmas)
+        self.assertEqual(list(loaded), list(lemmas))
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,191 @@
+import unittest
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+from src.core.models import DocumentIndex
+from src.core.mapped_index import MappedSegment, MappedDocument, build_segment
+from src.core.trigram_index import required_trigrams, document_trigram_codes
+from src.core.document_store import compress_text
+
+class TestMappedSegment(unittest.TestCase):
+    """
+    Testy jednostkowe segmentu indeksu odwzorowywanego w pamięci
+    """
+    
+    def setUp(self):
+        """
+        Zapisanie przykładowego segmentu
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.documents = {
+            "b.pdf": DocumentIndex(
+                file_path="b.pdf",
+                title="b.pdf",
+                content="Zażółć gęślą jaźń",
+                page_count=2,
+                token_offsets=[0, 7, 13],
+                term_positions={"zażółć": [0], "gęślą": [1], "jaźń": [2]},
+                term_counts={"zażółć": 1, "jaźń": 1},
+                length=2
+            ),
+            "a.pdf": DocumentIndex(
+                file_path="a.pdf",
+                title="a.pdf",
+                content="python and python",
+                page_count=1,
+                token_offsets=[0, 7, 11],
+                term_positions={"python": [0, 2], "and": [1]},
+                term_counts={"python": 2},
+                length=2
+            )
+        }
+        self.path = os.path.join(self.temp_dir, "segment.idx")
+        with open(self.path, 'wb') as f:
+            f.write(build_segment(self.documents, ["old.pdf"]))
+        self.segment = MappedSegment(self.path)
+    
+    def tearDown(self):
+        """
+        Sprzątanie po testach
+        """
+        self.segment.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_documents(self):
+        """
+        Test odczytu tabeli dokumentów i nagrobków
+        """
+        documents = {document.file_path: document for document in self.segment.documents}
+        self.assertEqual(sorted(documents), ["a.pdf", "b.pdf"])
+        self.assertEqual(self.segment.deleted, ["old.pdf"])
+        
+        document = documents["b.pdf"]
+        self.assertEqual(document.content, "Zażółć gęślą jaźń")
+        self.assertEqual(list(document.token_offsets), [0, 7, 13])
+        self.assertEqual(document.page_count, 2)
+        self.assertEqual(document.length, 2)
+    
+    def test_term_lookup(self):
+        """
+        Test wyszukiwania terminów w posortowanych słownikach
+        """
+        postings = self.segment.postings("python")
+        self.assertEqual(len(postings), 1)
+        document, positions = postings[0]
+        self.assertEqual(document.file_path, "a.pdf")
+        self.assertEqual(list(positions), [0, 2])
+        
+        self.assertEqual(self.segment.postings("brak"), [])
+        self.assertEqual(
+            [(document.file_path, count) for document, count in self.segment.frequencies("jaźń")],
+            [("b.pdf", 1)]
+        )
+    
+    def test_document_terms(self):
+        """
+        Test odczytu terminów dokumentu jako słowników
+        """
+        for document in self.segment.documents:
+            original = self.documents[document.file_path]
+            self.assertEqual(document.term_counts, original.term_counts)
+            self.assertEqual(
+                {term: list(positions) for term, positions in document.term_positions.items()},
+                original.term_positions
+            )
+            self.assertNotIn("brak", document.term_counts)
+    
+    def test_pages(self):
+        """
+        Test odczytu stron dokumentu
+        """
+        documents = {
+            "c.pdf": DocumentIndex(
+                file_path="c.pdf",
+                title="c.pdf",
+                content="",
+                token_offsets=[0, 0],
+                term_positions={"jeden": [0], "dwa": [1]},
+                compressed_pages=[compress_text("jeden"), compress_text("dwa")],
+                page_numbers=[2, 5],
+                page_starts=[0, 1]
+            ),
+            "scan.pdf": DocumentIndex(
+                file_path="scan.pdf",
+                title="scan.pdf",
+                content="",
+                page_count=3
+            )
+        }
+        path = os.path.join(self.temp_dir, "pages.idx")
+        with open(path, 'wb') as f:
+            f.write(build_segment(documents, []))
+        segment = MappedSegment(path)
+        self.addCleanup(segment.close)
+        
+        documents = {document.file_path: document for document in segment.documents}
+        document = documents["c.pdf"]
+        with patch.object(segment, "document_pages", wraps=segment.document_pages) as document_pages:
+            self.assertEqual(document.page_numbers, [2, 5])
+            self.assertEqual(document.find_page(1), 1)
+            self.assertEqual(document.get_page_number(1), 5)
+            self.assertEqual(document.get_page_text(1), "dwa")
+            self.assertEqual(document.get_content(), "jeden\ndwa")
+            self.assertEqual(document.text_page_count, 2)
+            
+        # Tabela stron jest odczytywana z segmentu tylko raz
+        self.assertEqual(document_pages.call_count, 1)
+        
+        # Dokument bez warstwy tekstowej nie ma żadnej strony
+        self.assertEqual(documents["scan.pdf"].page_numbers, [])
+        self.assertEqual(documents["scan.pdf"].pages_without_text, 3)
+        self.assertEqual(documents["scan.pdf"].get_content(), "")
+        
+        # Dokument bez podziału na strony zapisywany jest jako jedna strona
+        document = self.segment.documents[1]
+        self.assertEqual(document.page_numbers, [1])
+        self.assertEqual(document.get_page_text(0), "Zażółć gęślą jaźń")
+    
+    def test_trigrams(self):
+        """
+        Test indeksu trygramów zapisanego w segmencie i przepisywanego przy łączeniu segmentów
+        """
+        def candidates(segment, pattern):
+            return [document.file_path for document in segment.trigram_documents(required_trigrams(pattern))]
+            
+        # Dokumenty bez zapisanych trygramów (format 1.0) mają je liczone z tekstu
+        self.assertEqual(candidates(self.segment, "python"), ["a.pdf"])
+        self.assertEqual(candidates(self.segment, "GĘŚL|and"), ["a.pdf", "b.pdf"])
+        self.assertEqual(candidates(self.segment, "brak"), [])
+        
+        # Dokumenty z segmentu zachowują trygramy bez odczytu tekstu
+        documents = {document.file_path: document for document in self.segment.documents}
+        documents["c.pdf"] = DocumentIndex(
+            file_path="c.pdf",
+            title="c.pdf",
+            content="",
+            trigram_codes=document_trigram_codes(["python"])
+        )
+        del documents["b.pdf"]
+        path = os.path.join(self.temp_dir, "merged.idx")
+        with patch.object(MappedDocument, "get_page_text") as get_page_text:
+            with open(path, 'wb') as f:
+                f.write(build_segment(documents, []))
+        get_page_text.assert_not_called()
+        merged = MappedSegment(path)
+        self.addCleanup(merged.close)
+        self.assertEqual(candidates(merged, "python"), ["a.pdf", "c.pdf"])
+        self.assertEqual(candidates(merged, "jaźń"), [])
+    
+    def test_invalid_file(self):
+        """
+        Test odrzucenia pliku, który nie jest segmentem
+        """
+        path = os.path.join(self.temp_dir, "invalid.idx")
+        with open(path, 'wb') as f:
+            f.write(b"invalid data" * 20)
+        with self.assertRaises(ValueError):
+            MappedSegment(path)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
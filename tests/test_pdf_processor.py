@@ -4,6 +4,7 @@ import tempfile
 from datetime import datetime
 from PyPDF2 import PdfWriter, PdfReader
 from io import BytesIO
+from unittest.mock import patch
 from reportlab.pdfgen import canvas
 from src.core.pdf_processor import PDFProcessor, PDFMetadata
 
@@ -87,6 +88,91 @@ class TestPDFProcessor(unittest.TestCase):
         self.assertEqual(metadata.modification_date.month, 1)
         self.assertEqual(metadata.modification_date.day, 2)
     
+    def test_extract_metadata(self):
+        """
+        Test odczytu samych metadanych, bez wydobywania tekstu
+        """
+        with patch.object(self.processor, "_iter_pages") as iter_pages:
+            metadata = self.processor.extract_metadata(self.test_pdf_path)
+        iter_pages.assert_not_called()
+        self.assertEqual(metadata, self.processor.process_file(self.test_pdf_path)[1])
+        
+        # Filtrowanie katalogu dokumentów
+        self.assertTrue(metadata.matches(author="test author", date_from=datetime(2023, 12, 31)))
+        self.assertFalse(metadata.matches(author="Kowalski"))
+        self.assertFalse(metadata.matches(date_to=datetime(2023, 12, 31)))
+        self.assertFalse(PDFMetadata().matches(date_from=datetime(2023, 12, 31)))
+        
+        with self.assertRaises(ValueError):
+            self.processor.extract_metadata(os.path.join(self.test_dir, "brak.pdf"))
+    
+    def test_extract_pages(self):
+        """
+        Test wydobywania tekstu z zachowaniem numerów stron
+        """
+        pages_path = os.path.join(self.test_dir, "pages.pdf")
+        c = canvas.Canvas(pages_path)
+        c.drawString(100, 750, "Pierwsza strona")
+        c.showPage()
+        c.showPage()  # Strona bez tekstu
+        c.drawString(100, 750, "Trzecia strona")
+        c.save()
+        
+        try:
+            pages = self.processor.extract_pages(pages_path)
+            self.assertEqual([number for number, _ in pages], [1, 3])
+            self.assertIn("Trzecia", pages[1][1])
+            self.assertEqual(
+                self.processor.extract_text(pages_path),
+                "\n".join(text for _, text in pages)
+            )
+            
+            # Generator odczytuje kolejne strony dopiero przy pobieraniu
+            iterator = self.processor.iter_pages(pages_path)
+            self.assertEqual(next(iterator)[0], 1)
+            self.assertEqual(list(iterator), pages[1:])
+            
+            # Jedno otwarcie pliku: metadane z liczbą wszystkich stron i generator stron z tekstem
+            with self.processor.read_document(pages_path) as (document_pages, metadata):
+                self.assertEqual(metadata.page_count, 3)
+                self.assertEqual(list(document_pages), pages)
+                
+            # Zakresy stron wydobywane niezależnie i połączone w kolejności dają cały dokument
+            ranges = PDFProcessor.split_pages(3, 2)
+            self.assertEqual(ranges, [(0, 2), (2, 3)])
+            chunks = []
+            for start, stop in ranges:
+                with self.processor.read_document(pages_path, start=start, stop=stop) as (document_pages, metadata):
+                    self.assertEqual(metadata.page_count, 3)
+                    chunks.extend(document_pages)
+            self.assertEqual(chunks, pages)
+            self.assertEqual(list(self.processor.iter_pages(pages_path, 1)), pages[1:])
+        finally:
+            os.remove(pages_path)
+    
+    def test_image_only_pages(self):
+        """
+        Test pomijania stron bez warstwy tekstowej bez wydobywania tekstu
+        """
+        scan_path = os.path.join(self.test_dir, "scan.pdf")
+        c = canvas.Canvas(scan_path)
+        c.drawString(100, 750, "Strona z tekstem")
+        c.showPage()
+        c.rect(100, 100, 200, 200, fill=1)  # Sama grafika
+        c.showPage()
+        c.save()
+        
+        try:
+            reader = PdfReader(scan_path)
+            self.assertEqual([self.processor._has_text_layer(page) for page in reader.pages], [True, False])
+            
+            with patch.object(type(reader.pages[1]), "extract_text", autospec=True, return_value="tekst") as extract_text:
+                pages = list(self.processor._iter_pages(reader))
+            self.assertEqual(extract_text.call_count, 1)
+            self.assertEqual([number for number, _ in pages], [1])
+        finally:
+            os.remove(scan_path)
+    
     def test_invalid_file(self):
         """
         Test obsługi nieprawidłowego pliku
@@ -0,0 +1,46 @@
+import unittest
+from array import array
+from src.core.postings import gallop, intersect, union, difference
+
+class TestPostings(unittest.TestCase):
+    """
+    Testy operacji na listach postingów
+    """
+    
+    def test_gallop(self):
+        """
+        Test wyszukiwania galopującego
+        """
+        postings = array('I', [2, 4, 8, 16, 32, 64, 128])
+        self.assertEqual(gallop(postings, 1), 0)
+        self.assertEqual(gallop(postings, 16), 3)
+        self.assertEqual(gallop(postings, 17), 4)
+        self.assertEqual(gallop(postings, 64, 3), 5)
+        self.assertEqual(gallop(postings, 200), len(postings))
+        for target in range(130):
+            for low in range(len(postings) + 1):
+                if low == 0 or postings[low - 1] < target:
+                    expected = next((i for i, doc_id in enumerate(postings) if doc_id >= target), len(postings))
+                    self.assertEqual(gallop(postings, target, low), expected)
+    
+    def test_intersect(self):
+        """
+        Test przecinania list zaczynając od najkrótszej
+        """
+        frequent = array('I', range(0, 1000, 2))
+        rare = [10, 11, 500, 998, 999]
+        self.assertEqual(intersect([frequent, rare, range(0, 1000, 5)]), [10, 500])
+        self.assertEqual(intersect([frequent, []]), [])
+        self.assertEqual(intersect([rare]), rare)
+        self.assertEqual(intersect([]), [])
+    
+    def test_union_and_difference(self):
+        """
+        Test sumy i różnicy list
+        """
+        self.assertEqual(union([[1, 3, 5], array('I', [2, 3, 6]), []]), [1, 2, 3, 5, 6])
+        self.assertEqual(difference([1, 2, 3, 5, 8], array('I', [2, 5, 6])), [1, 3, 8])
+        self.assertEqual(difference([1, 2], []), [1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import unittest
+from src.core.query_parser import QueryParser, Phrase, And, Or, Not, SearchError
+from src.core.text_processor import WORD_PATTERN
+
+def index_terms(text):
+    return [match.group().lower() for match in WORD_PATTERN.finditer(text)]
+
+class TestQueryParser(unittest.TestCase):
+    """
+    Testy parsera zapytań logicznych
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie parsera
+        """
+        self.parser = QueryParser(index_terms)
+    
+    def test_plain_query_is_phrase(self):
+        """
+        Test zapytania bez operatorów - całe zapytanie jest frazą
+        """
+        self.assertEqual(self.parser.parse("Python i Ruby"), Phrase("Python i Ruby", ["python", "i", "ruby"]))
+        self.assertEqual(self.parser.parse("python and ruby").terms, ["python", "and", "ruby"])
+        self.assertIsNone(self.parser.parse(" -- "))
+    
+    def test_operators(self):
+        """
+        Test operatorów, pierwszeństwa i niejawnego AND
+        """
+        invoice = Phrase("invoice", ["invoice"])
+        year = Phrase("2023", ["2023"])
+        draft = Phrase("draft", ["draft"])
+        self.assertEqual(
+            self.parser.parse("invoice AND 2023 NOT draft"),
+            And([invoice, year, Not(draft)])
+        )
+        self.assertEqual(
+            self.parser.parse("invoice 2023 OR NOT draft"),
+            Or([And([invoice, year]), Not(draft)])
+        )
+        self.assertEqual(
+            self.parser.parse("invoice (2023 OR draft)"),
+            And([invoice, Or([year, draft])])
+        )
+    
+    def test_quoted_phrases(self):
+        """
+        Test fraz w cudzysłowie i słów dzielonych na kilka terminów
+        """
+        self.assertEqual(
+            self.parser.parse('"faktura VAT" OR XK-3'),
+            Or([Phrase("faktura VAT", ["faktura", "vat"]), Phrase("XK-3", ["xk", "3"])])
+        )
+        self.assertEqual(self.parser.parse('"niezamknięta fraza'), Phrase("niezamknięta fraza", ["niezamknięta", "fraza"]))
+        self.assertIsNone(self.parser.parse('NOT ""'))
+        self.assertEqual(list(self.parser.parse('a NOT b OR "c d"').phrases()), [
+            Phrase("a", ["a"]), Phrase("c d", ["c", "d"])
+        ])
+    
+    def test_invalid_queries(self):
+        """
+        Test błędów składni zapytania
+        """
+        for query in ["python AND", "OR python", "(python", "python)", "()", "NOT"]:
+            with self.assertRaises(SearchError):
+                self.parser.parse(query)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,5 +1,71 @@
 import unittest
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+from reportlab.pdfgen import canvas
+from src.core import search_engine as search_engine_module
 from src.core.search_engine import SearchEngine, SearchResult
+from src.core.query_parser import SearchError
+from src.utils.index_storage import IndexStorage
+from src.utils.extraction_cache import ExtractionCache
+
+# Testy nie korzystają z pamięci podręcznej wydobytego tekstu w katalogu domowym
+cache_patch = patch.object(search_engine_module.config_manager.config, "extraction_cache_size", 0)
+
+def setUpModule():
+    cache_patch.start()
+
+def tearDownModule():
+    cache_patch.stop()
+
+def get_postings(engine, term):
+    """
+    Zwraca postingi terminu jako słownik ścieżka -> lista pozycji
+    """
+    return {
+        engine.doc_paths[doc_id]: list(engine.documents[engine.doc_paths[doc_id]].term_positions[term])
+        for doc_id in engine._term_postings(term)
+    }
+
+def document_frequency(engine, term):
+    """
+    Zwraca liczbę dokumentów zawierających przetworzony termin (długość kolumny macierzy dokument-termin)
+    """
+    # Terminy dokumentów z segmentów trafiają do słownika przy budowie macierzy
+    indptr = engine._get_term_matrix().indptr
+    term_id = engine.vocabulary.get(term)
+    if term_id is None:
+        return 0
+    return int(indptr[term_id + 1] - indptr[term_id]) if term_id + 1 < len(indptr) else 0
+
+def get_term_index(engine):
+    """
+    Zwraca indeks odwrócony silnika jako słownik termin -> posortowane ścieżki dokumentów
+    """
+    return {
+        engine.vocabulary.term(term_id): sorted(engine.doc_paths[doc_id] for doc_id in postings)
+        for term_id, postings in engine.term_index.items()
+    }
+
+def make_storage(directory):
+    """
+    Tworzy magazyn indeksu zapisujący pliki w podanym katalogu
+    """
+    storage = IndexStorage()
+    storage.index_dir = directory
+    storage.index_file = os.path.join(directory, "search_index.pkl")
+    storage.metadata_file = os.path.join(directory, "metadata.json")
+    return storage
+
+@contextmanager
+def read_pages(pages):
+    """
+    Zastępuje PDFProcessor.read_document - zwraca podane strony bez metadanych
+    """
+    yield iter(pages), None
 
 class TestSearchEngine(unittest.TestCase):
     """
@@ -117,5 +183,860 @@ class TestSearchEngine(unittest.TestCase):
         self.assertEqual(len(self.engine.documents), 0)
         self.assertEqual(len(self.engine.term_index), 0)
 
+class TestInvertedIndex(unittest.TestCase):
+    """
+    Testy indeksu odwróconego silnika wyszukiwania
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie środowiska testowego
+        """
+        self.engine = SearchEngine()
+        self.texts = {
+            "a.pdf": "Python jest językiem. Python jest prosty.",
+            "b.pdf": "JavaScript działa w przeglądarce.",
+            "c.pdf": "Python i JavaScript to popularne języki."
+        }
+        with patch.object(
+            self.engine.pdf_processor,
+            "read_document",
+            side_effect=lambda file_path, max_pages=0: read_pages([(1, self.texts[file_path])])
+        ):
+            for file_path in self.texts:
+                self.engine.index_document(file_path)
+    
+    def test_postings(self):
+        """
+        Test zawartości list postingowych
+        """
+        self.assertEqual(get_postings(self.engine, "python"), {"a.pdf": [0, 3], "c.pdf": [0]})
+        self.assertEqual(get_postings(self.engine, "javascript"), {"b.pdf": [0], "c.pdf": [2]})
+        self.assertEqual(list(self.engine.documents["b.pdf"].token_offsets), [0, 11, 18, 20])
+    
+    def test_compressed_content(self):
+        """
+        Test przechowywania treści w postaci skompresowanej
+        """
+        document = self.engine.documents["a.pdf"]
+        self.assertEqual(document.content, "")
+        self.assertEqual(document.get_content(), self.texts["a.pdf"])
+        
+        # Strona jest rozpakowywana raz dla wszystkich fragmentów z tej strony
+        results = self.engine.search("python")
+        self.assertEqual(len(results[0].matches) + len(results[1].matches), 3)
+        self.assertEqual(self.engine.document_store.misses, 2)
+        self.engine.search("python")
+        self.assertEqual(self.engine.document_store.misses, 2)
+    
+    def test_boolean_queries(self):
+        """
+        Test zapytań logicznych (AND, OR, NOT, frazy w cudzysłowie, nawiasy)
+        """
+        def search(query):
+            with patch.object(search_engine_module.config_manager.config, "min_score", 0.0):
+                return {result.file_path: result for result in self.engine.search(query)}
+                
+        self.assertEqual(set(search("python AND javascript")), {"c.pdf"})
+        self.assertEqual(set(search("python NOT javascript")), {"a.pdf"})
+        self.assertEqual(set(search('"python jest" OR działa')), {"a.pdf", "b.pdf"})
+        self.assertEqual(set(search("javascript NOT (python OR działa)")), set())
+        self.assertEqual(set(search("NOT python")), set())
+        
+        # Fragmenty pochodzą tylko z fraz obecnych w dokumencie
+        results = search("python OR przeglądarce")
+        self.assertEqual(set(results), {"a.pdf", "b.pdf", "c.pdf"})
+        self.assertEqual(len(results["a.pdf"].matches), 2)
+        self.assertEqual(results["b.pdf"].matches, ["JavaScript działa w przeglądarce."])
+        
+        # Nakładające się wystąpienia fraz dają jeden fragment
+        results = search('"python jest" OR python')
+        self.assertEqual(len(results["a.pdf"].matches), 2)
+        self.assertEqual(results["a.pdf"].pages, [1, 1])
+        results = search('"jest prosty" OR "python jest prosty"')
+        self.assertEqual(results["a.pdf"].matches, ["Python jest językiem. Python jest prosty."])
+        
+        with self.assertRaises(SearchError):
+            self.engine.search("python AND")
+    
+    def test_stop_word_query(self):
+        """
+        Test zapytania złożonego z samych słów pomijanych (wszystkie wyniki mają trafność 0)
+        """
+        results = self.engine.search("to")
+        self.assertEqual([r.file_path for r in results], ["c.pdf"])
+        self.assertEqual(results[0].score, 0.0)
+        self.assertEqual(results[0].matches, ["Python i JavaScript to popularne języki."])
+    
+    def test_substring_and_regex_search(self):
+        """
+        Test wyszukiwania fragmentów tekstu i wyrażeń regularnych z indeksem trygramów
+        """
+        # Trygramy są liczone przy indeksowaniu, a nie przy pierwszym wyszukiwaniu
+        with patch.object(search_engine_module, "document_trigram_codes") as document_trigram_codes:
+            results = self.engine.search("thon J", "substring")
+        document_trigram_codes.assert_not_called()
+        self.assertEqual([r.file_path for r in results], ["a.pdf"])
+        self.assertEqual(len(results[0].matches), 2)
+        self.assertEqual(results[0].score, 1.0)
+        self.assertEqual({r.file_path for r in self.engine.search("ĘZYK", "substring")}, {"a.pdf", "c.pdf"})
+        self.assertEqual([r.file_path for r in self.engine.search(r"\bjęzyki\b", "regex")], ["c.pdf"])
+        self.assertEqual(self.engine.search("Python.", "substring"), [])
+        
+        # Tekst sprawdzany jest tylko w dokumentach wybranych przez trygramy
+        documents = self.engine.documents
+        with patch.object(documents["b.pdf"], "get_page_text") as get_page_text:
+            results = self.engine.search("py.*prost", "regex")
+        get_page_text.assert_not_called()
+        self.assertEqual([r.file_path for r in results], ["a.pdf"])
+        
+        # Nowe i usunięte dokumenty są uwzględniane w indeksie trygramów
+        self.texts["d.pdf"] = "Pythonowy skrypt."
+        with patch.object(
+            self.engine.pdf_processor,
+            "read_document",
+            side_effect=lambda file_path, max_pages=0: read_pages([(1, self.texts[file_path])])
+        ):
+            self.engine.index_document("d.pdf")
+        self.engine._remove_document("a.pdf")
+        self.assertEqual({r.file_path for r in self.engine.search("python", "substring")}, {"c.pdf", "d.pdf"})
+        
+        with self.assertRaises(SearchError):
+            self.engine.search("(python", "regex")
+        with patch.object(search_engine_module.config_manager.config, "search_mode", "regex"):
+            self.assertEqual([r.file_path for r in self.engine.search("d.i")], ["b.pdf"])
+    
+    def test_page_numbers(self):
+        """
+        Test numerów stron wyników i fragmentów pochodzących z jednej strony
+        """
+        pages = [(1, "Wstęp do języków."), (3, "Python na trzeciej stronie. Ruby"), (4, "Rails i Python.")]
+        with patch.object(self.engine.pdf_processor, "read_document", side_effect=lambda *_: read_pages(pages)):
+            self.engine.index_document("d.pdf")
+        document = self.engine.documents["d.pdf"]
+        self.assertEqual(list(document.page_starts), [0, 3, 8])
+        self.assertEqual(list(document.token_offsets[3:5]), [0, 7])
+        
+        with patch.object(search_engine_module.config_manager.config, "context_size", 10):
+            result = next(r for r in self.engine.search("python") if r.file_path == "d.pdf")
+        self.assertEqual(result.pages, [3, 4])
+        self.assertEqual(result.matches[0], "Python na trzeci...")
+        self.assertNotIn("Wstęp", result.matches[0])
+        
+        # Fraza przechodząca na kolejną stronę
+        result = self.engine.search("ruby rails")[0]
+        self.assertEqual(result.pages, [3])
+        self.assertTrue(result.matches[0].endswith("Ruby"))
+    
+    def test_search_uses_candidates(self):
+        """
+        Test wyszukiwania tylko w dokumentach zawierających słowa zapytania
+        """
+        paths = {r.file_path for r in self.engine.search("python")}
+        self.assertEqual(paths, {"a.pdf", "c.pdf"})
+        self.assertEqual(self.engine.search("ruby"), [])
+    
+    def test_phrase_positions(self):
+        """
+        Test wyszukiwania fraz na podstawie pozycji terminów
+        """
+        results = self.engine.search("PYTHON jest")
+        self.assertEqual([r.file_path for r in results], ["a.pdf"])
+        self.assertEqual(len(results[0].matches), 2)
+        self.assertTrue(results[0].matches[0].startswith("Python jest"))
+        
+        # Słowa występujące w dokumencie, ale nie obok siebie
+        self.assertEqual(self.engine.search("JavaScript Python"), [])
+    
+    def test_precomputed_similarity(self):
+        """
+        Test oceny trafności na podstawie terminów przetworzonych przy indeksowaniu
+        """
+        self.assertIn("python", self.engine.documents["a.pdf"].term_counts)
+        
+        config = search_engine_module.config_manager.config
+        with patch.object(config, "ranking", "jaccard"), patch.object(config, "min_score", 0.0), patch.object(
+            self.engine.text_processor,
+            "process_text",
+            wraps=self.engine.text_processor.process_text
+        ) as process_text:
+            results = self.engine.search("Python")
+            
+        # Przetwarzane jest tylko zapytanie
+        process_text.assert_called_once_with("Python")
+        for result in results:
+            expected = self.engine.text_processor.calculate_similarity(
+                "Python", self.texts[result.file_path]
+            )
+            self.assertAlmostEqual(result.score, expected)
+    
+    def test_bm25_ranking(self):
+        """
+        Test rankingu BM25 i statystyk korpusu
+        """
+        self.assertEqual(document_frequency(self.engine, "python"), 2)
+        self.assertEqual(
+            self.engine.total_length,
+            sum(document.length for document in self.engine.documents.values())
+        )
+        
+        config = search_engine_module.config_manager.config
+        with patch.object(config, "ranking", "bm25"):
+            results = self.engine.search("Python")
+            
+        # Dokument z dwoma wystąpieniami terminu jest pierwszy, wyniki są w przedziale 0-1
+        self.assertEqual(results[0].file_path, "a.pdf")
+        self.assertEqual(results[0].score, 1.0)
+        self.assertTrue(0 < results[1].score < 1.0)
+    
+    def test_top_k_selection(self):
+        """
+        Test ograniczenia liczby wyników (max_results) i minimalnej trafności (min_score)
+        """
+        config = search_engine_module.config_manager.config
+        with patch.object(config, "ranking", "bm25"), patch.object(config, "max_results", 1), patch.object(
+            self.engine, "_build_context", wraps=self.engine._build_context
+        ) as build_context:
+            results = self.engine.search("Python")
+            
+        # Fragmenty budowane są tylko dla wybranego wyniku
+        self.assertEqual([r.file_path for r in results], ["a.pdf"])
+        self.assertEqual(build_context.call_count, 2)
+        
+        with patch.object(config, "ranking", "bm25"), patch.object(config, "min_score", 1.0):
+            results = self.engine.search("Python")
+        self.assertEqual([r.file_path for r in results], ["a.pdf"])
+    
+    def test_reindex_document(self):
+        """
+        Test ponownego indeksowania zmienionego dokumentu
+        """
+        with patch.object(
+            self.engine.pdf_processor,
+            "read_document",
+            side_effect=lambda *_: read_pages([(1, "Tylko Ruby")])
+        ):
+            self.engine.index_document("a.pdf")
+            
+        self.assertEqual(get_postings(self.engine, "python"), {"c.pdf": [0]})
+        self.assertIn("ruby", get_term_index(self.engine))
+        self.assertEqual(document_frequency(self.engine, "python"), 1)
+        self.assertEqual(
+            self.engine.total_length,
+            sum(document.length for document in self.engine.documents.values())
+        )
+    
+    def test_clear_index(self):
+        """
+        Test czyszczenia indeksu odwróconego
+        """
+        self.engine.clear_index()
+        self.assertEqual(len(self.engine.term_index), 0)
+        self.assertEqual(self.engine.total_length, 0)
+
+def write_pdf(file_path: str, text: str) -> None:
+    """
+    Tworzy jednostronicowy plik PDF z podanym tekstem
+    """
+    pdf = canvas.Canvas(file_path)
+    pdf.drawString(100, 750, text)
+    pdf.save()
+
+class TestParallelIndexing(unittest.TestCase):
+    """
+    Testy indeksowania katalogu w puli procesów
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie katalogu z przykładowymi plikami PDF
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.texts = {
+            "a.pdf": "Python jest językiem programowania.",
+            "b.pdf": "JavaScript działa w przeglądarce.",
+            "c.pdf": "Python i JavaScript to popularne języki."
+        }
+        for name, text in self.texts.items():
+            write_pdf(os.path.join(self.test_dir, name), text)
+        self.engine = SearchEngine()
+    
+    def tearDown(self):
+        """
+        Sprzątanie po testach
+        """
+        shutil.rmtree(self.test_dir)
+    
+    def test_scan_metadata(self):
+        """
+        Test odczytu metadanych katalogu bez wydobywania tekstu
+        """
+        with patch.object(self.engine.pdf_processor, "read_document") as read_document:
+            catalog = self.engine.scan_metadata(self.test_dir)
+        read_document.assert_not_called()
+        self.assertEqual(len(catalog), 3)
+        self.assertEqual({metadata.page_count for metadata in catalog.values()}, {1})
+        self.assertEqual(self.engine.get_document_count(), 0)
+    
+    def test_parallel_matches_serial(self):
+        """
+        Test zgodności indeksowania równoległego z sekwencyjnym
+        """
+        config = search_engine_module.config_manager.config
+        with patch.object(config, "index_workers", 2):
+            self.engine.index_directory(self.test_dir)
+            
+        serial_engine = SearchEngine()
+        with patch.object(config, "index_workers", 1):
+            serial_engine.index_directory(self.test_dir)
+            
+        self.assertEqual(self.engine.get_document_count(), 3)
+        self.assertEqual(
+            {path: document.get_content() for path, document in self.engine.documents.items()},
+            {path: document.get_content() for path, document in serial_engine.documents.items()}
+        )
+        self.assertEqual(get_term_index(self.engine), get_term_index(serial_engine))
+        
+        # Metadane zwrócone przez procesy robocze i odczytane przy tym samym parsowaniu w trybie sekwencyjnym
+        for engine in (self.engine, serial_engine):
+            for document in engine.documents.values():
+                self.assertEqual(document.page_count, 1)
+                self.assertIsNotNone(document.metadata)
+    
+    def test_parallel_pages_indexed_on_arrival(self):
+        """
+        Test przetwarzania stron odebranych od procesów roboczych przed zakończeniem dokumentu
+        """
+        events = []
+        receive = search_engine_module.ExtractionWorker.receive
+        add_page = search_engine_module.DocumentBuilder.add_page
+        
+        def record_receive(worker):
+            message = receive(worker)
+            events.append(message[0])
+            return message
+        
+        def record_page(builder, page_number, text):
+            events.append("indexed")
+            add_page(builder, page_number, text)
+            
+        config = search_engine_module.config_manager.config
+        with patch.object(config, "index_workers", 2), \
+                patch.object(search_engine_module.ExtractionWorker, "receive", record_receive), \
+                patch.object(search_engine_module.DocumentBuilder, "add_page", record_page):
+            self.engine.index_directory(self.test_dir)
+            
+        self.assertEqual(self.engine.get_document_count(), 3)
+        
+        # Każda odebrana strona jest przetwarzana od razu, przed kolejnym komunikatem
+        for position, kind in enumerate(events):
+            if kind == search_engine_module.PAGE:
+                self.assertEqual(events[position + 1], "indexed")
+        self.assertEqual(events.count("indexed"), 3)
+    
+    def test_split_large_document(self):
+        """
+        Test podziału dużego pliku na zakresy stron wydobywane przez kilka procesów
+        """
+        book_path = os.path.join(self.test_dir, "book.pdf")
+        pdf = canvas.Canvas(book_path)
+        for number in range(1, 8):
+            pdf.drawString(100, 750, f"Rozdział {number} książki.")
+            pdf.showPage()
+        pdf.save()
+        
+        config = search_engine_module.config_manager.config
+        with patch.object(config, "index_workers", 3), \
+                patch.object(config, "page_split_threshold", 4), \
+                patch.object(config, "page_chunk_size", 2):
+            self.engine.index_directory(self.test_dir)
+            
+        serial_engine = SearchEngine()
+        with patch.object(config, "index_workers", 1):
+            serial_engine.index_directory(self.test_dir)
+            
+        # Zakresy są łączone w kolejności stron
+        document = self.engine.documents[book_path]
+        self.assertEqual(list(document.page_numbers), list(range(1, 8)))
+        self.assertEqual(document.page_count, 7)
+        self.assertEqual(document.get_content(), serial_engine.documents[book_path].get_content())
+        self.assertEqual(get_term_index(self.engine), get_term_index(serial_engine))
+        self.assertEqual(self.engine.get_document_count(), 4)
+
+class TestIncrementalIndexing(unittest.TestCase):
+    """
+    Testy przyrostowego indeksowania katalogu
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie katalogu z przykładowymi plikami PDF
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.paths = []
+        for name, text in (("a.pdf", "Python jest prosty."), ("b.pdf", "JavaScript działa.")):
+            path = os.path.join(self.test_dir, name)
+            write_pdf(path, text)
+            self.paths.append(path)
+            
+        config = search_engine_module.config_manager.config
+        self.workers_patch = patch.object(config, "index_workers", 1)
+        self.workers_patch.start()
+        
+        # Bez limitu czasu tekst jest wydobywany w bieżącym procesie, więc wywołania można zliczać
+        self.timeout_patch = patch.object(config, "extraction_timeout", 0)
+        self.timeout_patch.start()
+        self.engine = SearchEngine()
+        self.engine.index_directory(self.test_dir)
+        self.storage = make_storage(self.test_dir)
+    
+    def tearDown(self):
+        """
+        Sprzątanie po testach
+        """
+        self.workers_patch.stop()
+        self.timeout_patch.stop()
+        shutil.rmtree(self.test_dir)
+    
+    def _reindex(self):
+        """
+        Ponowne indeksowanie katalogu ze zliczaniem wydobyć tekstu
+        """
+        with patch.object(
+            self.engine.pdf_processor,
+            "read_document",
+            wraps=self.engine.pdf_processor.read_document
+        ) as read_document:
+            self.engine.index_directory(self.test_dir)
+        return read_document.call_count
+    
+    def test_unchanged_files_are_skipped(self):
+        """
+        Test pomijania niezmienionych plików
+        """
+        self.assertEqual(self._reindex(), 0)
+        self.assertEqual(self.engine.get_document_count(), 2)
+        
+        # Zmiana samej daty modyfikacji - zawartość się nie zmieniła
+        os.utime(self.paths[0], (0, 0))
+        self.assertEqual(self._reindex(), 0)
+    
+    def test_modified_and_deleted_files(self):
+        """
+        Test ponownego indeksowania zmienionych i usuwania skasowanych plików
+        """
+        write_pdf(self.paths[0], "Ruby zamiast Pythona.")
+        os.remove(self.paths[1])
+        
+        self.assertEqual(self._reindex(), 1)
+        self.assertEqual(list(self.engine.documents), [self.paths[0]])
+        self.assertIn("ruby", get_term_index(self.engine))
+        self.assertNotIn("javascript", get_term_index(self.engine))
+    
+    def test_warm_start_from_storage(self):
+        """
+        Test zapisu indeksu i startu z indeksu wczytanego z dysku
+        """
+        self.assertTrue(self.storage.save_index(self.engine.documents))
+        self.assertTrue(self.storage.save_lemmas(self.engine.text_processor.lemma_cache.items()))
+        
+        self.engine = SearchEngine()
+        self.engine.load_documents(self.storage.load_index())
+        self.engine.load_lemmas(self.storage.load_lemmas())
+        self.assertFalse(self.engine.has_unsaved_changes)
+        self.assertEqual(self.engine.get_document_count(), 2)
+        self.assertEqual([r.file_path for r in self.engine.search("python")], [self.paths[0]])
+        
+        # Uzgodnienie z katalogiem nie wymaga ponownego wydobywania tekstu
+        self.assertEqual(self._reindex(), 0)
+        self.assertFalse(self.engine.has_unsaved_changes)
+    
+    def test_changes_after_warm_start(self):
+        """
+        Test zmian indeksu wczytanego z segmentów odwzorowanych w pamięci
+        """
+        self.assertTrue(self.engine.save_changes(self.storage))
+        
+        self.engine = SearchEngine()
+        self.engine.load_documents(self.storage.load_index())
+        self.assertEqual(self.engine.term_index, {})
+        self.assertEqual(document_frequency(self.engine, "python"), 1)
+        
+        # Zmieniony dokument przesłania wersję z segmentu, usunięty znika z wyników
+        write_pdf(self.paths[0], "Python i Ruby.")
+        os.remove(self.paths[1])
+        self.assertEqual(self._reindex(), 1)
+        self.assertEqual(document_frequency(self.engine, "python"), 1)
+        self.assertEqual(self.engine.search("javascript"), [])
+        results = self.engine.search("python")
+        self.assertEqual([r.file_path for r in results], [self.paths[0]])
+        self.assertIn("Ruby", results[0].matches[0])
+        
+        self.assertTrue(self.engine.save_changes(self.storage))
+        self.engine = SearchEngine()
+        self.engine.load_documents(self.storage.load_index())
+        self.assertEqual([r.file_path for r in self.engine.search("ruby")], [self.paths[0]])
+    
+    def test_touched_files_after_warm_start(self):
+        """
+        Test zapisu nowej daty modyfikacji pliku o niezmienionej zawartości
+        """
+        self.assertTrue(self.engine.save_changes(self.storage))
+        for path in self.paths:
+            modified = os.stat(path).st_mtime + 60
+            os.utime(path, (modified, modified))
+            
+        # Pierwszy start po zmianie dat liczy skróty plików i zapisuje nowe daty
+        self.engine = SearchEngine()
+        self.engine.load_documents(self.storage.load_index())
+        self.assertEqual(self._reindex(), 0)
+        self.assertEqual(self.engine.changed_paths, set(self.paths))
+        self.assertTrue(self.engine.save_changes(self.storage))
+        
+        # Kolejny start nie liczy już skrótów
+        self.engine = SearchEngine()
+        self.engine.load_documents(self.storage.load_index())
+        with patch.object(self.engine.file_handler, "compute_file_hash") as compute_file_hash:
+            self.assertEqual(self._reindex(), 0)
+        compute_file_hash.assert_not_called()
+        self.assertFalse(self.engine.has_unsaved_changes)
+        self.assertEqual([r.file_path for r in self.engine.search("python")], [self.paths[0]])
+    
+    def test_scores_after_warm_start(self):
+        """
+        Test zgodności ocen dokumentów z segmentów i dokumentów zindeksowanych w sesji
+        """
+        self.assertTrue(self.engine.save_changes(self.storage))
+        
+        # Trygramy dokumentów są zapisane w segmentach i nie są liczone ponownie z tekstu
+        engine = SearchEngine()
+        with patch.object(search_engine_module, "document_trigram_codes") as document_trigram_codes:
+            engine.load_documents(self.storage.load_index())
+            self.assertEqual([r.file_path for r in engine.search("YTHON J", "substring")], [self.paths[0]])
+        document_trigram_codes.assert_not_called()
+        
+        for ranking in ("bm25", "jaccard"):
+            expected = self.engine._score_documents({"python", "język"}, self.paths, ranking)
+            scores = engine._score_documents({"python", "język"}, self.paths, ranking)
+            self.assertEqual(scores.tolist(), expected.tolist())
+            self.assertGreater(scores[0], 0)
+            
+        # Listy postingów dokumentów z segmentów mają numery dokumentów indeksu
+        self.assertEqual([r.file_path for r in engine.search("python NOT javascript")], [self.paths[0]])
+        self.assertEqual(len(engine.search("python OR javascript")), 2)
+        
+        # Usunięte dokumenty z segmentów nie są wybierane
+        engine._remove_document(self.paths[0])
+        self.assertEqual(engine.search("YTHON J", "substring"), [])
+    
+    def test_lemma_cache_warm_start(self):
+        """
+        Test zapisu lematów obok indeksu i startu bez zapytań do WordNet
+        """
+        lemma_cache = self.engine.text_processor.lemma_cache
+        self.assertGreater(len(lemma_cache), 0)
+        self.assertTrue(self.engine.save_changes(self.storage))
+        self.assertFalse(lemma_cache.changed)
+        
+        self.engine = SearchEngine()
+        self.engine.load_documents(self.storage.load_index())
+        self.engine.load_lemmas(self.storage.load_lemmas())
+        self.assertEqual(self.engine.text_processor.lemma_cache.items(), lemma_cache.items())
+        with patch.object(self.engine.text_processor.lemmatizer, "lemmatize") as lemmatize:
+            results = self.engine.search("python")
+        lemmatize.assert_not_called()
+        self.assertEqual([r.file_path for r in results], [self.paths[0]])
+    
+    def test_lemma_only_changes_are_saved(self):
+        """
+        Test zapisu lematów, gdy od wczytania indeksu zmieniły się tylko one
+        """
+        self.assertTrue(self.engine.save_changes(self.storage))
+        
+        self.engine = SearchEngine()
+        self.engine.load_documents(self.storage.load_index())
+        self.engine.load_lemmas(self.storage.load_lemmas())
+        self.assertFalse(self.engine.has_unsaved_changes)
+        
+        # Wyszukiwanie nowej formy słowa zmienia tylko pamięć lematów
+        self.engine.search("python OR pythons")
+        self.assertEqual(self.engine.changed_paths, set())
+        self.assertTrue(self.engine.has_unsaved_changes)
+        self.assertTrue(self.engine.save_changes(self.storage))
+        self.assertFalse(self.engine.has_unsaved_changes)
+        self.assertIn("pythons", self.storage.load_lemmas())
+        
+        # Bez utrwalania lematów ich zmiany nie wymagają zapisu
+        with patch.object(search_engine_module.config_manager.config, "persist_lemma_cache", False):
+            self.engine.search("python OR languages")
+            self.assertFalse(self.engine.has_unsaved_changes)
+    
+    def test_save_changes_appends_segment(self):
+        """
+        Test zapisu samych zmian indeksu jako nowego segmentu
+        """
+        self.assertTrue(self.engine.save_changes(self.storage))
+        self.assertFalse(self.engine.has_unsaved_changes)
+        
+        write_pdf(self.paths[0], "Ruby zamiast Pythona.")
+        os.remove(self.paths[1])
+        self._reindex()
+        self.assertEqual(self.engine.changed_paths, {self.paths[0]})
+        self.assertEqual(self.engine.deleted_paths, {self.paths[1]})
+        self.assertTrue(self.engine.save_changes(self.storage))
+        
+        self.assertEqual(len(self.storage.get_index_info()["segments"]), 2)
+        self.assertEqual(list(self.storage.load_index()), [self.paths[0]])
+    
+    def test_full_reindex(self):
+        """
+        Test pełnego indeksowania (bez trybu przyrostowego)
+        """
+        with patch.object(
+            self.engine.pdf_processor,
+            "read_document",
+            wraps=self.engine.pdf_processor.read_document
+        ) as read_document:
+            self.engine.index_directory(self.test_dir, incremental=False)
+        self.assertEqual(read_document.call_count, 2)
+
+class TestExtractionLimits(unittest.TestCase):
+    """
+    Testy limitów przetwarzania dokumentów i listy kwarantanny
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie katalogu z plikiem jedno- i dwustronicowym
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.short_path = os.path.join(self.test_dir, "short.pdf")
+        write_pdf(self.short_path, "Krótki dokument.")
+        self.long_path = os.path.join(self.test_dir, "long.pdf")
+        pdf = canvas.Canvas(self.long_path)
+        pdf.drawString(100, 750, "Pierwsza strona.")
+        pdf.showPage()
+        pdf.drawString(100, 750, "Druga strona.")
+        pdf.save()
+        
+        self.config = search_engine_module.config_manager.config
+        self.patches = [
+            patch.object(self.config, "index_workers", 1),
+            patch.object(self.config, "extraction_timeout", 0)
+        ]
+        for config_patch in self.patches:
+            config_patch.start()
+        self.engine = SearchEngine()
+    
+    def tearDown(self):
+        """
+        Sprzątanie po testach
+        """
+        for config_patch in self.patches:
+            config_patch.stop()
+        shutil.rmtree(self.test_dir)
+    
+    def test_page_limit_quarantine(self):
+        """
+        Test pomijania pliku o zbyt wielu stronach aż do jego zmiany
+        """
+        with patch.object(self.config, "max_document_pages", 1):
+            self.engine.index_directory(self.test_dir)
+            self.assertEqual(list(self.engine.documents), [self.short_path])
+            self.assertIn("limit", self.engine.get_quarantined_files()[self.long_path])
+            
+            # Niezmieniony plik nie jest ponownie przetwarzany, także przy pełnym indeksowaniu
+            with patch.object(
+                self.engine.pdf_processor,
+                "read_document",
+                wraps=self.engine.pdf_processor.read_document
+            ) as read_document:
+                self.engine.index_directory(self.test_dir, incremental=False)
+            self.assertEqual(read_document.call_args_list[0][0][0], self.short_path)
+            self.assertEqual(read_document.call_count, 1)
+            
+        # Po zmianie plik wraca do indeksowania
+        write_pdf(self.long_path, "Teraz jedna strona.")
+        self.engine.index_directory(self.test_dir)
+        self.assertEqual(self.engine.get_quarantined_files(), {})
+        self.assertIn(self.long_path, self.engine.documents)
+    
+    def test_size_limit_in_parallel_indexing(self):
+        """
+        Test limitu rozmiaru pliku przy indeksowaniu w wielu procesach
+        """
+        size = os.path.getsize(self.long_path)
+        with patch.object(self.config, "index_workers", 2), \
+                patch.object(self.config, "max_document_size", os.path.getsize(self.short_path)):
+            self.engine.index_directory(self.test_dir)
+        self.assertEqual(list(self.engine.documents), [self.short_path])
+        self.assertIn(str(size), self.engine.get_quarantined_files()[self.long_path])
+    
+    def test_timeout_quarantine(self):
+        """
+        Test przerwania wydobywania tekstu po przekroczeniu limitu czasu
+        """
+        def slow_pages(processor, reader, *_):
+            time.sleep(30)
+            yield 1, "Nigdy"
+            
+        start = time.monotonic()
+        with patch.object(self.config, "extraction_timeout", 0.5), \
+                patch.object(search_engine_module.PDFProcessor, "_iter_pages", slow_pages):
+            self.engine.index_directory(self.test_dir)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(self.engine.get_document_count(), 0)
+        self.assertEqual(sorted(self.engine.get_quarantined_files()), sorted([self.long_path, self.short_path]))
+    
+    def test_documents_without_text(self):
+        """
+        Test rejestrowania dokumentów bez warstwy tekstowej
+        """
+        scan_path = os.path.join(self.test_dir, "scan.pdf")
+        pdf = canvas.Canvas(scan_path)
+        pdf.rect(100, 100, 200, 200, fill=1)
+        pdf.showPage()
+        pdf.rect(100, 100, 200, 200, fill=1)
+        pdf.save()
+        
+        self.engine.index_directory(self.test_dir)
+        self.assertEqual(self.engine.get_documents_without_text(), {scan_path: 2})
+        self.assertEqual(self.engine.get_pages_without_text(), {scan_path: 2})
+        
+        # Skan nie jest wliczany do liczby dokumentów w BM25
+        matrix = self.engine._get_term_matrix()
+        with patch.object(matrix, "bm25", wraps=matrix.bm25) as bm25:
+            self.engine.search("strona")
+        self.assertEqual(bm25.call_args[0][2], 2)
+        
+        # Dokument pozostaje w indeksie, więc nie jest ponownie przetwarzany
+        with patch.object(
+            self.engine.pdf_processor,
+            "read_document",
+            wraps=self.engine.pdf_processor.read_document
+        ) as read_document:
+            self.engine.index_directory(self.test_dir)
+        read_document.assert_not_called()
+    
+    def test_quarantine_is_saved(self):
+        """
+        Test zapisu listy kwarantanny razem z indeksem
+        """
+        storage = make_storage(self.test_dir)
+        
+        with patch.object(self.config, "max_document_pages", 1):
+            self.engine.index_directory(self.test_dir)
+        self.assertTrue(self.engine.has_unsaved_changes)
+        self.assertTrue(self.engine.save_changes(storage))
+        self.assertFalse(self.engine.has_unsaved_changes)
+        
+        # Po ponownym uruchomieniu plik nadal jest pomijany
+        engine = SearchEngine()
+        engine.load_documents(storage.load_index())
+        engine.load_quarantine(storage.load_quarantine())
+        engine.index_directory(self.test_dir)
+        self.assertNotIn(self.long_path, engine.documents)
+        self.assertEqual(engine.get_quarantined_files(), self.engine.get_quarantined_files())
+
+class TestExtractionCache(unittest.TestCase):
+    """
+    Testy pamięci podręcznej wydobytego tekstu
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie dwóch folderów i pamięci podręcznej w katalogu tymczasowym
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.first_dir = os.path.join(self.test_dir, "pierwszy")
+        self.second_dir = os.path.join(self.test_dir, "drugi")
+        os.makedirs(self.first_dir)
+        os.makedirs(self.second_dir)
+        self.path = os.path.join(self.first_dir, "a.pdf")
+        write_pdf(self.path, "Python jest prosty.")
+        
+        config = search_engine_module.config_manager.config
+        self.patches = [
+            patch.object(config, "index_workers", 1),
+            patch.object(config, "extraction_timeout", 0)
+        ]
+        for config_patch in self.patches:
+            config_patch.start()
+        self.cache = ExtractionCache(os.path.join(self.test_dir, "cache"), max_size=1024 * 1024)
+    
+    def tearDown(self):
+        """
+        Sprzątanie po testach
+        """
+        for config_patch in self.patches:
+            config_patch.stop()
+        shutil.rmtree(self.test_dir)
+    
+    def _index(self, directory: str) -> tuple:
+        """
+        Indeksuje folder nowym silnikiem ze wspólną pamięcią podręczną
+        
+        Returns:
+            Silnik i liczba plików, z których wydobyto tekst
+        """
+        engine = SearchEngine()
+        engine.extraction_cache = self.cache
+        with patch.object(
+            engine.pdf_processor,
+            "read_document",
+            wraps=engine.pdf_processor.read_document
+        ) as read_document:
+            engine.index_directory(directory)
+        return engine, read_document.call_count
+    
+    def test_copies_and_renames_reuse_text(self):
+        """
+        Test ponownego użycia tekstu kopii i pliku o zmienionej nazwie
+        """
+        engine, extracted = self._index(self.first_dir)
+        self.assertEqual(extracted, 1)
+        
+        # Kopia w innym folderze i plik o zmienionej nazwie
+        shutil.copy(self.path, os.path.join(self.second_dir, "kopia.pdf"))
+        os.rename(self.path, os.path.join(self.first_dir, "nowa_nazwa.pdf"))
+        for directory in (self.second_dir, self.first_dir):
+            copy_engine, extracted = self._index(directory)
+            self.assertEqual(extracted, 0)
+            self.assertEqual(len(copy_engine.search("python")), 1)
+            document = next(iter(copy_engine.documents.values()))
+            self.assertEqual(document.get_content(), next(iter(engine.documents.values())).get_content())
+            self.assertEqual(document.page_count, 1)
+            self.assertIsNotNone(document.file_info.content_hash)
+        self.assertEqual(self.cache.hits, 2)
+    
+    def test_modified_file_is_extracted(self):
+        """
+        Test ponownego wydobycia tekstu zmienionego pliku
+        """
+        self._index(self.first_dir)
+        write_pdf(self.path, "Ruby zamiast Pythona.")
+        engine, extracted = self._index(self.first_dir)
+        self.assertEqual(extracted, 1)
+        self.assertEqual(len(engine.search("ruby")), 1)
+    
+    def test_content_hash_confirms_hit(self):
+        """
+        Test odrzucenia wpisu o tym samym szybkim skrócie, ale innej zawartości
+        """
+        self.cache.put("klucz", "skrót", [(1, b"")], None)
+        self.assertIsNone(self.cache.get("klucz", "inny skrót"))
+        self.assertEqual(self.cache.get("klucz", "skrót"), ([(1, b"")], None))
+    
+    def test_eviction(self):
+        """
+        Test usuwania najdawniej używanych wpisów po przekroczeniu limitu
+        """
+        cache = ExtractionCache(os.path.join(self.test_dir, "small"), max_size=1000)
+        pages = [(1, os.urandom(300))]
+        for key in ("a", "b", "c", "d"):
+            cache.put(key, key, pages, None)
+        self.assertFalse(cache.contains("a"))
+        self.assertTrue(cache.contains("d"))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,89 @@
+import unittest
+import math
+from types import SimpleNamespace
+import numpy as np
+from src.core.term_matrix import TermMatrix
+from src.core.vocabulary import Vocabulary, TermCounts
+
+class TestTermMatrix(unittest.TestCase):
+    """
+    Testy macierzy dokument-termin używanej do oceny trafności
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie małego korpusu
+        """
+        self.vocabulary = Vocabulary()
+        self.counts = {
+            "a.pdf": {"python": 3, "program": 1, "język": 2},
+            "b.pdf": {"python": 1, "wąż": 4},
+            "c.pdf": {"java": 2, "program": 2, "język": 1},
+            "scan.pdf": {}
+        }
+        # Dokument w starym formacie (słownik) obok dokumentów z numerami terminów
+        self.documents = {
+            path: SimpleNamespace(
+                term_counts=counts if path == "c.pdf" else TermCounts.from_terms(self.vocabulary, counts.items()),
+                length=sum(counts.values())
+            )
+            for path, counts in self.counts.items()
+        }
+        self.matrix = TermMatrix.build(self.documents, self.vocabulary, {})
+        self.rows = np.arange(len(self.documents))
+    
+    def term_ids(self, query_terms):
+        return [self.vocabulary.get(term) for term in query_terms if term in self.vocabulary]
+    
+    def test_columns(self):
+        """
+        Test kolumn terminów: rosnące wiersze dokumentów i liczby wystąpień
+        """
+        python = self.vocabulary.get("python")
+        start, end = self.matrix.indptr[python], self.matrix.indptr[python + 1]
+        self.assertEqual(self.matrix.indices[start:end].tolist(), [0, 1])
+        self.assertEqual(self.matrix.weights[start:end].tolist(), [3, 1])
+        self.assertEqual(self.matrix.sizes.tolist(), [3, 2, 3, 0])
+        self.assertEqual(self.matrix.rows["c.pdf"], 2)
+    
+    def test_bm25(self):
+        """
+        Test wyników BM25 (porównanie ze wzorem liczonym osobno dla każdego dokumentu)
+        """
+        query_terms = {"python", "język", "brak"}
+        total_docs = 3
+        average_length = sum(document.length for document in self.documents.values()) / total_docs
+        k1, b = 1.5, 0.5
+        
+        scores = self.matrix.bm25(self.term_ids(query_terms), self.rows, total_docs, average_length, k1=k1, b=b)
+        for path, score in zip(self.matrix.paths, scores):
+            length_norm = k1 * (1 - b + b * self.documents[path].length / average_length)
+            expected = 0.0
+            for term in query_terms:
+                frequency = self.counts[path].get(term, 0)
+                if frequency:
+                    doc_count = sum(1 for counts in self.counts.values() if term in counts)
+                    idf = math.log(1 + (total_docs - doc_count + 0.5) / (doc_count + 0.5))
+                    expected += idf * frequency * (k1 + 1) / (frequency + length_norm)
+            self.assertAlmostEqual(score, expected)
+        self.assertGreater(scores[0], scores[1])
+        
+        self.assertEqual(self.matrix.bm25(self.term_ids(query_terms), self.rows, 0, 0.0).tolist(), [0.0] * 4)
+    
+    def test_jaccard(self):
+        """
+        Test współczynników Jaccarda (porównanie ze zbiorami terminów)
+        """
+        query_terms = {"program", "język", "brak"}
+        rows = np.array([2, 0, 3])
+        scores = self.matrix.jaccard(self.term_ids(query_terms), len(query_terms), rows)
+        for row, score in zip(rows, scores):
+            document_terms = set(self.counts[self.matrix.paths[row]])
+            union = query_terms | document_terms
+            self.assertAlmostEqual(score, len(query_terms & document_terms) / len(union))
+        self.assertEqual(scores.tolist()[2], 0.0)
+            
+        self.assertEqual(self.matrix.jaccard([], 0, np.array([3])).tolist(), [0.0])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
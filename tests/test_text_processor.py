@@ -1,5 +1,7 @@
 import unittest
-from src.core.text_processor import TextProcessor, ProcessedDocument
+from unittest.mock import patch
+from src.core import text_processor as text_processor_module
+from src.core.text_processor import TextProcessor, LemmaCache
 
 class TestTextProcessor(unittest.TestCase):
     """
@@ -109,5 +111,106 @@ class TestTextProcessor(unittest.TestCase):
         matches = self.processor.find_phrase_matches(processed, "to jest przykładowy")
         self.assertTrue(len(matches) > 0)
 
+class TestFastTokenizer(unittest.TestCase):
+    """
+    Testy szybkiej tokenizacji wyrażeniem regularnym
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie środowiska testowego
+        """
+        self.processor = TextProcessor()
+    
+    def test_same_tokens_as_nltk(self):
+        """
+        Test zgodności z potokiem preprocess_text + word_tokenize
+        """
+        texts = [
+            "To jest przykładowy tekst do testów. Zawiera znaki specjalne!",
+            "Wersja 2.0 (beta): a_b, x2y, 1999r. i e-mail: test@example.com",
+            "I cannot go, you're gonna wanna lemme gotta gimme that. CANNOT",
+            "Zażółć gęślą jaźń - Łódź, 3½ kg, x²"
+        ]
+        for text in texts:
+            self.assertEqual(
+                self.processor.fast_tokenize(text),
+                self.processor.tokenize(self.processor.preprocess_text(text))
+            )
+    
+    def test_process_text_modes(self):
+        """
+        Test przełączania trybu tokenizacji w process_text
+        """
+        text = "Programming languages cannot replace documents."
+        config = text_processor_module.config_manager.config
+        with patch.object(config, "tokenizer", "nltk"):
+            expected = self.processor.process_text(text)
+        with patch.object(config, "tokenizer", "regex"), \
+                patch.object(self.processor, "tokenize") as tokenize:
+            self.assertEqual(self.processor.process_text(text), expected)
+        tokenize.assert_not_called()
+
+class TestLemmaCache(unittest.TestCase):
+    """
+    Testy pamięci podręcznej lematów
+    """
+    
+    def test_lemmatize_once_per_form(self):
+        """
+        Test pytania WordNet o każdą formę słowa tylko raz
+        """
+        processor = TextProcessor()
+        processor.lemma_cache = LemmaCache(max_size=10)
+        tokens = ["documents", "cats", "documents", "documents", "cats"]
+        with patch.object(processor.lemmatizer, "lemmatize", side_effect=lambda word: word.rstrip("s")) as lemmatize:
+            self.assertEqual(processor.lemmatize(tokens), ["document", "cat", "document", "document", "cat"])
+        self.assertEqual(lemmatize.call_count, 2)
+        self.assertEqual(len(processor.lemma_cache), 2)
+        self.assertEqual(processor.lemma_cache.hits, 3)
+        self.assertAlmostEqual(processor.lemma_cache.hit_rate, 0.6)
+    
+    def test_bounded_size(self):
+        """
+        Test usuwania najdawniej używanych form po przekroczeniu limitu
+        """
+        cache = LemmaCache(max_size=2)
+        cache.put("cats", "cat")
+        cache.put("dogs", "dog")
+        self.assertEqual(cache.get("cats"), "cat")
+        cache.put("mice", "mouse")
+        self.assertIsNone(cache.get("dogs"))
+        self.assertEqual(cache.items(), {"cats": "cat", "mice": "mouse"})
+        
+        # Wczytane lematy są przycinane do limitu, z zachowaniem najnowszych
+        cache.load({"a": "a", "b": "b", "c": "c"})
+        self.assertEqual(list(cache.items()), ["b", "c"])
+        self.assertFalse(cache.changed)
+        
+        # Rozmiar 0 wyłącza pamięć
+        disabled = LemmaCache(max_size=0)
+        disabled.put("cats", "cat")
+        self.assertEqual(len(disabled), 0)
+    
+    def test_persisted_lemmas(self):
+        """
+        Test odtworzenia zapisanych lematów w nowym procesorze (bez pytań do WordNet)
+        """
+        processor = TextProcessor()
+        processor.lemma_cache = LemmaCache(max_size=10)
+        with patch.object(processor.lemmatizer, "lemmatize", side_effect=lambda word: word.rstrip("s")):
+            processor.lemmatize(["documents", "cats"])
+        self.assertTrue(processor.lemma_cache.changed)
+        saved = processor.lemma_cache.items()
+        
+        restored = TextProcessor()
+        restored.lemma_cache = LemmaCache(max_size=10)
+        restored.lemma_cache.load(saved)
+        self.assertFalse(restored.lemma_cache.changed)
+        with patch.object(restored.lemmatizer, "lemmatize") as lemmatize:
+            self.assertEqual(restored.lemmatize(["cats", "documents"]), ["cat", "document"])
+        lemmatize.assert_not_called()
+        self.assertFalse(restored.lemma_cache.changed)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,98 @@
+import re
+import unittest
+from unittest.mock import patch
+from src.core.trigram_index import (
+    TrigramIndex, required_trigrams, trigrams, fold, document_trigram_codes, MATCH_ALL, MAX_BLOCKS
+)
+
+class TestTrigramIndex(unittest.TestCase):
+    """
+    Testy indeksu trygramów i wyznaczania trygramów wymaganych przez wyrażenia regularne
+    """
+    
+    def test_trigrams(self):
+        """
+        Test trygramów tekstu bez rozróżniania wielkości liter
+        """
+        self.assertEqual(trigrams("XK-3a"), {"xk-", "k-3", "-3a"})
+        self.assertEqual(trigrams("ab"), set())
+        self.assertEqual(fold("İSTANBUL ıı"), "istanbul ii")
+    
+    def test_required_trigrams(self):
+        """
+        Test planu trygramów dla wyrażeń regularnych
+        """
+        self.assertEqual(required_trigrams(re.escape("XK-3")), [{"xk-", "k-3"}])
+        self.assertEqual(required_trigrams(r"abc\d+xyz"), [{"abc", "xyz"}])
+        self.assertEqual(required_trigrams(r"(faktura|rachunek) VAT"), [
+            trigrams("faktura") | {" va", "vat"},
+            trigrams("rachunek") | {" va", "vat"}
+        ])
+        self.assertEqual(required_trigrams(r"colou?r"), [{"col", "olo"}])
+        self.assertEqual(required_trigrams(r"(abc)?def"), [{"def"}])
+        self.assertEqual(required_trigrams(r"(?:abc)+"), [{"abc"}])
+        self.assertEqual(required_trigrams(r"abc|\d+"), MATCH_ALL)
+        self.assertEqual(required_trigrams(r"[a-z]+\s\w"), MATCH_ALL)
+        with self.assertRaises(re.error):
+            required_trigrams("(")
+    
+    def test_candidates(self):
+        """
+        Test wyboru dokumentów, które mogą zawierać dopasowanie
+        """
+        index = TrigramIndex()
+        index.add_document(0, document_trigram_codes(["Numer części: XK-3"]))
+        index.add_document(2, document_trigram_codes(["Faktura VAT", "Rachunek"]))
+        self.assertEqual(index.candidates(required_trigrams("xk-")), [0])
+        index.add_document(5, document_trigram_codes(["xk-", "3"]))
+        index.add_document(6, document_trigram_codes([]))
+        self.assertEqual(len(index.blocks), 1)
+        self.assertEqual(len(index.pending), 2)
+        
+        # Trygramy nie przechodzą przez granice stron
+        self.assertEqual(index.candidates(required_trigrams(re.escape("xk-3"))), [0])
+        self.assertEqual(index.candidates(required_trigrams("faktura|rachunek")), [2])
+        self.assertEqual(index.candidates(required_trigrams("xk-")), [0, 5])
+        self.assertEqual(index.candidates(required_trigrams("brak")), [])
+        self.assertEqual(len(index.blocks), 2)
+    
+    def test_remove_documents(self):
+        """
+        Test usuwania dokumentów z bufora i z bloków
+        """
+        index = TrigramIndex()
+        for doc_id in range(4):
+            index.add_document(doc_id, document_trigram_codes([f"dokument {doc_id}"]))
+        index.candidates(required_trigrams("dokument"))
+        index.add_document(4, document_trigram_codes(["dokument 4"]))
+        
+        # Dokument z bufora jest usuwany od razu, dokumenty z bloków - przy łączeniu bloków
+        index.remove_document(4)
+        self.assertEqual(index.pending, [])
+        index.remove_document(0)
+        index.remove_document(1)
+        self.assertEqual(index.candidates(required_trigrams("dokument")), [0, 1, 2, 3])
+        index.remove_document(2)
+        self.assertEqual(index.removed, set())
+        self.assertEqual(index.document_count, 1)
+        self.assertEqual(index.candidates(required_trigrams("dokument")), [3])
+    
+    def test_merge_blocks(self):
+        """
+        Test łączenia bloków indeksu
+        """
+        index = TrigramIndex()
+        for doc_id in range(MAX_BLOCKS + 1):
+            index.add_document(doc_id, document_trigram_codes([f"dokument {doc_id}" if doc_id % 2 else "inny tekst"]))
+            index.candidates(required_trigrams("tekst"))
+        self.assertEqual(len(index.blocks), 1)
+        self.assertEqual(index.candidates(required_trigrams("dokument")), [1, 3, 5, 7])
+        self.assertEqual(index.candidates(required_trigrams("inny|ment")), list(range(MAX_BLOCKS + 1)))
+        
+        # Duży bufor tworzy blok bez zapytania
+        with patch("src.core.trigram_index.MAX_PENDING", 10):
+            index.add_document(MAX_BLOCKS + 1, document_trigram_codes(["dokument bez zapytania"]))
+        self.assertEqual(index.pending, [])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,56 @@
+import unittest
+from array import array
+from src.core.vocabulary import Vocabulary, TermPositions, TermCounts
+
+class TestVocabulary(unittest.TestCase):
+    """
+    Testy słownika terminów i tablicowych struktur dokumentu
+    """
+    
+    def setUp(self):
+        """
+        Przygotowanie słownika z kilkoma terminami
+        """
+        self.vocabulary = Vocabulary()
+        self.ids = {term: self.vocabulary.add(term) for term in ["python", "jest", "zażółć"]}
+    
+    def test_dense_ids(self):
+        """
+        Test nadawania kolejnych numerów terminom
+        """
+        self.assertEqual(list(self.ids.values()), [0, 1, 2])
+        self.assertEqual(self.vocabulary.add("python"), 0)
+        self.assertEqual(self.vocabulary.get("jest"), 1)
+        self.assertIsNone(self.vocabulary.get("brak"))
+        self.assertNotIn("brak", self.vocabulary)
+        self.assertEqual(self.vocabulary.term(2), "zażółć")
+        self.assertEqual(len(self.vocabulary), 3)
+    
+    def test_term_positions(self):
+        """
+        Test pozycji terminów przechowywanych w tablicach typowanych
+        """
+        positions = TermPositions.from_terms(self.vocabulary, [("zażółć", [1]), ("python", [0, 2])])
+        self.assertIsInstance(positions.positions, array)
+        self.assertEqual(list(positions.term_ids), [0, 2])
+        self.assertEqual(list(positions["python"]), [0, 2])
+        self.assertEqual(list(positions.find(self.ids["zażółć"])), [1])
+        self.assertIsNone(positions.find(self.ids["jest"]))
+        self.assertEqual(sorted(positions), ["python", "zażółć"])
+        self.assertNotIn("jest", positions)
+        self.assertNotIn("brak", positions)
+        with self.assertRaises(KeyError):
+            positions["brak"]
+    
+    def test_term_counts(self):
+        """
+        Test liczb wystąpień przechowywanych w tablicach typowanych
+        """
+        counts = TermCounts(self.vocabulary, {self.ids["jest"]: 3, self.ids["python"]: 1})
+        self.assertEqual(counts, {"python": 1, "jest": 3})
+        self.assertEqual(counts.get("brak", 0), 0)
+        self.assertEqual(counts.find(self.ids["zażółć"]), 0)
+        self.assertEqual(len(counts), 2)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file